@@ -110,17 +110,101 @@ CORS_ALLOW_HEADERS = [
 # GraphQL
 GRAPHENE = {
     'SCHEMA': 'core.schema.schema',
-    'MIDDLEWARE': [
-        'graphene_django.debug.DjangoDebugMiddleware',
-    ],
+    # Resolver instrumentation is added per request by core.tracing
+    'MIDDLEWARE': [],
 }
 
-# Channels
-CHANNEL_LAYERS = {
+# Resolver tracing: requests sending X-GraphQL-Trace: 1 (if allowed) or picked
+# at the sample rate get per-field timings and SQL counts in extensions.trace
+GRAPHQL_TRACE_ALLOW_HEADER = os.environ.get('GRAPHQL_TRACE_ALLOW_HEADER', str(DEBUG)).lower() == 'true'
+GRAPHQL_TRACE_SAMPLE_RATE = float(os.environ.get('GRAPHQL_TRACE_SAMPLE_RATE', '0'))
+# Fraction of requests traced, without returning the trace, to feed the
+# per-field histograms at /metrics/
+GRAPHQL_FIELD_METRICS_SAMPLE_RATE = float(os.environ.get('GRAPHQL_FIELD_METRICS_SAMPLE_RATE', '0.01'))
+
+# Operation limits: nesting depth, checked once per document, and estimated
+# cost (see core.complexity), checked per request with its variables
+GRAPHQL_MAX_DEPTH = int(os.environ.get('GRAPHQL_MAX_DEPTH', '10'))
+GRAPHQL_MAX_COST = int(os.environ.get('GRAPHQL_MAX_COST', '20000'))
+
+# Persisted queries: parsed and validated documents kept per process, and an
+# optional manifest (see build_persisted_queries) restricting which may run
+PERSISTED_QUERY_CACHE_SIZE = int(os.environ.get('PERSISTED_QUERY_CACHE_SIZE', '512'))
+PERSISTED_QUERY_ALLOWLIST = os.environ.get('PERSISTED_QUERY_ALLOWLIST', '')
+
+# Response cache for GraphQL queries: "locmem" (per process, fine for the
+# single daphne worker), "file" (shared by every process on the host, under
+# RESPONSE_CACHE_DIR) or "off". Entries are culled past MAX_ENTRIES.
+RESPONSE_CACHE = os.environ.get('RESPONSE_CACHE', 'locmem')
+RESPONSE_CACHE_DIR = os.environ.get('RESPONSE_CACHE_DIR', '/tmp/pms-response-cache')
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', '300'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '5000'))
+
+CACHES = {
     'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     },
 }
+if RESPONSE_CACHE == 'file':
+    CACHES['graphql'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': RESPONSE_CACHE_DIR,
+        'OPTIONS': {'MAX_ENTRIES': RESPONSE_CACHE_MAX_ENTRIES},
+    }
+elif RESPONSE_CACHE == 'locmem':
+    CACHES['graphql'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'graphql-responses',
+        'OPTIONS': {'MAX_ENTRIES': RESPONSE_CACHE_MAX_ENTRIES},
+    }
+
+# Tenant resolution cache (organization slug -> id, per process)
+ORGANIZATION_CACHE_SIZE = int(os.environ.get('ORGANIZATION_CACHE_SIZE', '1024'))
+ORGANIZATION_CACHE_TTL = float(os.environ.get('ORGANIZATION_CACHE_TTL', '60'))
+
+# Channels
+# CHANNEL_LAYER selects the backend: "memory" (single process only), "redis"
+# (REDIS_URL) or "socket" (local broker started with run_channel_broker).
+CHANNEL_LAYER = os.environ.get('CHANNEL_LAYER', 'memory')
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+CHANNEL_BROKER_SOCKET = os.environ.get('CHANNEL_BROKER_SOCKET', '/tmp/pms-channels.sock')
+
+if CHANNEL_LAYER == 'redis':
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [REDIS_URL]},
+        },
+    }
+elif CHANNEL_LAYER == 'socket':
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'core.channel_broker.SocketChannelLayer',
+            'CONFIG': {'path': CHANNEL_BROKER_SOCKET},
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    }
+
+# Subscription broadcasts: seconds to coalesce repeated task updates, and
+# the most events held in memory before new ones are dropped
+BROADCAST_COALESCE_WINDOW = float(os.environ.get('BROADCAST_COALESCE_WINDOW', '0.05'))
+BROADCAST_MAX_QUEUE = int(os.environ.get('BROADCAST_MAX_QUEUE', '10000'))
+
+# Per-connection outbound frames held for slow WebSocket clients, and the
+# seconds a client's queue may stay full before it is disconnected
+SUBSCRIPTION_QUEUE_SIZE = int(os.environ.get('SUBSCRIPTION_QUEUE_SIZE', '100'))
+SUBSCRIPTION_SATURATION_TIMEOUT = float(os.environ.get('SUBSCRIPTION_SATURATION_TIMEOUT', '5'))
+
+# Recent broadcasts kept per group for clients resuming with since:, and the
+# most groups kept. Only replayed with CHANNEL_LAYER=memory: with a shared
+# layer other workers publish to the same groups.
+SUBSCRIPTION_REPLAY_SIZE = int(os.environ.get('SUBSCRIPTION_REPLAY_SIZE', '1000'))
+SUBSCRIPTION_REPLAY_GROUPS = int(os.environ.get('SUBSCRIPTION_REPLAY_GROUPS', '10000'))
 
 # Logging
 LOGGING = {
@@ -1,18 +1,26 @@
 """URL configuration for project management system."""
 from django.contrib import admin
 from django.urls import path
-from django.http import JsonResponse
-from graphene_django.views import GraphQLView
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from core.broadcast import dispatcher
+from core.metrics import render_metrics
+from core.views import PersistedQueryView
 
 
 def health_check(request):
-    """Health check endpoint for Docker."""
-    return JsonResponse({'status': 'healthy'})
+    """Health check endpoint for Docker, with broadcast queue metrics."""
+    return JsonResponse({'status': 'healthy', 'broadcast': dispatcher.metrics()})
+
+
+def metrics(request):
+    """Prometheus scrape endpoint with this process's GraphQL metrics."""
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('graphql/', csrf_exempt(GraphQLView.as_view(graphiql=True))),
+    path('graphql/', csrf_exempt(PersistedQueryView.as_view(graphiql=True))),
     path('health/', health_check, name='health_check'),
+    path('metrics/', metrics, name='metrics'),
 ]
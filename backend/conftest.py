@@ -10,6 +10,9 @@ def pytest_configure():
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
     }
+    # Fill in ATOMIC_REQUESTS and the other defaults the request handler reads
+    from django.db import connections
+    connections.configure_settings(settings.DATABASES)
 
 
 @pytest.fixture(autouse=True)
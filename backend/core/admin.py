@@ -20,12 +20,12 @@ class ProjectAdmin(admin.ModelAdmin):
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ['title', 'project', 'status', 'assignee_email', 'due_date', 'created_at']
-    list_filter = ['status', 'project__organization']
+    list_filter = ['status', 'organization']
     search_fields = ['title', 'description', 'assignee_email']
 
 
 @admin.register(TaskComment)
 class TaskCommentAdmin(admin.ModelAdmin):
     list_display = ['task', 'author_email', 'created_at']
-    list_filter = ['task__project__organization']
+    list_filter = ['organization']
     search_fields = ['content', 'author_email']
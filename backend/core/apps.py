@@ -5,3 +5,9 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from .tenancy import organization_deleted, organization_saved
+        post_save.connect(organization_saved, sender='core.Organization')
+        post_delete.connect(organization_deleted, sender='core.Organization')
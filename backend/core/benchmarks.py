@@ -0,0 +1,290 @@
+"""
+Resolver benchmarks with per-operation SQL query budgets.
+
+Each operation is a GraphQL document the frontend sends, executed against
+core.schema.schema on generated datasets of increasing size. Query budgets
+do not depend on the dataset size, so any N+1 regression in a resolver
+shows up as a budget failure long before it shows up in wall time.
+"""
+import json
+import statistics
+import subprocess
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from .load_data import LoadDataGenerator
+from .models import Organization, Project, Task
+from .schema import schema
+from .subscriptions import PayloadCache, compile_subscription, next_frame_prefix, orjson
+from .tenancy import organization_cache
+
+# Dataset sizes passed to LoadDataGenerator; tasks are skewed towards the
+# first projects so the detail page sees a realistically large project
+SCALES = {
+    'small': dict(orgs=2, projects=5, tasks=10, comments=2, skew=1.0),
+    'medium': dict(orgs=2, projects=20, tasks=50, comments=3, skew=1.0),
+    'large': dict(orgs=2, projects=50, tasks=200, comments=3, skew=1.0),
+}
+
+DASHBOARD_PROJECTS = """
+query ($slug: String!) {
+  projects(organizationSlug: $slug, first: 100) {
+    edges {
+      node { id name status dueDate createdAt taskCount completedTasks }
+    }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+PROJECT_DETAIL = """
+query ($id: ID!) {
+  project(id: $id) { id name status taskCount completedTasks completionRate }
+  tasks(projectId: $id, first: 500) {
+    edges {
+      node {
+        id title status assigneeEmail dueDate createdAt
+        comments(first: 5) { id content authorEmail createdAt }
+      }
+    }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+PROJECT_STATISTICS = """
+query ($id: ID!) {
+  projectStatistics(projectId: $id) {
+    totalTasks completedTasks inProgressTasks todoTasks completionRate
+  }
+}
+"""
+
+PROJECTS_STATISTICS = """
+query ($ids: [ID!]!) {
+  projectsStatistics(projectIds: $ids) {
+    projectId totalTasks completedTasks completionRate
+  }
+}
+"""
+
+TASK_SEARCH = """
+query ($id: ID!, $search: String!) {
+  tasks(projectId: $id, search: $search, first: 50) {
+    edges { node { id title status } }
+  }
+}
+"""
+
+
+@dataclass
+class Operation:
+    """A GraphQL document, how to build its variables, and its query budget."""
+    name: str
+    document: str
+    budget: int
+    variables: Callable
+
+
+def _dashboard_variables(org, project):
+    return {'slug': org.slug}
+
+
+def _project_variables(org, project):
+    return {'id': str(project.id)}
+
+
+def _statistics_variables(org, project):
+    ids = Project.objects.filter(organization=org).values_list('id', flat=True)[:100]
+    return {'ids': [str(pk) for pk in ids]}
+
+
+def _search_variables(org, project):
+    return {'id': str(project.id), 'search': 'search'}
+
+
+# Budgets count every query, including resolving the tenant slug with a
+# cold organization cache
+OPERATIONS = [
+    # Organization, project page with its stored counters
+    Operation('dashboard_projects', DASHBOARD_PROJECTS, 2, _dashboard_variables),
+    # Project, organization, task page, one batched comment query
+    Operation('project_detail', PROJECT_DETAIL, 4, _project_variables),
+    # Stored counters of one project
+    Operation('project_statistics', PROJECT_STATISTICS, 1, _project_variables),
+    # Organization, stored counters of the requested projects
+    Operation('projects_statistics', PROJECTS_STATISTICS, 2, _statistics_variables),
+    # Ranked task page
+    Operation('task_search', TASK_SEARCH, 1, _search_variables),
+]
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_operation(operation, org, project, repeat=5):
+    """Execute operation repeat times and return its timings and query count."""
+    variables = operation.variables(org, project)
+    timings = []
+    queries = 0
+    errors = None
+    for _ in range(repeat):
+        # Start every run cold so the query count does not depend on ordering
+        organization_cache.clear()
+        request = RequestFactory().post('/graphql/')
+        request.organization_slug = org.slug
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            result = schema.execute(operation.document, variable_values=variables, context_value=request)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = max(queries, len(ctx.captured_queries))
+        if result.errors:
+            errors = [str(error) for error in result.errors]
+    return {
+        'name': operation.name,
+        'queries': queries,
+        'budget': operation.budget,
+        'within_budget': queries <= operation.budget and not errors,
+        'errors': errors,
+        'wall_ms': {
+            'min': round(min(timings), 3),
+            'median': round(statistics.median(timings), 3),
+            'max': round(max(timings), 3),
+        },
+    }
+
+
+def run_scale(scale, repeat=5, operations=None, seed=42):
+    """
+    Generate the dataset for scale, run every operation on its first
+    organization and return the results. Generated rows are rolled back.
+    """
+    params = SCALES[scale]
+    operations = OPERATIONS if operations is None else operations
+    with transaction.atomic():
+        generator = LoadDataGenerator(seed=seed, prefix=f'bench-{scale}', **params)
+        generator.generate()
+        org = Organization.objects.get(slug=generator.slugs()[0])
+        # The busiest project, which the skewed split makes the first one
+        project = Project.objects.filter(organization=org).order_by('created_at', 'id').first()
+        results = {
+            'scale': scale,
+            'rows': dict(generator.counts),
+            'project_tasks': Task.objects.filter(project=project).count(),
+            'operations': [run_operation(op, org, project, repeat) for op in operations],
+        }
+        transaction.set_rollback(True)
+    return results
+
+
+def run_benchmarks(scales=('small', 'medium', 'large'), repeat=5, seed=42):
+    """Run every scale and return a JSON-serializable report."""
+    return {
+        'revision': _git_revision(),
+        'database': connection.vendor,
+        'seed': seed,
+        'repeat': repeat,
+        'scales': [run_scale(scale, repeat=repeat, seed=seed) for scale in scales],
+    }
+
+
+def budget_violations(report):
+    """Return (scale, operation) results that exceeded budget or errored."""
+    return [
+        (scale['scale'], op)
+        for scale in report['scales']
+        for op in scale['operations']
+        if not op['within_budget']
+    ]
+
+
+# Selections project board clients subscribe with; subscribers are spread
+# over them round-robin
+FANOUT_DOCUMENTS = [
+    'subscription ($p: ID!) { taskUpdated(projectId: $p) { id title description status assigneeEmail dueDate } }',
+    'subscription ($p: ID!) { taskUpdated(projectId: $p) { id status } }',
+    'subscription ($p: ID!) { task: taskUpdated(projectId: $p) { id title status createdAt } }',
+]
+
+FANOUT_SUBSCRIBERS = (1, 10, 100, 1000, 2000)
+
+
+def _fanout_event():
+    return {
+        'id': str(uuid.uuid4()),
+        'projectId': str(uuid.uuid4()),
+        'title': 'Update the onboarding checklist',
+        'description': 'Covers accounts, hardware and the first week. ' * 8,
+        'status': 'IN_PROGRESS',
+        'assigneeEmail': 'someone@example.com',
+        'dueDate': '2024-06-30',
+        'createdAt': '2024-01-15T09:30:00+00:00',
+    }
+
+
+def _encode_per_subscriber(subscribers, event_id, data):
+    # What consumers did before payloads were shared: one json.dumps each
+    return [
+        json.dumps({'type': 'next', 'id': sub_id, 'payload': {'data': compiled.project(data)}})
+        for sub_id, compiled, _ in subscribers
+    ]
+
+
+def _encode_once(subscribers, event_id, data, cache):
+    return [
+        prefix + cache.payload(compiled, event_id, data) + '}'
+        for _, compiled, prefix in subscribers
+    ]
+
+
+def run_fanout(subscribers=FANOUT_SUBSCRIBERS, events=50):
+    """
+    Return the CPU time per event of building every subscriber's frame,
+    encoding per subscriber against encoding once per selection.
+    """
+    graphql_schema = schema.graphql_schema
+    project_id = str(uuid.uuid4())
+    compiled = [compile_subscription(graphql_schema, doc, {'p': project_id}) for doc in FANOUT_DOCUMENTS]
+    runs = []
+    for count in subscribers:
+        subs = [
+            (str(i), compiled[i % len(compiled)], next_frame_prefix(str(i)))
+            for i in range(count)
+        ]
+        cache = PayloadCache(max_size=len(compiled) * events)
+        event_ids = [uuid.uuid4().hex for _ in range(events)]
+        data = [{'taskUpdated': _fanout_event()} for _ in range(events)]
+
+        started = time.process_time()
+        for event_id, event in zip(event_ids, data):
+            _encode_per_subscriber(subs, event_id, event)
+        per_subscriber = (time.process_time() - started) / events
+
+        started = time.process_time()
+        for event_id, event in zip(event_ids, data):
+            _encode_once(subs, event_id, event, cache)
+        once = (time.process_time() - started) / events
+
+        runs.append({
+            'subscribers': count,
+            'per_subscriber_us': round(per_subscriber * 1e6, 1),
+            'encode_once_us': round(once * 1e6, 1),
+            'speedup': round(per_subscriber / once, 2) if once else None,
+        })
+    return {
+        'revision': _git_revision(),
+        'encoder': 'orjson' if orjson is not None else 'json',
+        'selections': len(FANOUT_DOCUMENTS),
+        'events': events,
+        'runs': runs,
+    }
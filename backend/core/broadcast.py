@@ -0,0 +1,183 @@
+"""Background dispatcher for subscription broadcasts."""
+import asyncio
+import atexit
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+from .event_log import EventLog
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastDispatcher:
+    """
+    Queue channel-layer group sends and deliver them off the request thread.
+
+    Events are queued only once the surrounding transaction commits. Events
+    published with the same key for the same group within coalesce_window
+    seconds collapse into the latest one, which is sent after every event
+    queued before it. Delivery happens on the event loop
+    serving this process's WebSocket consumers when one is attached, so
+    in-memory layers stay on a single loop, otherwise on the dispatcher's own.
+    With an event_log, each message is numbered and recorded as it is sent
+    and carries its cursor, the log's epoch and the number, under 'cursor'.
+    """
+
+    def __init__(self, coalesce_window=0.05, max_queue=10000, send_timeout=5.0, event_log=None):
+        self.coalesce_window = coalesce_window
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.event_log = event_log
+        self._pending = OrderedDict()
+        self._cond = threading.Condition()
+        self._ids = itertools.count()
+        self._in_flight = 0
+        self._thread = None
+        self._own_loop = None
+        self._delivery_loop = None
+        self._atexit_registered = False
+        self.enqueued = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+
+    def attach_loop(self, loop):
+        """Deliver on loop, the event loop running this process's consumers."""
+        self._delivery_loop = loop
+
+    def publish(self, group, message, key=None):
+        """Queue message for group once the current transaction commits."""
+        transaction.on_commit(lambda: self.enqueue(group, message, key))
+
+    def enqueue(self, group, message, key=None):
+        """Queue message for group now, coalescing with a pending one on key."""
+        with self._cond:
+            self.enqueued += 1
+            if key is not None:
+                key = (group, key)
+                entry = self._pending.get(key)
+                if entry is not None:
+                    entry[1] = message
+                    # Behind anything queued since, such as a bulk update of the
+                    # same task, which would otherwise land after this newer state
+                    self._pending.move_to_end(key)
+                    self.coalesced += 1
+                    return
+            else:
+                key = next(self._ids)
+            if len(self._pending) >= self.max_queue:
+                self.dropped += 1
+                logger.warning('Broadcast queue full, dropping event for %s', group)
+                return
+            self._pending[key] = [group, message, time.monotonic() + self.coalesce_window]
+            self._ensure_thread()
+            self._cond.notify()
+
+    def flush(self, timeout=5.0):
+        """Block until every queued event has been delivered or timeout passes."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout
+            )
+
+    def metrics(self):
+        """Return queue depth and delivery counters."""
+        with self._cond:
+            return {
+                'queue_depth': len(self._pending),
+                'in_flight': self._in_flight,
+                'enqueued': self.enqueued,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped,
+                'sent': self.sent,
+                'failed': self.failed,
+            }
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name='broadcast-dispatcher', daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+
+    def _next_batch(self):
+        """Wait for events whose coalescing window has closed and take them."""
+        with self._cond:
+            while True:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                ready_at = next(iter(self._pending.values()))[2]
+                delay = ready_at - time.monotonic()
+                if delay <= 0:
+                    break
+                self._cond.wait(delay)
+            now = time.monotonic()
+            batch = []
+            for key in list(self._pending):
+                if self._pending[key][2] > now:
+                    break
+                group, message, _ = self._pending.pop(key)
+                batch.append((group, message))
+            self._in_flight = len(batch)
+            return batch
+
+    def _run(self):
+        self._own_loop = asyncio.new_event_loop()
+        while True:
+            batch = self._next_batch()
+            try:
+                self._deliver(batch)
+            except Exception:
+                logger.exception('Broadcast delivery failed')
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _deliver(self, batch):
+        loop = self._delivery_loop
+        if loop is not None and loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(self._send_all(batch), loop)
+            future.result(self.send_timeout)
+        else:
+            self._own_loop.run_until_complete(self._send_all(batch))
+
+    async def _send_all(self, batch):
+        channel_layer = get_channel_layer()
+        for group, message in batch:
+            if self.event_log is not None:
+                seq = self.event_log.append(group, message)
+                message = {**message, 'cursor': self.event_log.cursor(seq)}
+            try:
+                await channel_layer.group_send(group, message)
+            except Exception:
+                logger.exception('Broadcast to %s failed', group)
+                ok = False
+            else:
+                ok = True
+            with self._cond:
+                if ok:
+                    self.sent += 1
+                else:
+                    self.failed += 1
+
+
+event_log = EventLog(
+    max_events=getattr(settings, 'SUBSCRIPTION_REPLAY_SIZE', 1000),
+    max_groups=getattr(settings, 'SUBSCRIPTION_REPLAY_GROUPS', 10000),
+)
+
+dispatcher = BroadcastDispatcher(
+    coalesce_window=getattr(settings, 'BROADCAST_COALESCE_WINDOW', 0.05),
+    max_queue=getattr(settings, 'BROADCAST_MAX_QUEUE', 10000),
+    event_log=event_log,
+)
@@ -0,0 +1,254 @@
+"""
+Local channel layer broker over a Unix socket.
+
+A stand-in for Redis that lets several daphne workers on one host share
+groups: each worker's SocketChannelLayer connects to a single Broker
+process, which owns group membership and forwards messages to whichever
+connection registered the destination channel. Frames are length-prefixed
+JSON, so messages must be JSON-serializable.
+"""
+import asyncio
+import json
+import random
+import string
+import struct
+import time
+import weakref
+from collections import defaultdict, deque
+from channels.layers import BaseChannelLayer
+
+_HEADER = struct.Struct('!I')
+
+
+async def read_frame(reader):
+    """Read one frame, or return None when the peer has closed."""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+        body = await reader.readexactly(_HEADER.unpack(header)[0])
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    return json.loads(body)
+
+
+def write_frame(writer, frame):
+    """Queue one frame on writer; callers drain when they need backpressure."""
+    body = json.dumps(frame, separators=(',', ':')).encode()
+    writer.write(_HEADER.pack(len(body)) + body)
+
+
+class Broker:
+    """Routes channel and group messages between connected worker processes."""
+
+    def __init__(self, path, expiry=60, group_expiry=86400, capacity=100):
+        self.path = path
+        self.expiry = expiry
+        self.group_expiry = group_expiry
+        self.capacity = capacity
+        self.owners = {}
+        self.groups = defaultdict(dict)
+        self.pending = defaultdict(deque)
+
+    async def start(self):
+        """Start listening on the Unix socket and return the server."""
+        return await asyncio.start_unix_server(self._handle, path=self.path)
+
+    async def serve_forever(self):
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader, writer):
+        owned = set()
+        try:
+            while True:
+                frame = await read_frame(reader)
+                if frame is None:
+                    break
+                self._dispatch(frame, writer, owned)
+        finally:
+            for channel in owned:
+                if self.owners.get(channel) is writer:
+                    del self.owners[channel]
+            writer.close()
+
+    def _dispatch(self, frame, writer, owned):
+        op = frame['op']
+        if op == 'register':
+            channel = frame['channel']
+            self.owners[channel] = writer
+            owned.add(channel)
+            now = time.time()
+            for expires_at, message in self.pending.pop(channel, ()):
+                if expires_at >= now:
+                    write_frame(writer, {'channel': channel, 'message': message})
+        elif op == 'send':
+            self._deliver(frame['channel'], frame['message'])
+        elif op == 'group_add':
+            self.groups[frame['group']][frame['channel']] = time.time() + self.group_expiry
+        elif op == 'group_discard':
+            members = self.groups.get(frame['group'])
+            if members is not None:
+                members.pop(frame['channel'], None)
+                if not members:
+                    del self.groups[frame['group']]
+        elif op == 'group_send':
+            now = time.time()
+            members = self.groups.get(frame['group'], {})
+            for channel, expires_at in list(members.items()):
+                if expires_at < now:
+                    del members[channel]
+                else:
+                    self._deliver(channel, frame['message'])
+        elif op == 'flush':
+            self.groups.clear()
+            self.pending.clear()
+
+    def _deliver(self, channel, message):
+        writer = self.owners.get(channel)
+        if writer is not None and not writer.is_closing():
+            write_frame(writer, {'channel': channel, 'message': message})
+            return
+        # Hold messages for channels whose receiver has not registered yet
+        queue = self.pending[channel]
+        now = time.time()
+        while queue and queue[0][0] < now:
+            queue.popleft()
+        if len(queue) < self.capacity:
+            queue.append((now + self.expiry, message))
+
+
+class _Connection:
+    """One worker-side connection to the broker, bound to an event loop."""
+
+    def __init__(self, reader, writer, capacity):
+        self.reader = reader
+        self.writer = writer
+        self.capacity = capacity
+        self.queues = {}
+        self._reader_task = None
+
+    @property
+    def closed(self):
+        return self.writer.is_closing()
+
+    async def send(self, frame):
+        write_frame(self.writer, frame)
+        await self.writer.drain()
+
+    async def queue_for(self, channel):
+        """Return the local queue for channel, registering it with the broker."""
+        queue = self.queues.get(channel)
+        if queue is None:
+            queue = self.queues[channel] = asyncio.Queue(maxsize=self.capacity)
+            if self._reader_task is None:
+                self._reader_task = asyncio.ensure_future(self._read())
+            await self.send({'op': 'register', 'channel': channel})
+        return queue
+
+    async def _read(self):
+        while True:
+            frame = await read_frame(self.reader)
+            if frame is None:
+                return
+            queue = self.queues.get(frame['channel'])
+            if queue is not None:
+                try:
+                    queue.put_nowait(frame['message'])
+                except asyncio.QueueFull:
+                    pass
+
+    async def close(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class SocketChannelLayer(BaseChannelLayer):
+    """
+    Channel layer that talks to a local Broker over a Unix socket.
+    Message and group expiry are enforced by the broker.
+    """
+
+    extensions = ['groups', 'flush']
+
+    def __init__(self, path, expiry=60, capacity=100, channel_capacity=None):
+        super().__init__(expiry=expiry, capacity=capacity, channel_capacity=channel_capacity)
+        self.path = path
+        self._connections = weakref.WeakKeyDictionary()
+
+    async def _connection(self):
+        """Return the connection for the running loop, opening it if needed."""
+        loop = asyncio.get_running_loop()
+        connection = self._connections.get(loop)
+        if connection is None or connection.closed:
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            connection = _Connection(reader, writer, self.capacity)
+            if loop not in self._connections:
+                self._close_with_loop(loop)
+            self._connections[loop] = connection
+        return connection
+
+    def _close_with_loop(self, loop):
+        """
+        Close this loop's connection before the loop itself closes, as
+        channels_redis does; async_to_sync runs each call on a fresh loop.
+        """
+        original_close = loop.close
+
+        def close(*args, **kwargs):
+            connection = self._connections.pop(loop, None)
+            if connection is not None and not loop.is_running():
+                loop.run_until_complete(connection.close())
+            original_close(*args, **kwargs)
+
+        loop.close = close
+
+    async def send(self, channel, message):
+        assert isinstance(message, dict), 'message is not a dict'
+        self.valid_channel_name(channel)
+        connection = await self._connection()
+        await connection.send({'op': 'send', 'channel': channel, 'message': message})
+
+    async def receive(self, channel):
+        self.valid_channel_name(channel)
+        connection = await self._connection()
+        queue = await connection.queue_for(channel)
+        return await queue.get()
+
+    async def new_channel(self, prefix='specific.'):
+        name = '%s.socket!%s' % (
+            prefix.rstrip('.'),
+            ''.join(random.choice(string.ascii_letters) for _ in range(12)),
+        )
+        connection = await self._connection()
+        await connection.queue_for(name)
+        return name
+
+    async def group_add(self, group, channel):
+        self.valid_group_name(group)
+        self.valid_channel_name(channel)
+        connection = await self._connection()
+        await connection.send({'op': 'group_add', 'group': group, 'channel': channel})
+
+    async def group_discard(self, group, channel):
+        self.valid_group_name(group)
+        self.valid_channel_name(channel)
+        connection = await self._connection()
+        await connection.send({'op': 'group_discard', 'group': group, 'channel': channel})
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), 'message is not a dict'
+        self.valid_group_name(group)
+        connection = await self._connection()
+        await connection.send({'op': 'group_send', 'group': group, 'message': message})
+
+    async def flush(self):
+        connection = await self._connection()
+        await connection.send({'op': 'flush'})
+        for queue in connection.queues.values():
+            while not queue.empty():
+                queue.get_nowait()
@@ -0,0 +1,172 @@
+"""
+Static cost analysis of GraphQL operations.
+
+Before an operation runs, its selection set is walked against the schema and
+every field is charged once per object it would be resolved on. List fields
+multiply the cost of everything below them by their expected size: the
+`first` argument of a connection (capped like paginate caps it), the length
+of a list argument such as projectIds, or DEFAULT_LIST_SIZE otherwise. The
+estimate is an upper bound that needs no database access, so an operation
+over the budget is rejected before any resolver is called.
+"""
+from dataclasses import dataclass
+from django.conf import settings
+from graphene.validation import depth_limit_validator
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLList,
+    GraphQLObjectType,
+    InlineFragmentNode,
+    Undefined,
+    get_named_type,
+    get_nullable_type,
+    specified_rules,
+    type_from_ast,
+    value_from_ast,
+)
+from graphql.execution.values import get_variable_values
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+# Expected size of list fields that take no `first` or list argument
+DEFAULT_LIST_SIZE = DEFAULT_PAGE_SIZE
+
+# Rules every cached document passes, over HTTP or WebSocket
+VALIDATION_RULES = (
+    *specified_rules,
+    depth_limit_validator(max_depth=getattr(settings, 'GRAPHQL_MAX_DEPTH', 10)),
+)
+
+
+@dataclass
+class QueryCost:
+    """Estimated cost of one operation and the budget it was checked against."""
+    cost: int
+    max_cost: int
+
+    @property
+    def exceeded(self):
+        return self.max_cost is not None and self.cost > self.max_cost
+
+    def as_extension(self):
+        return {'requested': self.cost, 'maximum': self.max_cost}
+
+
+def _is_connection(graphql_type):
+    return isinstance(graphql_type, GraphQLObjectType) and 'edges' in graphql_type.fields
+
+
+def _argument_values(field_def, field_node, variables):
+    """Return the arguments of a field that can be evaluated, skipping invalid ones."""
+    values = {}
+    for argument in field_node.arguments:
+        arg_def = field_def.args.get(argument.name.value)
+        if arg_def is not None:
+            value = value_from_ast(argument.value, arg_def.type, variables)
+            if value is not Undefined:
+                values[argument.name.value] = value
+    return values
+
+
+def _list_size(field_def, field_node, variables):
+    """Return the number of items a list or connection field is expected to return."""
+    args = _argument_values(field_def, field_node, variables)
+    first = args.get('first')
+    if _is_connection(get_named_type(field_def.type)):
+        return min(max(first or DEFAULT_PAGE_SIZE, 0), MAX_PAGE_SIZE)
+    if first is not None:
+        return max(first, 0)
+    for value in args.values():
+        if isinstance(value, list):
+            return len(value)
+    return DEFAULT_LIST_SIZE
+
+
+class _CostWalker:
+    def __init__(self, schema, fragments, variables):
+        self.schema = schema
+        self.fragments = fragments
+        self.variables = variables
+
+    def selection_set(self, selection_set, parent_type, multiplier, edges_size=None):
+        cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                cost += self.field(selection, parent_type, multiplier, edges_size)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition is not None:
+                    fragment_type = self.schema.get_type(selection.type_condition.name.value)
+                cost += self.selection_set(selection.selection_set, fragment_type, multiplier, edges_size)
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments.get(selection.name.value)
+                if fragment is not None:
+                    fragment_type = self.schema.get_type(fragment.type_condition.name.value)
+                    cost += self.selection_set(fragment.selection_set, fragment_type, multiplier, edges_size)
+        return cost
+
+    def field(self, node, parent_type, multiplier, edges_size):
+        name = node.name.value
+        # Introspection is served from the schema, not the database
+        if name.startswith('__') or not hasattr(parent_type, 'fields'):
+            return 0
+        field_def = parent_type.fields.get(name)
+        if field_def is None:
+            return 0
+        cost = multiplier
+        if node.selection_set is None:
+            return cost
+
+        field_type = get_nullable_type(field_def.type)
+        child_edges_size = None
+        if isinstance(field_type, GraphQLList):
+            # A connection's edges are sized by the connection's arguments
+            size = edges_size if name == 'edges' and edges_size is not None else _list_size(field_def, node, self.variables)
+            multiplier *= size
+        elif _is_connection(get_named_type(field_type)):
+            child_edges_size = _list_size(field_def, node, self.variables)
+        return cost + self.selection_set(
+            node.selection_set, get_named_type(field_type), multiplier, child_edges_size
+        )
+
+
+def coerce_variables(schema, operation, variables):
+    """
+    Return operation's variable values with defaults applied. Invalid values
+    fail at execution; until then only the declared defaults are used.
+    """
+    coerced = get_variable_values(schema, operation.variable_definitions, variables or {})
+    if not isinstance(coerced, list):
+        return coerced
+    return {
+        definition.variable.name.value: value_from_ast(
+            definition.default_value, type_from_ast(schema, definition.type)
+        )
+        for definition in operation.variable_definitions
+        if definition.default_value is not None
+    }
+
+
+def estimate_cost(schema, document, operation, variables=None):
+    """Return the estimated cost of running operation from document."""
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if getattr(definition, 'type_condition', None) is not None
+    }
+    root_type = schema.get_root_type(operation.operation)
+    walker = _CostWalker(schema, fragments, coerce_variables(schema, operation, variables))
+    return walker.selection_set(operation.selection_set, root_type, 1)
+
+
+def analyze_cost(schema, document, operation, variables=None, max_cost=None):
+    """Return the QueryCost of an operation checked against max_cost."""
+    return QueryCost(cost=estimate_cost(schema, document, operation, variables), max_cost=max_cost)
+
+
+def cost_exceeded_error(query_cost):
+    return GraphQLError(
+        f'Query cost {query_cost.cost} exceeds the maximum of {query_cost.max_cost}',
+        extensions={'code': 'QUERY_TOO_COMPLEX', 'cost': query_cost.as_extension()},
+    )
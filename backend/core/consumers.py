@@ -1,7 +1,41 @@
 """WebSocket consumer for GraphQL subscriptions."""
+import asyncio
 import json
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
-from asgiref.sync import sync_to_async
+from channels.layers import InMemoryChannelLayer
+from django.conf import settings
+from .broadcast import dispatcher, event_log
+from .event_log import parse_cursor
+from .outbound import OutboundQueue
+from .schema import schema
+from .subscriptions import SubscriptionError, compile_subscription, next_frame_prefix, payload_cache
+
+# Close code for connections dropped because they cannot keep up
+SATURATED_CLOSE_CODE = 1013
+
+
+def _events(message):
+    """Yield (event id, {root field: value}) for each event in a group message."""
+    event_id = message.get('event_id')
+    if message['type'] == 'subscription_update':
+        yield event_id, message['data']
+        return
+    field_name, items = {
+        'tasks_updated': ('taskUpdated', message.get('tasks')),
+        'organization_activity': ('organizationActivity', message.get('activities')),
+    }[message['type']]
+    for index, item in enumerate(items):
+        yield (f'{event_id}:{index}' if event_id else None), {field_name: item}
+
+
+def _coalesce_key(data):
+    """Return the task id whose pending events data supersedes, if any."""
+    task = data.get('taskUpdated')
+    activity = data.get('organizationActivity')
+    if task is None and activity and activity.get('kind') == 'TASK_UPDATED':
+        task = activity.get('task')
+    return task.get('id') if isinstance(task, dict) else None
 
 
 class GraphQLSubscriptionConsumer(AsyncWebsocketConsumer):
@@ -10,11 +44,25 @@ class GraphQLSubscriptionConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         """Handle WebSocket connection."""
         self.subscriptions = {}
+        # Subscription id -> start of its next frames, encoded once
+        self.frame_prefixes = {}
+        # Subscription id -> (epoch, sequence) of the last event replayed from the event log
+        self.replayed_through = {}
+        self.outbound = OutboundQueue(
+            self.send,
+            lambda: self.close(code=SATURATED_CLOSE_CODE),
+            max_size=getattr(settings, 'SUBSCRIPTION_QUEUE_SIZE', 100),
+            saturation_timeout=getattr(settings, 'SUBSCRIPTION_SATURATION_TIMEOUT', 5.0),
+        )
+        self.outbound.start()
+        # Broadcasts from this process are delivered on the consumers' loop
+        dispatcher.attach_loop(asyncio.get_running_loop())
         await self.accept()
     
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection."""
-        for group_name in self.subscriptions.values():
+        self.outbound.stop()
+        for group_name in {compiled.group for compiled in self.subscriptions.values()}:
             await self.channel_layer.group_discard(group_name, self.channel_name)
     
     async def receive(self, text_data):
@@ -23,43 +71,123 @@ class GraphQLSubscriptionConsumer(AsyncWebsocketConsumer):
         msg_type = data.get('type')
         
         if msg_type == 'connection_init':
-            await self.send(json.dumps({'type': 'connection_ack'}))
+            self.outbound.put(json.dumps({'type': 'connection_ack'}))
         elif msg_type == 'subscribe':
             await self.handle_subscribe(data)
         elif msg_type == 'complete':
             await self.handle_unsubscribe(data)
     
     async def handle_subscribe(self, data):
-        """Handle subscription request."""
+        """
+        Handle subscription request. The document is parsed and validated
+        through the shared document cache; errors end the subscription.
+        Compiling may look up an organization, so it runs off the loop.
+        """
         sub_id = data.get('id')
-        payload = data.get('payload', {})
-        query = payload.get('query', '')
-        variables = payload.get('variables', {})
-        
-        # Determine subscription type and group
-        if 'taskUpdated' in query:
-            project_id = variables.get('projectId')
-            group_name = f'project_{project_id}_tasks'
-        elif 'commentAdded' in query:
-            task_id = variables.get('taskId')
-            group_name = f'task_{task_id}_comments'
-        else:
+        payload = data.get('payload') or {}
+        extensions = payload.get('extensions') or {}
+        persisted = extensions.get('persistedQuery') if isinstance(extensions, dict) else None
+        try:
+            compiled = await database_sync_to_async(compile_subscription)(
+                schema.graphql_schema,
+                payload.get('query', ''),
+                variables=payload.get('variables'),
+                operation_name=payload.get('operationName'),
+                sha=persisted.get('sha256Hash') if isinstance(persisted, dict) else None,
+            )
+        except SubscriptionError as e:
+            self.outbound.put(json.dumps({
+                'type': 'error',
+                'id': sub_id,
+                'payload': [error.formatted for error in e.errors],
+            }))
             return
         
-        self.subscriptions[sub_id] = group_name
-        await self.channel_layer.group_add(group_name, self.channel_name)
+        self.subscriptions[sub_id] = compiled
+        self.frame_prefixes[sub_id] = next_frame_prefix(sub_id)
+        await self.channel_layer.group_add(compiled.group, self.channel_name)
+        # Live messages wait until this handler returns, so none are missed
+        if compiled.since is not None:
+            self._resume(sub_id, compiled)
     
     async def handle_unsubscribe(self, data):
         """Handle unsubscribe request."""
-        sub_id = data.get('id')
-        if sub_id in self.subscriptions:
-            group_name = self.subscriptions.pop(sub_id)
-            await self.channel_layer.group_discard(group_name, self.channel_name)
+        compiled = self.subscriptions.pop(data.get('id'), None)
+        if compiled is None:
+            return
+        del self.frame_prefixes[data.get('id')]
+        self.replayed_through.pop(data.get('id'), None)
+        # Other subscriptions of this connection may share the group
+        if all(other.group != compiled.group for other in self.subscriptions.values()):
+            await self.channel_layer.group_discard(compiled.group, self.channel_name)
+    
+    def _deliver(self, message, sub_ids=None):
+        """
+        Queue a group message's events for each subscription on its group,
+        or only for sub_ids; see core.outbound. Messages a resumed
+        subscription already got from the event log are skipped. The
+        publisher's cursor is passed on unchanged.
+        """
+        group, cursor = message.get('group'), message.get('cursor')
+        position = parse_cursor(cursor) if cursor is not None else None
+        targets = [
+            (sub_id, compiled) for sub_id, compiled in self.subscriptions.items()
+            if compiled.group == group and (sub_ids is None or sub_id in sub_ids)
+            and not self._replayed(sub_id, position)
+        ]
+        if not targets:
+            return
+        extensions = {'cursor': cursor} if cursor is not None else None
+        for event_id, data in _events(message):
+            object_id = _coalesce_key(data)
+            for sub_id, compiled in targets:
+                if compiled.accepts(data):
+                    payload = payload_cache.payload(compiled, event_id, data, extensions)
+                    key = (sub_id, object_id) if object_id is not None else None
+                    self.outbound.put(self.frame_prefixes[sub_id] + payload + '}', key)
+
+    def _replayed(self, sub_id, position):
+        """Return whether the event at (epoch, sequence) position was already replayed to sub_id."""
+        last = self.replayed_through.get(sub_id)
+        return (
+            last is not None and position is not None
+            and position[0] == last[0] and position[1] <= last[1]
+        )
+
+    def _resume(self, sub_id, compiled):
+        """Queue the events compiled.group sent after compiled.since, or ask the client to refetch."""
+        # With a shared layer other workers publish to the group too, and
+        # their events are only in their own logs
+        if isinstance(self.channel_layer, InMemoryChannelLayer):
+            missed = event_log.since(compiled.group, compiled.since)
+        else:
+            missed = None
+        if missed is None:
+            self.outbound.put(json.dumps({
+                'type': 'next',
+                'id': sub_id,
+                'payload': {
+                    'data': None,
+                    'errors': [{
+                        'message': 'Missed events are no longer available; refetch and resubscribe',
+                        'extensions': {'code': 'RESUME_UNAVAILABLE'},
+                    }],
+                },
+            }))
+            return
+        for seq, message in missed:
+            self._deliver({**message, 'cursor': event_log.cursor(seq)}, sub_ids=(sub_id,))
+        if missed:
+            self.replayed_through[sub_id] = (event_log.epoch, missed[-1][0])
     
     async def subscription_update(self, event):
-        """Send subscription update to client."""
-        await self.send(json.dumps({
-            'type': 'next',
-            'id': event.get('subscription_id'),
-            'payload': {'data': event.get('data')}
-        }))
+        """Send an event to each subscription on its group, with only the fields it selected."""
+        self._deliver(event)
+
+    async def tasks_updated(self, event):
+        """Send each task from a bulk mutation event as its own taskUpdated update."""
+        self._deliver(event)
+
+    async def organization_activity(self, event):
+        """Send each activity of an organization event to the subscriptions whose filter accepts it."""
+        self._deliver(event)
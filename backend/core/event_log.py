@@ -0,0 +1,110 @@
+"""
+Replayable log of recent subscription broadcasts.
+
+The broadcast dispatcher numbers every group message it sends from one
+process-wide, monotonically increasing sequence and keeps the last
+max_events messages of each group. Subscribers receive the message's cursor
+(this log's epoch and the sequence number) with every event; a client that
+reconnects subscribes with since: <cursor> and is sent only the messages it
+missed. Cursors from another log (another process, or before a restart) or
+older than what is still retained cannot be resumed, and the client has to
+refetch. Only a process that publishes every event of its groups has all
+of them in its log, so consumers replay only over the in-memory channel
+layer; with a shared layer, other workers publish to the same groups.
+"""
+import threading
+import uuid
+from collections import OrderedDict, deque
+
+
+def parse_cursor(cursor):
+    """Return the (epoch, sequence) of a cursor from any log, or None."""
+    epoch, _, seq = str(cursor).partition(':')
+    if not epoch or not seq.isdigit():
+        return None
+    return epoch, int(seq)
+
+
+class EventLog:
+    """Thread-safe ring buffers of (sequence, message) per group, LRU over groups."""
+
+    def __init__(self, max_events=1000, max_groups=10000):
+        self.max_events = max_events
+        self.max_groups = max_groups
+        self.epoch = uuid.uuid4().hex[:12]
+        self._groups = OrderedDict()
+        self._lock = threading.Lock()
+        self._seq = 0
+        # Highest sequence lost with a group evicted from the LRU
+        self._evicted_through = 0
+        self.replayed = 0
+        self.expired = 0
+
+    def cursor(self, seq):
+        """Return the opaque cursor clients resume from for seq."""
+        return f'{self.epoch}:{seq}'
+
+    def parse_cursor(self, cursor):
+        """Return the sequence number of a cursor from this log, or None."""
+        position = parse_cursor(cursor)
+        if position is None or position[0] != self.epoch:
+            return None
+        return position[1]
+
+    def append(self, group, message):
+        """Record message as the next event of group and return its sequence number."""
+        with self._lock:
+            self._seq += 1
+            entry = self._groups.get(group)
+            if entry is None:
+                # [events, highest sequence pushed out of the ring]
+                entry = self._groups[group] = [deque(maxlen=self.max_events), 0]
+                while len(self._groups) > self.max_groups:
+                    _, (events, _) = self._groups.popitem(last=False)
+                    self._evicted_through = max(self._evicted_through, events[-1][0])
+            else:
+                self._groups.move_to_end(group)
+            events = entry[0]
+            if len(events) == events.maxlen:
+                entry[1] = events[0][0]
+            events.append((self._seq, message))
+            return self._seq
+
+    def since(self, group, cursor):
+        """
+        Return the (sequence, message) pairs of group after cursor, oldest
+        first, or None if some of them are no longer retained.
+        """
+        seq = self.parse_cursor(cursor)
+        with self._lock:
+            if seq is None or seq > self._seq:
+                self.expired += 1
+                return None
+            entry = self._groups.get(group)
+            if entry is None:
+                if seq < self._evicted_through:
+                    self.expired += 1
+                    return None
+                return []
+            events, dropped_through = entry
+            if seq < dropped_through:
+                self.expired += 1
+                return None
+            missed = [(event_seq, message) for event_seq, message in events if event_seq > seq]
+            self.replayed += len(missed)
+            return missed
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'groups': len(self._groups),
+                'events': sum(len(events) for events, _ in self._groups.values()),
+                'replayed': self.replayed,
+                'expired': self.expired,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._groups.clear()
+            self._evicted_through = 0
+            self.replayed = self.expired = 0
@@ -0,0 +1,166 @@
+"""
+Deterministic synthetic data for scale testing.
+
+The same parameters and seed always produce the same rows, ids and
+timestamps, so benchmarks compare like with like across runs. Rows are
+written with batched multi-row inserts and never held in memory beyond one
+batch.
+"""
+import datetime
+import random
+import time
+import uuid
+from django.db import transaction
+from .models import Organization, Project, Task, TaskComment, ProjectStatus, TaskStatus
+from .tenant_io import RECORD_MODELS, insert_records
+
+# Fixed origin for generated timestamps, so reruns produce identical rows
+EPOCH = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+WORDS = [
+    'api', 'billing', 'cache', 'dashboard', 'deploy', 'design', 'docs', 'email',
+    'export', 'frontend', 'import', 'index', 'login', 'migration', 'mobile',
+    'onboarding', 'payments', 'reports', 'search', 'security', 'signup', 'sync',
+]
+
+PROJECT_STATUSES = [s.value for s in ProjectStatus]
+TASK_STATUSES = [s.value for s in TaskStatus]
+
+
+def zipf_split(total, parts, skew):
+    """
+    Split total into parts integers with weights 1 / (i + 1) ** skew.
+    A skew of 0 gives an even split; larger values concentrate rows in the
+    first parts. The result always sums to total.
+    """
+    weights = [1 / (i + 1) ** skew for i in range(parts)]
+    scale = total / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    for i in range(total - sum(counts)):
+        counts[i % parts] += 1
+    return counts
+
+
+class LoadDataGenerator:
+    """
+    Generate organizations named '<prefix>-NNNN' with their projects, tasks
+    and comments.
+
+    The first organization is the whale: it gets whale_factor times the
+    projects of the others. Within each organization, tasks are spread over
+    projects by zipf_split with the given skew.
+    """
+
+    def __init__(self, orgs=10, projects=20, tasks=50, comments=3, skew=0.0,
+                 whale_factor=1, seed=42, batch_size=5000, prefix='load'):
+        self.orgs = orgs
+        self.projects = projects
+        self.tasks = tasks
+        self.comments = comments
+        self.skew = skew
+        self.whale_factor = whale_factor
+        self.seed = seed
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.counts = dict.fromkeys(RECORD_MODELS, 0)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def slugs(self):
+        return [f'{self.prefix}-{i:04d}' for i in range(self.orgs)]
+
+    def generate(self, progress=None):
+        """Insert every organization, one transaction each; return the counts."""
+        for index, slug in enumerate(self.slugs()):
+            started = time.monotonic()
+            with transaction.atomic():
+                self._generate_org(index, slug)
+            if progress is not None:
+                progress(slug, time.monotonic() - started)
+        return self.counts
+
+    def _generate_org(self, index, slug):
+        # Seed per organization so one tenant's rows do not depend on the others
+        rng = random.Random(f'{self.seed}:{index}')
+        clock = _Clock(rng)
+
+        org = Organization(
+            id=_uuid(rng), name=f'Load Org {index}', slug=slug,
+            contact_email=f'admin@{slug}.example.com', created_at=clock.tick(),
+        )
+        self._insert('organization', [org])
+
+        num_projects = self.projects * (self.whale_factor if index == 0 else 1)
+        projects = [
+            Project(
+                id=_uuid(rng), organization_id=org.id,
+                name=f'{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}',
+                description=' '.join(rng.choices(WORDS, k=8)),
+                status=rng.choice(PROJECT_STATUSES),
+                created_at=clock.tick(),
+            )
+            for i in range(num_projects)
+        ]
+        for start in range(0, len(projects), self.batch_size):
+            self._insert('project', projects[start:start + self.batch_size])
+
+        per_project = zipf_split(self.tasks * num_projects, num_projects, self.skew)
+        batch = []
+        for project, count in zip(projects, per_project):
+            for i in range(count):
+                batch.append(Task(
+                    id=_uuid(rng), project_id=project.id, organization_id=org.id,
+                    title=f'{rng.choice(WORDS).title()} {rng.choice(WORDS)} task {i}',
+                    description=' '.join(rng.choices(WORDS, k=12)),
+                    status=rng.choice(TASK_STATUSES),
+                    assignee_email=f'user{rng.randrange(50)}@{slug}.example.com',
+                    created_at=clock.tick(),
+                ))
+                if len(batch) >= self.batch_size:
+                    self._insert_tasks(batch, rng, clock)
+                    batch = []
+        if batch:
+            self._insert_tasks(batch, rng, clock)
+        # Inserts skip Task.save, so fill the project counters in one pass
+        Project.objects.filter(organization_id=org.id).recompute_task_counts()
+
+    def _insert_tasks(self, tasks, rng, clock):
+        """Insert a batch of tasks, then their comments in batches."""
+        self._insert('task', tasks)
+        comments = []
+        for task in tasks:
+            for i in range(self.comments):
+                comments.append(TaskComment(
+                    id=_uuid(rng), task_id=task.id, organization_id=task.organization_id,
+                    content=' '.join(rng.choices(WORDS, k=10)),
+                    author_email=f'user{rng.randrange(50)}@example.com',
+                    created_at=clock.tick(),
+                ))
+                if len(comments) >= self.batch_size:
+                    self._insert('comment', comments)
+                    comments = []
+        if comments:
+            self._insert('comment', comments)
+
+    def _insert(self, kind, objs):
+        # Inserts skip save(), so callers set organization_id themselves
+        insert_records(kind, objs)
+        self.counts[kind] += len(objs)
+
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+class _Clock:
+    """Strictly increasing timestamps from EPOCH with random gaps."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.now = EPOCH
+
+    def tick(self):
+        self.now += datetime.timedelta(microseconds=self.rng.randrange(1, 5_000_000))
+        return self.now
@@ -0,0 +1,114 @@
+"""Request-scoped batch loaders for GraphQL resolvers."""
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from .models import TaskComment
+
+
+class BatchLoader(ABC):
+    """
+    Synchronous DataLoader keyed by primary key.
+    Keys are queued by list resolvers and fetched together on first load.
+    Subclasses implement batch_load.
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self._queue = []
+
+    @abstractmethod
+    def batch_load(self, keys):
+        """Return a dict mapping each key to its value."""
+
+    def default(self, key):
+        """Value returned for keys the batch did not produce."""
+        return None
+
+    def prime(self, key, value):
+        """Store a known value so the key is never fetched."""
+        self._cache.setdefault(key, value)
+
+    def enqueue(self, keys):
+        """Queue keys to be fetched with the next batch."""
+        self._queue.extend(key for key in keys if key not in self._cache)
+
+    def load(self, key):
+        """Return the value for key, fetching all queued keys at once."""
+        if key not in self._cache:
+            self._queue.append(key)
+            self.dispatch()
+        return self._cache[key]
+
+    def dispatch(self):
+        """Fetch every queued key with a single batch_load call."""
+        keys = list(dict.fromkeys(k for k in self._queue if k not in self._cache))
+        self._queue = []
+        if not keys:
+            return
+        results = self.batch_load(keys)
+        for key in keys:
+            self._cache[key] = results.get(key, self.default(key))
+
+
+class TaskCommentsLoader(BatchLoader):
+    """
+    Load comments per task with one task_id IN (...) query.
+    When first is set, a ROW_NUMBER() window keeps the newest N per task.
+    """
+
+    def __init__(self, first=None):
+        super().__init__()
+        self.first = first
+
+    def default(self, key):
+        return []
+
+    def batch_load(self, keys):
+        queryset = TaskComment.objects.filter(task_id__in=keys)
+        if self.first is not None:
+            queryset = queryset.annotate(
+                row_number=Window(
+                    expression=RowNumber(),
+                    partition_by=[F('task_id')],
+                    order_by=[F('created_at').desc(), F('id').desc()],
+                )
+            ).filter(row_number__lte=self.first)
+        comments = defaultdict(list)
+        for comment in queryset.order_by('-created_at'):
+            comments[comment.task_id].append(comment)
+        return comments
+
+
+class Loaders:
+    """Container for the loaders attached to one request."""
+
+    def __init__(self):
+        self._task_comments = {}
+        self._task_ids = []
+
+    def task_comments(self, first=None):
+        """Return the comments loader for a given per-task limit."""
+        loader = self._task_comments.get(first)
+        if loader is None:
+            loader = self._task_comments[first] = TaskCommentsLoader(first)
+            loader.enqueue(self._task_ids)
+        return loader
+
+    def enqueue_tasks(self, tasks):
+        """Queue task ids so their comments are fetched in one batch."""
+        ids = [task.pk for task in tasks]
+        self._task_ids.extend(ids)
+        for loader in self._task_comments.values():
+            loader.enqueue(ids)
+
+
+def get_loaders(context):
+    """Return the loaders for this request, creating them on first use."""
+    if context is None:
+        return Loaders()
+    loaders = getattr(context, 'loaders', None)
+    if loaders is None:
+        loaders = Loaders()
+        context.loaders = loaders
+    return loaders
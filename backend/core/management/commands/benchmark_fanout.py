@@ -0,0 +1,33 @@
+"""Management command to benchmark encoding subscription events for many subscribers."""
+import json
+from django.core.management.base import BaseCommand
+from core.benchmarks import FANOUT_SUBSCRIBERS, run_fanout
+
+
+class Command(BaseCommand):
+    help = 'Measure per-event CPU of building subscription frames against subscriber count'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--subscribers', action='append', type=int,
+            help='Subscribers on the group; repeat for several (default: 1 to 2000)',
+        )
+        parser.add_argument('--events', type=int, default=50, help='Events sent per run')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        report = run_fanout(options['subscribers'] or FANOUT_SUBSCRIBERS, events=options['events'])
+
+        self.stdout.write(f"encoder: {report['encoder']}, {report['selections']} distinct selections")
+        for run in report['runs']:
+            self.stdout.write(
+                f"  {run['subscribers']:>6} subscribers  "
+                f"{run['per_subscriber_us']:>11.1f} us/event encoding per subscriber  "
+                f"{run['encode_once_us']:>11.1f} us/event encoding once  "
+                f"x{run['speedup']}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
@@ -0,0 +1,43 @@
+"""Management command to benchmark GraphQL resolvers against query budgets."""
+import json
+from django.core.management.base import BaseCommand, CommandError
+from core.benchmarks import SCALES, budget_violations, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Benchmark representative GraphQL operations on generated datasets'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', action='append', choices=sorted(SCALES), dest='scales',
+            help='Dataset size to run; repeat for several (default: all)',
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per operation')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        scales = options['scales'] or list(SCALES)
+        report = run_benchmarks(scales, repeat=options['repeat'], seed=options['seed'])
+
+        for scale in report['scales']:
+            self.stdout.write(f"{scale['scale']}: {scale['rows']}")
+            for op in scale['operations']:
+                status = 'ok' if op['within_budget'] else 'OVER BUDGET'
+                self.stdout.write(
+                    f"  {op['name']:<22} {op['queries']:>3}/{op['budget']} queries  "
+                    f"{op['wall_ms']['median']:>9.2f} ms median  {status}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+        violations = budget_violations(report)
+        if violations:
+            raise CommandError('Query budget exceeded: ' + ', '.join(
+                f"{scale}/{op['name']} ({op['queries']} > {op['budget']})"
+                + (f" errors: {op['errors']}" if op['errors'] else '')
+                for scale, op in violations
+            ))
@@ -0,0 +1,50 @@
+"""Management command to write the persisted query allow-list manifest."""
+import json
+import re
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from graphql import GraphQLSyntaxError, OperationDefinitionNode, parse, print_ast
+
+# gql`...` template literals without ${} interpolation
+GQL_LITERAL = re.compile(r'gql`((?:[^`$]|\$(?!\{))*)`')
+
+
+class Command(BaseCommand):
+    help = 'Collect the frontend GraphQL documents into a persisted query manifest'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            default=str(Path(settings.BASE_DIR).parent / 'frontend' / 'src' / 'graphql'),
+            help='Directory of .ts files holding gql`...` documents',
+        )
+        parser.add_argument(
+            '--output',
+            default=str(Path(settings.BASE_DIR) / 'persisted_queries.json'),
+            help='Manifest file to write',
+        )
+
+    def handle(self, *args, **options):
+        source = Path(options['source'])
+        files = sorted(source.glob('*.ts'))
+        if not files:
+            raise CommandError(f'No .ts files found in {source}')
+
+        manifest = {}
+        for path in files:
+            for literal in GQL_LITERAL.findall(path.read_text(encoding='utf-8')):
+                try:
+                    document = parse(literal)
+                except GraphQLSyntaxError as e:
+                    raise CommandError(f'{path.name}: {e.message}')
+                for definition in document.definitions:
+                    if isinstance(definition, OperationDefinitionNode) and definition.name:
+                        manifest[definition.name.value] = print_ast(document)
+
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write('\n')
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(manifest)} documents to {options['output']}"
+        ))
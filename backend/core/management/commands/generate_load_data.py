@@ -0,0 +1,63 @@
+"""Management command to generate a large deterministic dataset."""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from core.load_data import LoadDataGenerator
+from core.models import Organization
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic organizations, projects, tasks and comments for scale testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orgs', type=int, default=10)
+        parser.add_argument('--projects', type=int, default=20, help='Projects per organization')
+        parser.add_argument('--tasks', type=int, default=50, help='Average tasks per project')
+        parser.add_argument('--comments', type=int, default=3, help='Comments per task')
+        parser.add_argument(
+            '--skew', type=float, default=0.0,
+            help='Zipf exponent spreading tasks over projects; 0 is even',
+        )
+        parser.add_argument(
+            '--whale-factor', type=int, default=1,
+            help='How many times more projects the first organization gets',
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='load', help='Organization slug prefix')
+        parser.add_argument(
+            '--replace', action='store_true',
+            help='Delete existing organizations with the same slugs first',
+        )
+
+    def handle(self, *args, **options):
+        generator = LoadDataGenerator(
+            orgs=options['orgs'],
+            projects=options['projects'],
+            tasks=options['tasks'],
+            comments=options['comments'],
+            skew=options['skew'],
+            whale_factor=options['whale_factor'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            prefix=options['prefix'],
+        )
+
+        existing = Organization.objects.filter(slug__in=generator.slugs())
+        if existing.exists():
+            if not options['replace']:
+                raise CommandError(
+                    f"Organizations with prefix {options['prefix']!r} already exist; "
+                    'pass --replace to regenerate them'
+                )
+            existing.delete()
+
+        started = time.monotonic()
+        generator.generate(
+            progress=lambda slug, elapsed: self.stdout.write(f'Generated {slug} in {elapsed:.2f}s')
+        )
+        elapsed = time.monotonic() - started
+        summary = ', '.join(f'{count} {kind}' for kind, count in generator.counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {generator.total} rows ({summary}) in {elapsed:.2f}s '
+            f'({generator.total / max(elapsed, 1e-9):.0f} rows/sec)'
+        ))
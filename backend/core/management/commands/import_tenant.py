@@ -0,0 +1,40 @@
+"""Management command to load an organization dump written by export_tenant."""
+import sys
+import time
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from core.tenant_io import FORMATS, READERS, TenantImporter
+
+
+class Command(BaseCommand):
+    help = 'Import an organization dump written by export_tenant'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='Dump file to read, or - for standard input')
+        parser.add_argument('--format', choices=FORMATS, default='ndjson')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows written per bulk_create call',
+        )
+
+    def handle(self, *args, **options):
+        path = options['input']
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+
+        started = time.monotonic()
+        importer = TenantImporter(batch_size=options['batch_size'])
+        try:
+            counts = importer.load(READERS[options['format']](stream))
+        except (ValueError, KeyError, TypeError, ValidationError, IntegrityError) as e:
+            raise CommandError(f'Import failed, nothing was written: {e}')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        elapsed = time.monotonic() - started
+        summary = ', '.join(f'{count} {kind}' for kind, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {importer.total} rows ({summary}) in {elapsed:.2f}s '
+            f'({importer.total / max(elapsed, 1e-9):.0f} rows/sec)'
+        ))
@@ -0,0 +1,36 @@
+"""Management command to repair the stored per-project task counters."""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from core.models import Organization, Project
+
+
+class Command(BaseCommand):
+    help = 'Recount the tasks of every project and repair counters that have drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization', action='append', default=[], metavar='SLUG',
+            help='Only repair this organization (repeatable)',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Projects locked and recounted per transaction',
+        )
+
+    def handle(self, *args, **options):
+        projects = Project.objects.all()
+        slugs = options['organization']
+        if slugs:
+            found = set(Organization.objects.filter(slug__in=slugs).values_list('slug', flat=True))
+            missing = sorted(set(slugs) - found)
+            if missing:
+                raise CommandError(f"Unknown organization: {', '.join(missing)}")
+            projects = projects.filter(organization__slug__in=slugs)
+
+        started = time.monotonic()
+        checked = projects.count()
+        repaired = projects.recompute_task_counts(chunk_size=options['chunk_size'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} projects in {elapsed:.2f}s, repaired {repaired}'
+        ))
@@ -0,0 +1,40 @@
+"""Management command to run the local channel layer broker."""
+import asyncio
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.channel_broker import Broker
+
+
+class Command(BaseCommand):
+    help = 'Run the Unix socket channel broker shared by local daphne workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--socket',
+            default=settings.CHANNEL_BROKER_SOCKET,
+            help='Path of the Unix socket to listen on',
+        )
+        parser.add_argument('--expiry', type=int, default=60)
+        parser.add_argument('--group-expiry', type=int, default=86400)
+        parser.add_argument('--capacity', type=int, default=100)
+
+    def handle(self, *args, **options):
+        path = options['socket']
+        if os.path.exists(path):
+            os.unlink(path)
+        broker = Broker(
+            path,
+            expiry=options['expiry'],
+            group_expiry=options['group_expiry'],
+            capacity=options['capacity'],
+        )
+        self.stdout.write(f'Channel broker listening on {path}', ending='\n')
+        self.stdout.flush()
+        try:
+            asyncio.run(broker.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
@@ -1,13 +1,24 @@
 """Tenant-aware model managers for multi-tenancy support."""
 from django.db import models
+from .tenancy import resolve_organization_id
+
+
+def _organization_filter(organization_slug, organization_id):
+    """Resolve the organization id to filter on, from an id or a slug."""
+    if organization_id is None:
+        organization_id = resolve_organization_id(organization_slug)
+    return organization_id
 
 
 class TenantQuerySet(models.QuerySet):
     """QuerySet with tenant filtering capabilities."""
 
-    def for_organization(self, organization_slug):
-        """Filter queryset by organization slug."""
-        return self.filter(organization__slug=organization_slug)
+    def for_organization(self, organization_slug=None, organization_id=None):
+        """Filter queryset by organization id or slug."""
+        organization_id = _organization_filter(organization_slug, organization_id)
+        if organization_id is None:
+            return self.none()
+        return self.filter(organization_id=organization_id)
 
 
 class TenantManager(models.Manager):
@@ -16,29 +27,88 @@ class TenantManager(models.Manager):
     def get_queryset(self):
         return TenantQuerySet(self.model, using=self._db)
 
-    def for_organization(self, organization_slug):
+    def for_organization(self, organization_slug=None, organization_id=None):
         """Get objects for a specific organization."""
-        return self.get_queryset().for_organization(organization_slug)
+        return self.get_queryset().for_organization(organization_slug, organization_id)
 
 
 class ProjectTenantQuerySet(models.QuerySet):
     """QuerySet for Project with tenant filtering."""
 
-    def for_organization(self, organization_slug):
-        """Filter projects by organization slug."""
-        return self.filter(organization__slug=organization_slug)
-
-    def with_stats(self):
-        """Annotate projects with task statistics."""
-        from django.db.models import Count, Q
-        from core.models import TaskStatus
-        return self.annotate(
-            task_count_annotated=Count('tasks'),
-            completed_tasks_annotated=Count(
-                'tasks',
-                filter=Q(tasks__status=TaskStatus.DONE)
-            )
-        )
+    def for_organization(self, organization_slug=None, organization_id=None):
+        """Filter projects by organization id or slug."""
+        organization_id = _organization_filter(organization_slug, organization_id)
+        if organization_id is None:
+            return self.none()
+        return self.filter(organization_id=organization_id)
+
+    def add_task_counts(self, changes):
+        """
+        Apply {(project_id, status): delta} to the stored task counters.
+
+        Each project gets one UPDATE ... SET counter = counter + delta, so
+        concurrent writers never lose each other's increments. Projects are
+        updated in id order so two writers cannot deadlock on them.
+        """
+        from django.db.models import F
+        from core.models import TASK_STATUS_COUNTERS
+        by_project = {}
+        for (project_id, status), delta in changes.items():
+            if not delta:
+                continue
+            fields = by_project.setdefault(project_id, {})
+            fields['total_tasks'] = fields.get('total_tasks', 0) + delta
+            field = TASK_STATUS_COUNTERS.get(status)
+            if field:
+                fields[field] = fields.get(field, 0) + delta
+        for project_id in sorted(by_project, key=str):
+            updates = {
+                field: F(field) + delta
+                for field, delta in by_project[project_id].items() if delta
+            }
+            if updates:
+                self.filter(pk=project_id).update(**updates)
+
+    def recompute_task_counts(self, chunk_size=500):
+        """
+        Recount the tasks of every project in the queryset and store the
+        result; return the number of projects whose counters had drifted.
+
+        Each chunk of projects is locked before its tasks are counted, so a
+        task write racing with the repair is either counted or applies its
+        increment afterwards, never both.
+        """
+        from django.db import transaction
+        from core.models import TASK_COUNTER_FIELDS, Task
+        project_ids = list(self.order_by('pk').values_list('pk', flat=True))
+        repaired = 0
+        for start in range(0, len(project_ids), chunk_size):
+            chunk = project_ids[start:start + chunk_size]
+            with transaction.atomic():
+                projects = list(
+                    self.model.objects.filter(pk__in=chunk)
+                    .select_for_update().only('pk', *TASK_COUNTER_FIELDS)
+                )
+                counts = Task.objects.filter(project_id__in=chunk).status_counts_by_project()
+                drifted = [
+                    project for project in projects
+                    if _set_task_counters(project, counts.get(project.pk, {}))
+                ]
+                self.model.objects.bulk_update(drifted, TASK_COUNTER_FIELDS)
+                repaired += len(drifted)
+        return repaired
+
+
+def _set_task_counters(project, counts):
+    """Store counts on project's counter fields; return whether any changed."""
+    from core.models import TASK_STATUS_COUNTERS
+    values = {'total_tasks': sum(counts.values())}
+    for status, field in TASK_STATUS_COUNTERS.items():
+        values[field] = counts.get(status, 0)
+    changed = any(getattr(project, field) != value for field, value in values.items())
+    for field, value in values.items():
+        setattr(project, field, value)
+    return changed
 
 
 class ProjectTenantManager(models.Manager):
@@ -47,21 +117,24 @@ class ProjectTenantManager(models.Manager):
     def get_queryset(self):
         return ProjectTenantQuerySet(self.model, using=self._db)
 
-    def for_organization(self, organization_slug):
+    def for_organization(self, organization_slug=None, organization_id=None):
         """Get projects for a specific organization."""
-        return self.get_queryset().for_organization(organization_slug)
+        return self.get_queryset().for_organization(organization_slug, organization_id)
 
-    def with_stats(self):
-        """Get projects with task statistics."""
-        return self.get_queryset().with_stats()
+    def add_task_counts(self, changes):
+        """Apply {(project_id, status): delta} to the stored task counters."""
+        return self.get_queryset().add_task_counts(changes)
 
 
 class TaskTenantQuerySet(models.QuerySet):
     """QuerySet for Task with tenant filtering."""
 
-    def for_organization(self, organization_slug):
-        """Filter tasks by organization slug (through project)."""
-        return self.filter(project__organization__slug=organization_slug)
+    def for_organization(self, organization_slug=None, organization_id=None):
+        """Filter tasks by organization id or slug (denormalized organization)."""
+        organization_id = _organization_filter(organization_slug, organization_id)
+        if organization_id is None:
+            return self.none()
+        return self.filter(organization_id=organization_id)
 
     def for_project(self, project_id):
         """Filter tasks by project."""
@@ -71,6 +144,57 @@ class TaskTenantQuerySet(models.QuerySet):
         """Filter tasks by status."""
         return self.filter(status=status)
 
+    def delete(self):
+        """
+        Delete the tasks and decrement their projects' counters in the same
+        transaction, as Task.delete does for one task. Covers bulk deletes
+        such as the admin's "delete selected" action.
+        """
+        from collections import Counter
+        from django.db import transaction
+        from core.models import Project
+        with transaction.atomic(using=self.db):
+            # Lock the rows so their project and status cannot change before the delete
+            changes = Counter()
+            for key in self.order_by().select_for_update().values_list('project_id', 'status'):
+                changes[key] -= 1
+            result = super().delete()
+            Project.objects.add_task_counts(changes)
+        return result
+
+    def status_counts(self):
+        """Return {status: count} for the queryset in one GROUP BY status query."""
+        from django.db.models import Count
+        rows = self.order_by().values_list('status').annotate(count=Count('id'))
+        return dict(rows)
+
+    def status_counts_by_project(self):
+        """Return {project_id: {status: count}} in one GROUP BY project, status query."""
+        from django.db.models import Count
+        rows = (
+            self.order_by()
+            .values_list('project_id', 'status')
+            .annotate(count=Count('id'))
+        )
+        counts = {}
+        for project_id, status, count in rows:
+            counts.setdefault(project_id, {})[status] = count
+        return counts
+
+
+def statistics_from_counts(counts):
+    """Build total, per-status and completion-rate figures from status counts."""
+    from core.models import TaskStatus
+    total = sum(counts.values())
+    completed = counts.get(TaskStatus.DONE, 0)
+    return {
+        'total_tasks': total,
+        'completed_tasks': completed,
+        'in_progress_tasks': counts.get(TaskStatus.IN_PROGRESS, 0),
+        'todo_tasks': counts.get(TaskStatus.TODO, 0),
+        'completion_rate': round((completed / total * 100), 1) if total > 0 else 0,
+    }
+
 
 class TaskTenantManager(models.Manager):
     """Manager for Task with tenant-aware methods."""
@@ -78,9 +202,9 @@ class TaskTenantManager(models.Manager):
     def get_queryset(self):
         return TaskTenantQuerySet(self.model, using=self._db)
 
-    def for_organization(self, organization_slug):
+    def for_organization(self, organization_slug=None, organization_id=None):
         """Get tasks for a specific organization."""
-        return self.get_queryset().for_organization(organization_slug)
+        return self.get_queryset().for_organization(organization_slug, organization_id)
 
     def for_project(self, project_id):
         """Get tasks for a specific project."""
@@ -90,9 +214,12 @@ class TaskTenantManager(models.Manager):
 class CommentTenantQuerySet(models.QuerySet):
     """QuerySet for TaskComment with tenant filtering."""
 
-    def for_organization(self, organization_slug):
-        """Filter comments by organization slug (through task->project)."""
-        return self.filter(task__project__organization__slug=organization_slug)
+    def for_organization(self, organization_slug=None, organization_id=None):
+        """Filter comments by organization id or slug (denormalized organization)."""
+        organization_id = _organization_filter(organization_slug, organization_id)
+        if organization_id is None:
+            return self.none()
+        return self.filter(organization_id=organization_id)
 
     def for_task(self, task_id):
         """Filter comments by task."""
@@ -105,9 +232,9 @@ class CommentTenantManager(models.Manager):
     def get_queryset(self):
         return CommentTenantQuerySet(self.model, using=self._db)
 
-    def for_organization(self, organization_slug):
+    def for_organization(self, organization_slug=None, organization_id=None):
         """Get comments for a specific organization."""
-        return self.get_queryset().for_organization(organization_slug)
+        return self.get_queryset().for_organization(organization_slug, organization_id)
 
     def for_task(self, task_id):
         """Get comments for a specific task."""
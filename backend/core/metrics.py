@@ -0,0 +1,204 @@
+"""
+In-process GraphQL metrics, rendered in the Prometheus text format.
+
+Every request records its operation's wall time, database time, SQL
+statement count and response size. Per-field resolver histograms come from
+requests that core.tracing samples, so unsampled requests run no resolver
+middleware. Histograms keep fixed buckets under a lock; label values beyond
+MAX_LABEL_VALUES per histogram are folded into "other" so clients cannot
+grow memory by sending new operation names.
+"""
+import bisect
+import threading
+import time
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+MAX_LABEL_VALUES = 200
+OTHER = 'other'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative histogram with one label, in the Prometheus sense."""
+
+    def __init__(self, name, help, label, buckets):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                if len(self._series) >= MAX_LABEL_VALUES:
+                    label_value = OTHER
+                    series = self._series.get(OTHER)
+                if series is None:
+                    # Per-bucket counts (the last is +Inf), sum, count
+                    series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self):
+        """Return {label value: (bucket counts, sum, count)}."""
+        with self._lock:
+            return {
+                key: (list(counts), total, count)
+                for key, (counts, total, count) in self._series.items()
+            }
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for key, (counts, total, count) in sorted(self.snapshot().items()):
+            label = f'{self.label}="{_escape(key)}"'
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label},le="{_format(bound)}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label}}} {_format(total)}')
+            lines.append(f'{self.name}_count{{{label}}} {count}')
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class OperationTimer:
+    """connection.execute_wrapper hook adding up one request's SQL time and count."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.sql_queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.sql_queries += 1
+
+
+class GraphQLMetrics:
+    """Histograms per operation name and per schema field."""
+
+    def __init__(self):
+        self.operation_duration = Histogram(
+            'graphql_operation_duration_seconds', 'Wall time of GraphQL requests.',
+            'operation', LATENCY_BUCKETS,
+        )
+        self.operation_db = Histogram(
+            'graphql_operation_db_seconds', 'Time GraphQL requests spent in SQL.',
+            'operation', LATENCY_BUCKETS,
+        )
+        self.operation_queries = Histogram(
+            'graphql_operation_sql_queries', 'SQL statements run per GraphQL request.',
+            'operation', COUNT_BUCKETS,
+        )
+        self.response_size = Histogram(
+            'graphql_response_size_bytes', 'Size of GraphQL response bodies.',
+            'operation', SIZE_BUCKETS,
+        )
+        self.field_duration = Histogram(
+            'graphql_field_duration_seconds', 'Resolver time per field, from sampled requests.',
+            'field', LATENCY_BUCKETS,
+        )
+        self.field_db = Histogram(
+            'graphql_field_db_seconds', 'Resolver SQL time per field, from sampled requests.',
+            'field', LATENCY_BUCKETS,
+        )
+        self.field_queries = Histogram(
+            'graphql_field_sql_queries', 'SQL statements per resolver call, from sampled requests.',
+            'field', COUNT_BUCKETS,
+        )
+
+    @property
+    def histograms(self):
+        return [
+            self.operation_duration, self.operation_db, self.operation_queries, self.response_size,
+            self.field_duration, self.field_db, self.field_queries,
+        ]
+
+    def observe_operation(self, operation, timer, response_size):
+        operation = operation or 'anonymous'
+        self.operation_duration.observe(operation, time.perf_counter() - timer.started)
+        self.operation_db.observe(operation, timer.db_seconds)
+        self.operation_queries.observe(operation, timer.sql_queries)
+        self.response_size.observe(operation, response_size)
+
+    def observe_trace(self, trace):
+        """Record the per-field figures of a core.tracing.Trace."""
+        for record in trace.resolvers:
+            field = f"{record['parentType']}.{record['fieldName']}"
+            self.field_duration.observe(field, record['durationMs'] / 1000)
+            self.field_db.observe(field, record['dbMs'] / 1000)
+            self.field_queries.observe(field, record['sqlQueries'])
+
+    def render(self):
+        return [line for histogram in self.histograms for line in histogram.render()]
+
+    def clear(self):
+        for histogram in self.histograms:
+            histogram.clear()
+
+
+graphql_metrics = GraphQLMetrics()
+
+# Keys of the queue metrics() dicts that can go down; every other key counts up
+GAUGE_KEYS = frozenset({'queue_depth', 'in_flight', 'groups', 'events'})
+
+
+def _gauges(prefix, help, values, metric_type='gauge'):
+    lines = []
+    for key, value in values.items():
+        name = f'{prefix}_{key}'
+        lines += [f'# HELP {name} {help}', f'# TYPE {name} {metric_type}', f'{name} {_format(value)}']
+    return lines
+
+
+def _queue_state(prefix, help, values):
+    """Render a metrics() dict: levels as gauges, running counts as *_total counters."""
+    gauges = {key: value for key, value in values.items() if key in GAUGE_KEYS}
+    counters = {f'{key}_total': value for key, value in values.items() if key not in GAUGE_KEYS}
+    return _gauges(prefix, help, gauges) + _gauges(prefix, help, counters, 'counter')
+
+
+def render_metrics():
+    """Return every metric of this process in the Prometheus text format."""
+    from .broadcast import dispatcher, event_log
+    from .outbound import outbound_stats
+    from .persisted_queries import document_cache
+    from .response_cache import response_cache
+    from .subscriptions import payload_cache
+
+    lines = graphql_metrics.render()
+    lines += _queue_state('graphql_broadcast', 'Broadcast dispatcher queue state.', dispatcher.metrics())
+    lines += _queue_state('graphql_subscription_outbound', 'WebSocket outbound queue state.', outbound_stats.metrics())
+    lines += _queue_state('graphql_subscription_replay', 'Subscription event log state.', event_log.metrics())
+    lines += _gauges('graphql_document_cache', 'Parsed document cache lookups.', {
+        'hits_total': document_cache.hits, 'misses_total': document_cache.misses,
+    }, 'counter')
+    lines += _gauges('graphql_response_cache', 'Response cache lookups.', {
+        'hits_total': response_cache.hits, 'misses_total': response_cache.misses,
+    }, 'counter')
+    lines += _gauges('graphql_subscription_payload_cache', 'Shared subscription payload encodings.', {
+        'hits_total': payload_cache.hits, 'misses_total': payload_cache.misses,
+    }, 'counter')
+    return '\n'.join(lines) + '\n'
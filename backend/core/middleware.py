@@ -1,11 +1,15 @@
 """Multi-tenancy middleware for organization context."""
 from django.http import JsonResponse
+from .tenancy import resolve_organization_id
 
 
 class OrganizationMiddleware:
-    """Middleware to extract and validate organization context from requests."""
+    """
+    Middleware to extract and validate organization context from requests.
+    Resolves the slug to request.organization_id once, through the tenant cache.
+    """
     
-    EXEMPT_PATHS = ['/health/', '/admin/', '/graphql/']
+    EXEMPT_PATHS = ['/health/', '/admin/', '/graphql/', '/metrics/']
     
     def __init__(self, get_response):
         self.get_response = get_response
@@ -16,6 +20,7 @@ class OrganizationMiddleware:
             # Still extract org slug if present for GraphQL
             org_slug = request.headers.get('X-Organization-Slug')
             request.organization_slug = org_slug
+            request.organization_id = resolve_organization_id(org_slug)
             return self.get_response(request)
         
         org_slug = request.headers.get('X-Organization-Slug')
@@ -26,4 +31,5 @@ class OrganizationMiddleware:
             )
         
         request.organization_slug = org_slug
+        request.organization_id = resolve_organization_id(org_slug)
         return self.get_response(request)
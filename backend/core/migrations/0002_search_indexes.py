@@ -0,0 +1,41 @@
+# Full-text search indexes for projects and tasks (PostgreSQL only)
+
+from django.db import migrations
+
+PROJECT_DOCUMENT = (
+    "setweight(to_tsvector('english'::regconfig, COALESCE(name, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, COALESCE(description, '')), 'B')"
+)
+TASK_DOCUMENT = (
+    "setweight(to_tsvector('english'::regconfig, COALESCE(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, COALESCE(description, '')), 'B')"
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS core_project_search_idx ON core_project USING gin (({PROJECT_DOCUMENT}))'
+    )
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS core_task_search_idx ON core_task USING gin (({TASK_DOCUMENT}))'
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS core_project_search_idx')
+    schema_editor.execute('DROP INDEX IF EXISTS core_task_search_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,31 @@
+# Denormalized organization on tasks and comments, step 2: backfill
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_organization(apps, schema_editor):
+    Project = apps.get_model('core', 'Project')
+    Task = apps.get_model('core', 'Task')
+    TaskComment = apps.get_model('core', 'TaskComment')
+    Task.objects.filter(organization__isnull=True).update(
+        organization_id=Subquery(
+            Project.objects.filter(id=OuterRef('project_id')).values('organization_id')[:1]
+        )
+    )
+    TaskComment.objects.filter(organization__isnull=True).update(
+        organization_id=Subquery(
+            Task.objects.filter(id=OuterRef('task_id')).values('organization_id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_denormalize_organization'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_organization, migrations.RunPython.noop),
+    ]
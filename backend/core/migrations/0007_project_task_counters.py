@@ -0,0 +1,55 @@
+# Generated by Django 4.2.9 on 2026-10-17 07:55
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_task_counters(apps, schema_editor):
+    Project = apps.get_model('core', 'Project')
+    Task = apps.get_model('core', 'Task')
+
+    def count(status=None):
+        tasks = Task.objects.filter(project_id=OuterRef('pk'))
+        if status is not None:
+            tasks = tasks.filter(status=status)
+        counted = tasks.order_by().values('project_id').annotate(n=Count('id')).values('n')
+        return Coalesce(Subquery(counted[:1]), 0)
+
+    Project.objects.update(
+        total_tasks=count(),
+        todo_tasks=count('TODO'),
+        in_progress_tasks=count('IN_PROGRESS'),
+        done_tasks=count('DONE'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='done_tasks',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='in_progress_tasks',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='todo_tasks',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='total_tasks',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_task_counters, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,24 @@
 """Django models for project management system."""
 import uuid
-from django.db import models
+from collections import Counter
+from django.db import models, transaction
 from django.core.validators import EmailValidator
 from .managers import (
     ProjectTenantManager,
     TaskTenantManager,
     CommentTenantManager,
 )
+from .response_cache import row_loaded
+
+
+class LoadedRowMixin:
+    """Report every row loaded from the database to the response cache's tag collection."""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        row_loaded(instance)
+        return instance
 
 
 class Organization(models.Model):
@@ -34,7 +46,7 @@ class ProjectStatus(models.TextChoices):
     ON_HOLD = 'ON_HOLD', 'On Hold'
 
 
-class Project(models.Model):
+class Project(LoadedRowMixin, models.Model):
     """
     Project model - belongs to an organization.
     Contains tasks and tracks project status.
@@ -44,7 +56,7 @@ class Project(models.Model):
         Organization,
         on_delete=models.CASCADE,
         related_name='projects',
-        db_index=True
+        db_index=False  # covered by the composite indexes below
     )
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True, default='')
@@ -56,24 +68,57 @@ class Project(models.Model):
     )
     due_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Task counters, changed only by F() increments from task writes;
+    # recompute_project_stats repairs them if they ever drift
+    total_tasks = models.IntegerField(default=0, editable=False)
+    todo_tasks = models.IntegerField(default=0, editable=False)
+    in_progress_tasks = models.IntegerField(default=0, editable=False)
+    done_tasks = models.IntegerField(default=0, editable=False)
 
     objects = ProjectTenantManager()
 
     class Meta:
         ordering = ['-created_at']
+        # Match the keyset order (created_at, id) used by the projects resolver
+        indexes = [
+            models.Index(
+                fields=['organization', 'created_at', 'id'],
+                name='project_org_created_idx'
+            ),
+            models.Index(
+                fields=['organization', 'status', 'created_at', 'id'],
+                name='project_org_status_crtd_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        """Never write the counters back from a possibly stale instance."""
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in TASK_COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    def status_counts(self):
+        """Return {status: count} from the stored counters."""
+        return {
+            status: getattr(self, field)
+            for status, field in TASK_STATUS_COUNTERS.items()
+        }
+
     @property
     def task_count(self):
         """Return total number of tasks."""
-        return self.tasks.count()
+        return self.total_tasks
 
     @property
     def completed_tasks(self):
         """Return number of completed tasks."""
-        return self.tasks.filter(status=TaskStatus.DONE).count()
+        return self.done_tasks
 
     @property
     def completion_rate(self):
@@ -91,7 +136,17 @@ class TaskStatus(models.TextChoices):
     DONE = 'DONE', 'Done'
 
 
-class Task(models.Model):
+# Project counter field per task status
+TASK_STATUS_COUNTERS = {
+    TaskStatus.TODO: 'todo_tasks',
+    TaskStatus.IN_PROGRESS: 'in_progress_tasks',
+    TaskStatus.DONE: 'done_tasks',
+}
+
+TASK_COUNTER_FIELDS = ['total_tasks', *TASK_STATUS_COUNTERS.values()]
+
+
+class Task(LoadedRowMixin, models.Model):
     """
     Task model - belongs to a project.
     Represents a work item with status tracking.
@@ -101,7 +156,15 @@ class Task(models.Model):
         Project,
         on_delete=models.CASCADE,
         related_name='tasks',
-        db_index=True
+        db_index=False  # covered by the composite indexes below
+    )
+    # Denormalized from project so tenant filters avoid joins
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        related_name='tasks',
+        editable=False,
+        db_index=False
     )
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, default='')
@@ -123,10 +186,86 @@ class Task(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        # Match the keyset order (created_at, id) used by the tasks resolver
+        indexes = [
+            models.Index(
+                fields=['project', 'created_at', 'id'],
+                name='task_project_created_idx'
+            ),
+            models.Index(
+                fields=['project', 'status', 'created_at', 'id'],
+                name='task_proj_status_created_idx'
+            ),
+            models.Index(
+                fields=['organization', 'status', 'created_at'],
+                name='task_org_status_created_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_project_id = instance.__dict__.get('project_id')
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def counter_changes(self, adding=False):
+        """
+        Return the {(project_id, status): delta} that writing this task
+        applies to the project counters, relative to the row as loaded.
+        """
+        changes = Counter()
+        if adding:
+            changes[(self.project_id, self.status)] += 1
+            return changes
+        loaded = (getattr(self, '_loaded_project_id', None), getattr(self, '_loaded_status', None))
+        if None not in loaded and loaded != (self.project_id, self.status):
+            changes[loaded] -= 1
+            changes[(self.project_id, self.status)] += 1
+        return changes
+
+    def mark_saved(self):
+        """Record the current project and status as the stored ones."""
+        self._loaded_project_id = self.project_id
+        self._loaded_status = self.status
+
+    def save(self, *args, **kwargs):
+        """
+        Keep organization in step with the project, including on move, and
+        update the project counters in the same transaction.
+        """
+        adding = self._state.adding
+        loaded_project_id = getattr(self, '_loaded_project_id', None)
+        moved = loaded_project_id is not None and loaded_project_id != self.project_id
+        update_fields = kwargs.get('update_fields')
+        if self.organization_id is None or moved:
+            self.organization_id = self.project.organization_id
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'organization'}
+        counted = adding or update_fields is None or {'project', 'status'} & set(update_fields)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if moved:
+                self.comments.update(organization_id=self.organization_id)
+            if counted:
+                Project.objects.add_task_counts(self.counter_changes(adding))
+        if counted:
+            self.mark_saved()
+        else:
+            self._loaded_project_id = self.project_id
+
+    def delete(self, *args, **kwargs):
+        """Delete the task and decrement its project's counters."""
+        project_id = getattr(self, '_loaded_project_id', None) or self.project_id
+        status = getattr(self, '_loaded_status', None) or self.status
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            Project.objects.add_task_counts({(project_id, status): -1})
+        return result
+
     def clean(self):
         """Validate assignee_email only if provided."""
         if self.assignee_email:
@@ -134,7 +273,7 @@ class Task(models.Model):
             validator(self.assignee_email)
 
 
-class TaskComment(models.Model):
+class TaskComment(LoadedRowMixin, models.Model):
     """
     TaskComment model - belongs to a task.
     Allows collaboration through comments.
@@ -144,7 +283,15 @@ class TaskComment(models.Model):
         Task,
         on_delete=models.CASCADE,
         related_name='comments',
-        db_index=True
+        db_index=False  # covered by comment_task_created_idx
+    )
+    # Denormalized from task so tenant filters avoid joins
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        editable=False,
+        db_index=False
     )
     content = models.TextField()
     author_email = models.EmailField(validators=[EmailValidator()])
@@ -154,6 +301,22 @@ class TaskComment(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['task', 'created_at', 'id'],
+                name='comment_task_created_idx'
+            ),
+            models.Index(
+                fields=['organization', 'created_at'],
+                name='comment_org_created_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Copy the organization from the task on create."""
+        if self.organization_id is None:
+            self.organization_id = self.task.organization_id
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Comment by {self.author_email} on {self.task.title}"
@@ -1,9 +1,10 @@
 """GraphQL mutations for project management system."""
+import uuid
+from collections import Counter, defaultdict
 import graphene
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from django.db import transaction
 from .models import Organization, Project, Task, TaskComment, ProjectStatus, TaskStatus
 from .types import (
     OrganizationType,
@@ -15,9 +16,15 @@ from .types import (
     UpdateProjectInput,
     CreateTaskInput,
     UpdateTaskInput,
+    UpdateTaskItemInput,
     CreateCommentInput,
     ErrorType,
 )
+from .broadcast import dispatcher
+from .response_cache import ORGANIZATIONS_TAG, org_tag, project_tag, response_cache, task_tag
+
+# Upper bound on the number of tasks accepted by one bulk mutation
+MAX_BULK_TASKS = 500
 
 
 # Organization Mutations
@@ -61,6 +68,7 @@ class CreateOrganization(graphene.Mutation):
             slug=slug,
             contact_email=input.contact_email,
         )
+        response_cache.invalidate_on_commit(ORGANIZATIONS_TAG)
         
         return OrganizationPayload(organization=organization, errors=[])
 
@@ -104,6 +112,7 @@ class CreateProject(graphene.Mutation):
             status=status,
             due_date=input.due_date,
         )
+        response_cache.invalidate_on_commit(org_tag(organization.id))
         
         return ProjectPayload(project=project, errors=[])
 
@@ -141,6 +150,7 @@ class UpdateProject(graphene.Mutation):
             project.due_date = input.due_date
         
         project.save()
+        response_cache.invalidate_on_commit(org_tag(project.organization_id), project_tag(project.id))
         return ProjectPayload(project=project, errors=[])
 
 
@@ -161,6 +171,11 @@ class DeleteProject(graphene.Mutation):
     def mutate(self, info, id):
         try:
             project = Project.objects.get(id=id)
+            # Cached comment lists are tagged by task, so expire those too
+            task_tags = [task_tag(task_id) for task_id in project.tasks.values_list('id', flat=True)]
+            response_cache.invalidate_on_commit(
+                org_tag(project.organization_id), project_tag(project.id), *task_tags
+            )
             project.delete()
             return DeletePayload(success=True, errors=[])
         except Project.DoesNotExist:
@@ -219,8 +234,10 @@ class CreateTask(graphene.Mutation):
             due_date=input.due_date,
         )
         
+        response_cache.invalidate_on_commit(project_tag(project.id))
         # Broadcast task update via WebSocket
         broadcast_task_update(project.id, task)
+        broadcast_activity(task.organization_id, [_task_activity(task)], key=str(task.id))
         
         return TaskPayload(task=task, errors=[])
 
@@ -234,11 +251,13 @@ class UpdateTask(graphene.Mutation):
     
     Output = TaskPayload
 
+    # One transaction, so the counters move from the status the row has when locked
+    @transaction.atomic
     def mutate(self, info, id, input):
         errors = []
         
         try:
-            task = Task.objects.get(id=id)
+            task = Task.objects.select_for_update().get(id=id)
         except Task.DoesNotExist:
             errors.append(ErrorType(field='id', message='Task not found'))
             return TaskPayload(task=None, errors=errors)
@@ -267,9 +286,11 @@ class UpdateTask(graphene.Mutation):
             task.due_date = input.due_date
         
         task.save()
+        response_cache.invalidate_on_commit(project_tag(task.project_id))
         
         # Broadcast task update via WebSocket
         broadcast_task_update(task.project.id, task)
+        broadcast_activity(task.organization_id, [_task_activity(task)], key=str(task.id))
         
         return TaskPayload(task=task, errors=[])
 
@@ -282,9 +303,11 @@ class DeleteTask(graphene.Mutation):
     
     Output = DeletePayload
 
+    @transaction.atomic
     def mutate(self, info, id):
         try:
-            task = Task.objects.get(id=id)
+            task = Task.objects.select_for_update().get(id=id)
+            response_cache.invalidate_on_commit(project_tag(task.project_id), task_tag(task.id))
             task.delete()
             return DeletePayload(success=True, errors=[])
         except Task.DoesNotExist:
@@ -294,6 +317,238 @@ class DeleteTask(graphene.Mutation):
             )
 
 
+# Bulk Task Mutations
+class BulkTaskPayload(graphene.ObjectType):
+    """Payload for bulk task mutations; nothing is written when errors is non-empty."""
+    tasks = graphene.List(TaskType)
+    errors = graphene.List(ErrorType)
+
+
+def _as_uuid(value):
+    """Return value as a UUID, or None when it is malformed."""
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _locked_tasks(task_ids):
+    """
+    Return {pk: task} for task_ids, locked until the transaction ends so
+    counter changes are computed from each row's current project and status.
+    Rows are locked in id order so concurrent bulk writes cannot deadlock.
+    """
+    ids = {_as_uuid(task_id) for task_id in task_ids} - {None}
+    locked = Task.objects.select_for_update().filter(pk__in=ids).order_by('pk')
+    return {task.pk: task for task in locked}
+
+
+def _too_many(items):
+    """Return the error for a bulk input over MAX_BULK_TASKS, if any."""
+    if len(items) > MAX_BULK_TASKS:
+        return [ErrorType(field='input', message=f'At most {MAX_BULK_TASKS} tasks can be changed at once')]
+    return []
+
+
+def _task_field_errors(index, item):
+    """Validate the status and assignee email of one bulk input item."""
+    errors = []
+    if item.status and item.status not in [s.value for s in TaskStatus]:
+        errors.append(ErrorType(field=f'input.{index}.status', message=f'Invalid status. Must be one of: {", ".join([s.value for s in TaskStatus])}'))
+    if item.assignee_email:
+        try:
+            validate_email(item.assignee_email)
+        except ValidationError:
+            errors.append(ErrorType(field=f'input.{index}.assignee_email', message='Invalid email format'))
+    return errors
+
+
+def _counter_changes(tasks, adding=False):
+    """Sum the project counter changes of tasks written in bulk and mark them saved."""
+    changes = Counter()
+    for task in tasks:
+        changes.update(task.counter_changes(adding))
+        task.mark_saved()
+    return changes
+
+
+def _broadcast_by_project(tasks):
+    """
+    Send one aggregated task event per project and per organization, and
+    expire the projects' cached queries.
+    """
+    by_project = defaultdict(list)
+    by_organization = defaultdict(list)
+    for task in tasks:
+        by_project[task.project_id].append(task)
+        by_organization[task.organization_id].append(_task_activity(task))
+    response_cache.invalidate_on_commit(*(project_tag(project_id) for project_id in by_project))
+    for project_id, project_tasks in by_project.items():
+        broadcast_tasks_updated(project_id, project_tasks)
+    for organization_id, activities in by_organization.items():
+        broadcast_activity(organization_id, activities)
+
+
+class CreateTasks(graphene.Mutation):
+    """Create many tasks in one transaction."""
+
+    class Arguments:
+        input = graphene.List(graphene.NonNull(CreateTaskInput), required=True)
+
+    Output = BulkTaskPayload
+
+    def mutate(self, info, input):
+        errors = _too_many(input)
+        if errors:
+            return BulkTaskPayload(tasks=None, errors=errors)
+
+        # Validate every item up front; projects are fetched in one query
+        project_ids = {_as_uuid(item.project_id) for item in input} - {None}
+        projects = Project.objects.only('id', 'organization_id').in_bulk(project_ids)
+        tasks = []
+        for index, item in enumerate(input):
+            project = projects.get(_as_uuid(item.project_id))
+            if project is None:
+                errors.append(ErrorType(field=f'input.{index}.project_id', message='Project not found'))
+            errors.extend(_task_field_errors(index, item))
+            if errors:
+                continue
+            # bulk_create skips Task.save, so set the organization here
+            tasks.append(Task(
+                project_id=project.id,
+                organization_id=project.organization_id,
+                title=item.title,
+                description=item.description or '',
+                # Plain value so the TaskType status enum can serialize it
+                status=item.status or TaskStatus.TODO.value,
+                assignee_email=item.assignee_email or '',
+                due_date=item.due_date,
+            ))
+        if errors:
+            return BulkTaskPayload(tasks=None, errors=errors)
+
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks)
+            # bulk_create skips Task.save, so count the new tasks here
+            Project.objects.add_task_counts(_counter_changes(tasks, adding=True))
+            _broadcast_by_project(tasks)
+
+        return BulkTaskPayload(tasks=tasks, errors=[])
+
+
+class UpdateTasks(graphene.Mutation):
+    """Update many tasks in one transaction."""
+
+    class Arguments:
+        input = graphene.List(graphene.NonNull(UpdateTaskItemInput), required=True)
+
+    Output = BulkTaskPayload
+
+    @transaction.atomic
+    def mutate(self, info, input):
+        errors = _too_many(input)
+        if errors:
+            return BulkTaskPayload(tasks=None, errors=errors)
+
+        tasks = _locked_tasks(item.id for item in input)
+        changed = {}
+        fields = set()
+        for index, item in enumerate(input):
+            task = tasks.get(_as_uuid(item.id))
+            if task is None:
+                errors.append(ErrorType(field=f'input.{index}.id', message='Task not found'))
+                continue
+            item_errors = _task_field_errors(index, item)
+            if item_errors:
+                errors.extend(item_errors)
+                continue
+
+            # Same rules as UpdateTask: falsy status and email are ignored
+            if item.status:
+                task.status = item.status
+                fields.add('status')
+            if item.assignee_email:
+                task.assignee_email = item.assignee_email
+                fields.add('assignee_email')
+            if item.title is not None:
+                task.title = item.title
+                fields.add('title')
+            if item.description is not None:
+                task.description = item.description
+                fields.add('description')
+            if item.due_date is not None:
+                task.due_date = item.due_date
+                fields.add('due_date')
+            changed[task.pk] = task
+        if errors:
+            return BulkTaskPayload(tasks=None, errors=errors)
+
+        tasks = list(changed.values())
+        if fields:
+            Task.objects.bulk_update(tasks, sorted(fields))
+            Project.objects.add_task_counts(_counter_changes(tasks))
+        _broadcast_by_project(tasks)
+
+        return BulkTaskPayload(tasks=tasks, errors=[])
+
+
+class MoveTasks(graphene.Mutation):
+    """Move many tasks to another project in one transaction."""
+
+    class Arguments:
+        ids = graphene.List(graphene.NonNull(graphene.ID), required=True)
+        project_id = graphene.ID(required=True)
+
+    Output = BulkTaskPayload
+
+    @transaction.atomic
+    def mutate(self, info, ids, project_id):
+        errors = _too_many(ids)
+        if errors:
+            return BulkTaskPayload(tasks=None, errors=errors)
+
+        project = None
+        target_id = _as_uuid(project_id)
+        if target_id is not None:
+            project = Project.objects.only('id', 'organization_id').filter(id=target_id).first()
+        if project is None:
+            errors.append(ErrorType(field='project_id', message='Project not found'))
+
+        found = _locked_tasks(ids)
+        tasks = {}
+        for index, task_id in enumerate(ids):
+            task = found.get(_as_uuid(task_id))
+            if task is None:
+                errors.append(ErrorType(field=f'ids.{index}', message='Task not found'))
+            elif project is not None and task.organization_id != project.organization_id:
+                errors.append(ErrorType(field=f'ids.{index}', message='Task belongs to another organization'))
+            else:
+                tasks[task.pk] = task
+        if errors:
+            return BulkTaskPayload(tasks=None, errors=errors)
+
+        tasks = list(tasks.values())
+        sources = defaultdict(list)
+        for task in tasks:
+            if task.project_id != project.id:
+                sources[task.project_id].append(task)
+        for task in tasks:
+            task.project_id = project.id
+        Task.objects.bulk_update(tasks, ['project'])
+        Project.objects.add_task_counts(_counter_changes(tasks))
+
+        # Tell the boards the tasks left as well as the one they joined
+        response_cache.invalidate_on_commit(
+            project_tag(project.id), *(project_tag(source_id) for source_id in sources)
+        )
+        broadcast_tasks_updated(project.id, tasks)
+        for source_id, moved in sources.items():
+            broadcast_tasks_updated(source_id, moved)
+        broadcast_activity(project.organization_id, [_task_activity(task) for task in tasks])
+
+        return BulkTaskPayload(tasks=tasks, errors=[])
+
+
 # Comment Mutations
 class CommentPayload(graphene.ObjectType):
     """Payload for comment mutations."""
@@ -333,60 +588,139 @@ class CreateComment(graphene.Mutation):
             author_email=input.author_email,
         )
         
+        response_cache.invalidate_on_commit(task_tag(task.id), project_tag(task.project_id))
         # Broadcast comment via WebSocket
         broadcast_comment_added(task.id, comment)
+        broadcast_activity(task.organization_id, [_comment_activity(task, comment)])
         
         return CommentPayload(comment=comment, errors=[])
 
 
+def _task_data(task):
+    """Serialize a task for a taskUpdated subscription event."""
+    return {
+        'id': str(task.id),
+        'projectId': str(task.project_id),
+        'title': task.title,
+        'description': task.description,
+        'status': task.status,
+        'assigneeEmail': task.assignee_email,
+        'dueDate': task.due_date.isoformat() if task.due_date else None,
+        'createdAt': task.created_at.isoformat() if task.created_at else None,
+    }
+
+
 def broadcast_task_update(project_id, task):
-    """Broadcast task update to WebSocket subscribers."""
+    """
+    Broadcast task update to WebSocket subscribers once the transaction
+    commits. Repeated updates to one task are coalesced by the dispatcher.
+    """
     try:
-        channel_layer = get_channel_layer()
         group_name = f'project_{project_id}_tasks'
-        async_to_sync(channel_layer.group_send)(
+        dispatcher.publish(
             group_name,
             {
                 'type': 'subscription_update',
-                'data': {
-                    'taskUpdated': {
-                        'id': str(task.id),
-                        'title': task.title,
-                        'description': task.description,
-                        'status': task.status,
-                        'assigneeEmail': task.assignee_email,
-                        'dueDate': task.due_date.isoformat() if task.due_date else None,
-                    }
-                }
+                'group': group_name,
+                # Lets consumers share one encoding of the event
+                'event_id': uuid.uuid4().hex,
+                'data': {'taskUpdated': _task_data(task)}
+            },
+            key=str(task.id),
+        )
+    except Exception:
+        pass  # Silently fail if channel layer not available
+
+
+def broadcast_tasks_updated(project_id, tasks):
+    """
+    Broadcast the tasks changed by a bulk mutation as a single group message
+    once the transaction commits; consumers fan it out per task.
+    """
+    try:
+        group_name = f'project_{project_id}_tasks'
+        dispatcher.publish(
+            group_name,
+            {
+                'type': 'tasks_updated',
+                'group': group_name,
+                'event_id': uuid.uuid4().hex,
+                'tasks': [_task_data(task) for task in tasks],
             }
         )
     except Exception:
         pass  # Silently fail if channel layer not available
 
 
+def _comment_data(comment):
+    """Serialize a comment for a commentAdded subscription event."""
+    return {
+        'id': str(comment.id),
+        'content': comment.content,
+        'authorEmail': comment.author_email,
+        'createdAt': comment.created_at.isoformat(),
+    }
+
+
 def broadcast_comment_added(task_id, comment):
-    """Broadcast new comment to WebSocket subscribers."""
+    """Broadcast new comment to WebSocket subscribers once the transaction commits."""
     try:
-        channel_layer = get_channel_layer()
         group_name = f'task_{task_id}_comments'
-        async_to_sync(channel_layer.group_send)(
+        dispatcher.publish(
             group_name,
             {
                 'type': 'subscription_update',
-                'data': {
-                    'commentAdded': {
-                        'id': str(comment.id),
-                        'content': comment.content,
-                        'authorEmail': comment.author_email,
-                        'createdAt': comment.created_at.isoformat(),
-                    }
-                }
+                'group': group_name,
+                'event_id': uuid.uuid4().hex,
+                'data': {'commentAdded': _comment_data(comment)},
             }
         )
     except Exception:
         pass  # Silently fail if channel layer not available
 
 
+def _task_activity(task):
+    """Serialize a task change for an organizationActivity event."""
+    return {
+        'kind': 'TASK_UPDATED',
+        'projectId': str(task.project_id),
+        'task': _task_data(task),
+        'comment': None,
+    }
+
+
+def _comment_activity(task, comment):
+    """Serialize a new comment, with the task it is on, for an organizationActivity event."""
+    return {
+        'kind': 'COMMENT_ADDED',
+        'projectId': str(task.project_id),
+        'task': _task_data(task),
+        'comment': _comment_data(comment),
+    }
+
+
+def broadcast_activity(organization_id, activities, key=None):
+    """
+    Broadcast activities to the organization's organizationActivity
+    subscribers as one group message once the transaction commits.
+    Subscribers' filters are applied by each consumer.
+    """
+    try:
+        group_name = f'organization_{organization_id}_activity'
+        dispatcher.publish(
+            group_name,
+            {
+                'type': 'organization_activity',
+                'group': group_name,
+                'event_id': uuid.uuid4().hex,
+                'activities': activities,
+            },
+            key=key,
+        )
+    except Exception:
+        pass  # Silently fail if channel layer not available
+
+
 class Mutation(graphene.ObjectType):
     """Root mutation type."""
     create_organization = CreateOrganization.Field()
@@ -396,4 +730,7 @@ class Mutation(graphene.ObjectType):
     create_task = CreateTask.Field()
     update_task = UpdateTask.Field()
     delete_task = DeleteTask.Field()
+    create_tasks = CreateTasks.Field()
+    update_tasks = UpdateTasks.Field()
+    move_tasks = MoveTasks.Field()
     create_comment = CreateComment.Field()
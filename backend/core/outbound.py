@@ -0,0 +1,140 @@
+"""
+Bounded outbound queues for WebSocket connections.
+
+Each GraphQLSubscriptionConsumer writes frames through an OutboundQueue
+instead of calling send directly, so a slow client cannot make the process
+buffer without bound. Frames queued with a key replace a pending frame with
+the same key in place, so a burst of updates to one task sends only its
+latest state. When the queue is full new frames are dropped, and a client
+whose queue stays full for saturation_timeout seconds is disconnected.
+"""
+import asyncio
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class OutboundStats:
+    """Counters shared by every outbound queue of this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.enqueued = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.sent = 0
+        self.disconnected = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+    def metrics(self):
+        """Return queue depth and delivery counters."""
+        with self._lock:
+            return {
+                'queue_depth': self.queued,
+                'enqueued': self.enqueued,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped,
+                'sent': self.sent,
+                'disconnected': self.disconnected,
+            }
+
+    def clear(self):
+        with self._lock:
+            self.queued = self.enqueued = self.coalesced = 0
+            self.dropped = self.sent = self.disconnected = 0
+
+
+outbound_stats = OutboundStats()
+
+
+class OutboundQueue:
+    """
+    Frames waiting to be written to one connection, drained in order by a
+    writer task. send is awaited once per frame; close is called once when
+    the connection is dropped for being saturated.
+    """
+
+    def __init__(self, send, close, max_size=100, saturation_timeout=5.0, stats=outbound_stats):
+        self.send = send
+        self.close = close
+        self.max_size = max_size
+        self.saturation_timeout = saturation_timeout
+        self.stats = stats
+        self.closed = False
+        self._pending = OrderedDict()
+        self._ids = itertools.count()
+        self._ready = asyncio.Event()
+        self._saturated_since = None
+        self._task = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def start(self):
+        """Start the writer task on the running loop."""
+        self._task = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        """Stop writing and discard pending frames."""
+        self.closed = True
+        if self._task is not None:
+            self._task.cancel()
+        self.stats.add(queued=-len(self._pending))
+        self._pending.clear()
+
+    def put(self, frame, key=None):
+        """Queue frame, replacing a pending one with the same key. Return False if dropped."""
+        if self.closed:
+            return False
+        if key is not None:
+            key = ('key', key)
+            if key in self._pending:
+                self._pending[key] = frame
+                self.stats.add(enqueued=1, coalesced=1)
+                return True
+        else:
+            key = next(self._ids)
+        if len(self._pending) >= self.max_size:
+            self.stats.add(enqueued=1, dropped=1)
+            self._check_saturation()
+            return False
+        self._pending[key] = frame
+        self.stats.add(enqueued=1, queued=1)
+        self._ready.set()
+        return True
+
+    def _check_saturation(self):
+        now = asyncio.get_running_loop().time()
+        if self._saturated_since is None:
+            self._saturated_since = now
+        elif now - self._saturated_since >= self.saturation_timeout:
+            logger.warning('Closing saturated WebSocket connection (%d frames pending)', len(self._pending))
+            self.stop()
+            self.stats.add(disconnected=1)
+            asyncio.ensure_future(self.close())
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            while self._pending:
+                _, frame = self._pending.popitem(last=False)
+                self.stats.add(queued=-1)
+                # Saturation has to be continuous; draining to half resets it
+                if len(self._pending) <= self.max_size // 2:
+                    self._saturated_since = None
+                try:
+                    await self.send(frame)
+                except Exception:
+                    logger.exception('WebSocket send failed')
+                    self.stop()
+                    return
+                self.stats.add(sent=1)
+            self._ready.clear()
@@ -0,0 +1,82 @@
+"""Keyset (seek) pagination for Relay-style connections."""
+import base64
+import uuid
+from datetime import datetime
+import graphene
+from django.db.models import Q
+from graphql import GraphQLError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(obj, rank=None):
+    """Encode the ([rank,] created_at, id) position of a row as an opaque cursor."""
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}"
+    if rank:
+        raw = f"{getattr(obj, rank)!r}|{raw}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor, rank=None):
+    """
+    Decode a cursor into (created_at, id), or (rank, created_at, id) when
+    rank is set; raise GraphQLError if malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        if rank:
+            rank_value, created_at, pk = raw.split('|', 2)
+            return float(rank_value), datetime.fromisoformat(created_at), uuid.UUID(pk)
+        created_at, pk = raw.split('|', 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise GraphQLError('Invalid cursor')
+
+
+def _seek(rank, position):
+    """Build the filter selecting rows after position in descending order."""
+    if not rank:
+        created_at, pk = position
+        return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+    rank_value, created_at, pk = position
+    return (
+        Q(**{f'{rank}__lt': rank_value})
+        | Q(**{rank: rank_value, 'created_at__lt': created_at})
+        | Q(**{rank: rank_value, 'created_at': created_at, 'id__lt': pk})
+    )
+
+
+def paginate(queryset, connection_type, first=None, after=None, rank=None):
+    """
+    Return one page of queryset as a connection, newest first.
+    Seeks past the after cursor on (created_at, id) instead of using OFFSET.
+    When rank names an annotation, rows are ordered by it first.
+    """
+    if first is None:
+        first = DEFAULT_PAGE_SIZE
+    if first < 0:
+        raise GraphQLError('first must be a non-negative integer')
+    first = min(first, MAX_PAGE_SIZE)
+
+    if after:
+        queryset = queryset.filter(_seek(rank, decode_cursor(after, rank)))
+
+    ordering = ['-created_at', '-id']
+    if rank:
+        ordering.insert(0, f'-{rank}')
+    rows = list(queryset.order_by(*ordering)[:first + 1])
+    has_next_page = len(rows) > first
+    rows = rows[:first]
+
+    edges = [
+        connection_type.Edge(node=row, cursor=encode_cursor(row, rank))
+        for row in rows
+    ]
+    page_info = graphene.relay.PageInfo(
+        start_cursor=edges[0].cursor if edges else None,
+        end_cursor=edges[-1].cursor if edges else None,
+        has_next_page=has_next_page,
+        has_previous_page=bool(after),
+    )
+    return connection_type(edges=edges, page_info=page_info)
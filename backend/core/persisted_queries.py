@@ -0,0 +1,161 @@
+"""
+Automatic persisted queries: parsed, validated documents keyed by hash.
+
+Clients send the SHA-256 of a query in extensions.persistedQuery and only
+send the full text when the server answers PersistedQueryNotFound. Every
+document that parses and validates is cached by that hash, so repeated
+requests skip both steps; HTTP requests and WebSocket subscriptions share
+the cache. In allow-list mode only documents listed in the manifest written
+by build_persisted_queries may run.
+"""
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from graphql import GraphQLError, Visitor, parse, print_ast, validate, visit
+from graphql.language.visitor import REMOVE
+
+
+class DocumentCache:
+    """Thread-safe LRU mapping of query hash -> (validated DocumentNode, canonical hash)."""
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached (document, canonical hash) for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        """Cache entry under key, evicting the least recently used."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+document_cache = DocumentCache(
+    max_size=getattr(settings, 'PERSISTED_QUERY_CACHE_SIZE', 512),
+)
+
+
+def query_hash(query):
+    """Return the hex SHA-256 of query, as computed by Apollo clients."""
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+
+class _StripTypename(Visitor):
+    def enter_field(self, node, *args):
+        if node.name.value == '__typename':
+            return REMOVE
+
+
+def canonical_hash(document):
+    """
+    Hash document independently of formatting and of the __typename fields
+    Apollo's cache adds, so allow-list entries match what clients send.
+    """
+    return query_hash(print_ast(visit(document, _StripTypename())))
+
+
+@functools.lru_cache(maxsize=None)
+def load_allowlist(path):
+    """Return the canonical hashes of the documents in a manifest file."""
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    return frozenset(canonical_hash(parse(query)) for query in manifest.values())
+
+
+def get_allowlist():
+    """Return the allowed canonical hashes, or None when allow-listing is off."""
+    path = getattr(settings, 'PERSISTED_QUERY_ALLOWLIST', '')
+    return load_allowlist(path) if path else None
+
+
+def persisted_query_hash(request, data):
+    """Return the sha256Hash a request sends in extensions.persistedQuery."""
+    extensions = request.GET.get('extensions') or data.get('extensions')
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return None
+    if not isinstance(extensions, dict):
+        return None
+    persisted = extensions.get('persistedQuery')
+    if isinstance(persisted, dict):
+        return persisted.get('sha256Hash')
+    return None
+
+
+def load_document(schema, query, sha=None, validation_rules=None, max_errors=None):
+    """
+    Return ((document, canonical hash), None) for a query and/or its
+    persisted query hash, parsing and validating it on first use, or
+    (None, errors).
+    """
+    if sha and query and query_hash(query) != sha:
+        return None, [hash_mismatch_error()]
+    key = sha or query_hash(query)
+
+    entry = document_cache.get(key)
+    if entry is not None:
+        return entry, None
+    if not query:
+        return None, [not_found_error()]
+
+    try:
+        document = parse(query)
+    except GraphQLError as e:
+        return None, [e]
+
+    canonical = canonical_hash(document)
+    allowlist = get_allowlist()
+    if allowlist is not None and canonical not in allowlist:
+        return None, [not_allowed_error()]
+
+    validation_errors = validate(schema, document, validation_rules, max_errors)
+    if validation_errors:
+        return None, validation_errors
+
+    entry = (document, canonical)
+    document_cache.set(key, entry)
+    return entry, None
+
+
+def not_found_error():
+    return GraphQLError(
+        'PersistedQueryNotFound', extensions={'code': 'PERSISTED_QUERY_NOT_FOUND'}
+    )
+
+
+def hash_mismatch_error():
+    return GraphQLError(
+        'provided sha does not match query', extensions={'code': 'PERSISTED_QUERY_HASH_MISMATCH'}
+    )
+
+
+def not_allowed_error():
+    return GraphQLError(
+        'Query is not in the persisted query allow-list',
+        extensions={'code': 'PERSISTED_QUERY_NOT_ALLOWED'},
+    )
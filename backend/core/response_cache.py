@@ -0,0 +1,212 @@
+"""
+Per-tenant cache of GraphQL query results with tag-based invalidation.
+
+Entries are keyed by (organization, normalized document, operation name,
+variables) and tagged with the organizations, projects and tasks whose rows
+the query read: those named by its root field arguments, and those loaded
+while it executes, so no resolver middleware is installed. Mutations
+invalidate tags when their transaction commits.
+Invalidation bumps a per-tag version token instead of finding entries, so it
+works unchanged on any Django cache backend; the locmem and file backends
+bound their size with MAX_ENTRIES and cull the oldest entries.
+"""
+import hashlib
+import json
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from graphql import FragmentDefinitionNode
+from graphql.execution.collect_fields import collect_fields
+from graphql.execution.values import get_argument_values, get_variable_values
+from .tenancy import resolve_organization_id
+
+ORGANIZATIONS_TAG = 'organizations'
+# Changed by every invalidation; results computed across one are not stored
+GENERATION_KEY = 'generation'
+
+
+def org_tag(organization_id):
+    return f'org:{organization_id}'
+
+
+def project_tag(project_id):
+    return f'project:{project_id}'
+
+
+def task_tag(task_id):
+    return f'task:{task_id}'
+
+
+def _canonical_id(value):
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return str(value)
+
+
+class ResponseCache:
+    """
+    Tagged result cache on top of the Django cache named alias.
+
+    Each entry stores the version token of every tag it carries; a token
+    that has changed, or been evicted, turns the entry into a miss. Tags are
+    only known after execution, so callers take generation() before
+    executing and pass it to set(): a result is not stored if anything was
+    invalidated while it ran.
+    """
+
+    def __init__(self, alias='graphql', timeout=300):
+        self.alias = alias
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self.alias in settings.CACHES
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, organization_id, document_hash, operation_name, variables):
+        """Build the cache key for one query execution."""
+        raw = json.dumps(
+            [str(organization_id), document_hash, operation_name, variables or {}],
+            sort_keys=True, default=str,
+        )
+        return 'response:' + hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return cached data for key if none of its tags has been invalidated."""
+        entry = self.cache.get(key)
+        if entry is not None:
+            data, versions = entry
+            current = self.cache.get_many([f'tag:{tag}' for tag in versions])
+            if all(current.get(f'tag:{tag}') == token for tag, token in versions.items()):
+                self.hits += 1
+                return data
+        self.misses += 1
+        return None
+
+    def generation(self):
+        """Return a token that changes whenever any tag is invalidated."""
+        return self.cache.get(GENERATION_KEY)
+
+    def set(self, key, data, tags, generation):
+        """
+        Store data under key, tagged with the current version of each tag,
+        unless an invalidation happened since generation was taken.
+        """
+        tag_keys = [f'tag:{tag}' for tag in tags]
+        current = self.cache.get_many(tag_keys)
+        # After reading the tags: invalidate() bumps the generation first
+        if self.cache.get(GENERATION_KEY) != generation:
+            return
+        missing = {tag_key: uuid.uuid4().hex for tag_key in tag_keys if tag_key not in current}
+        if missing:
+            self.cache.set_many(missing, timeout=None)
+            current.update(missing)
+        versions = {tag_key[4:]: token for tag_key, token in current.items()}
+        self.cache.set(key, (data, versions), self.timeout)
+
+    def invalidate(self, tags):
+        """Expire every entry tagged with any of tags."""
+        if tags and self.enabled:
+            # Before the tags, so set() cannot see new tokens with an old generation
+            self.cache.set(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+            self.cache.set_many({f'tag:{tag}': uuid.uuid4().hex for tag in tags}, timeout=None)
+
+    def invalidate_on_commit(self, *tags):
+        """Invalidate tags once the current transaction commits."""
+        tags = set(tags)
+        transaction.on_commit(lambda: self.invalidate(tags))
+
+
+response_cache = ResponseCache(timeout=getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+
+
+# Root fields whose arguments name the rows a query depends on
+_ROOT_ARGUMENT_TAGS = {
+    'project_id': project_tag,
+    'task_id': task_tag,
+}
+
+# Tags of the rows loaded while a query executes for the cache, else None
+_row_tags = ContextVar('response_cache_row_tags', default=None)
+
+
+@contextmanager
+def collect_row_tags():
+    """
+    Yield the set of tags of every Project, Task and TaskComment loaded
+    inside the block. Nothing wraps the resolvers: the models' from_db
+    reports each row to row_loaded, which costs one context variable read
+    per row when no tags are being collected.
+    """
+    tags = set()
+    token = _row_tags.set(tags)
+    try:
+        yield tags
+    finally:
+        _row_tags.reset(token)
+
+
+# Model name: (attribute read from the loaded row, tag it names)
+_ROW_TAGS = {
+    'project': ('id', project_tag),
+    'task': ('project_id', project_tag),
+    'taskcomment': ('task_id', task_tag),
+}
+
+
+def row_loaded(instance):
+    """Record the tag of a row loaded from the database while tags are being collected."""
+    tags = _row_tags.get()
+    if tags is None:
+        return
+    attname, make_tag = _ROW_TAGS[instance._meta.model_name]
+    # Read loaded values only; a deferred field would cost a query
+    value = instance.__dict__.get(attname)
+    if value is not None:
+        tags.add(make_tag(value))
+
+
+def root_tags(schema, document, operation, variables):
+    """Return the tags named by the root fields and arguments of operation."""
+    coerced = get_variable_values(schema, operation.variable_definitions or (), variables or {})
+    if not isinstance(coerced, dict):
+        return set()
+    fragments = {
+        definition.name.value: definition for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    query_type = schema.query_type
+    fields = collect_fields(schema, fragments, coerced, query_type, operation.selection_set)
+    tags = set()
+    for nodes in fields.values():
+        field_name = nodes[0].name.value
+        field_def = query_type.fields.get(field_name)
+        if field_def is None:
+            continue
+        _add_root_tags(tags, field_name, get_argument_values(field_def, nodes[0], coerced))
+    return tags
+
+
+def _add_root_tags(tags, field_name, args):
+    if field_name in ('organizations', 'organization'):
+        tags.add(ORGANIZATIONS_TAG)
+    if args.get('organization_slug'):
+        tags.add(org_tag(resolve_organization_id(args['organization_slug'])))
+    for name, make_tag in _ROOT_ARGUMENT_TAGS.items():
+        if args.get(name):
+            tags.add(make_tag(_canonical_id(args[name])))
+    for project_id in args.get('project_ids') or ():
+        tags.add(project_tag(_canonical_id(project_id)))
+    if field_name == 'project' and args.get('id'):
+        tags.add(project_tag(_canonical_id(args['id'])))
+    elif field_name == 'task' and args.get('id'):
+        tags.add(task_tag(_canonical_id(args['id'])))
@@ -1,15 +1,34 @@
 """GraphQL schema for project management system."""
+import uuid
 import graphene
-from django.db.models import Q
-from .models import Organization, Project, Task, TaskComment, TaskStatus
+from .models import TASK_COUNTER_FIELDS, Organization, Project, Task, TaskComment
+from .managers import statistics_from_counts
 from .types import (
+    ActivityEventType,
+    ActivityFilterInput,
     OrganizationType,
     ProjectType,
     TaskType,
     TaskCommentType,
     ProjectStatisticsType,
+    ProjectConnection,
+    TaskConnection,
+    TaskCommentConnection,
 )
 from .mutations import Mutation
+from .loaders import get_loaders
+from .pagination import paginate
+from .search import RANK_FIELD, search_projects, search_tasks
+from .tenancy import get_request_organization_id
+
+
+def _normalize_uuids(values):
+    """Yield canonical string forms of the valid UUIDs in values."""
+    for value in values:
+        try:
+            yield str(uuid.UUID(str(value)))
+        except ValueError:
+            continue
 
 
 class Query(graphene.ObjectType):
@@ -20,29 +39,42 @@ class Query(graphene.ObjectType):
     organization = graphene.Field(OrganizationType, slug=graphene.String(required=True))
     
     # Project queries
-    projects = graphene.List(
-        ProjectType,
+    projects = graphene.Field(
+        ProjectConnection,
         organization_slug=graphene.String(required=True),
         status=graphene.String(),
         search=graphene.String(),
+        first=graphene.Int(),
+        after=graphene.String(),
     )
     project = graphene.Field(ProjectType, id=graphene.ID(required=True))
     project_statistics = graphene.Field(
         ProjectStatisticsType,
         project_id=graphene.ID(required=True)
     )
+    projects_statistics = graphene.List(
+        ProjectStatisticsType,
+        project_ids=graphene.List(graphene.NonNull(graphene.ID), required=True)
+    )
     
     # Task queries
-    tasks = graphene.List(
-        TaskType,
+    tasks = graphene.Field(
+        TaskConnection,
         project_id=graphene.ID(required=True),
         status=graphene.String(),
         search=graphene.String(),
+        first=graphene.Int(),
+        after=graphene.String(),
     )
     task = graphene.Field(TaskType, id=graphene.ID(required=True))
     
     # Comment queries
-    comments = graphene.List(TaskCommentType, task_id=graphene.ID(required=True))
+    comments = graphene.Field(
+        TaskCommentConnection,
+        task_id=graphene.ID(required=True),
+        first=graphene.Int(),
+        after=graphene.String(),
+    )
 
     def resolve_organizations(self, info):
         """List all organizations."""
@@ -55,7 +87,8 @@ class Query(graphene.ObjectType):
         except Organization.DoesNotExist:
             return None
 
-    def resolve_projects(self, info, organization_slug, status=None, search=None):
+    def resolve_projects(self, info, organization_slug, status=None, search=None,
+                         first=None, after=None):
         """
         List projects for an organization with optional filtering.
         Enforces organization-based data isolation.
@@ -65,12 +98,12 @@ class Query(graphene.ObjectType):
         if status:
             queryset = queryset.filter(status=status)
         
+        rank = None
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | Q(description__icontains=search)
-            )
+            queryset = search_projects(queryset, search)
+            rank = RANK_FIELD
         
-        return queryset
+        return paginate(queryset, ProjectConnection, first=first, after=after, rank=rank)
 
     def resolve_project(self, info, id):
         """Get project by ID."""
@@ -80,33 +113,43 @@ class Query(graphene.ObjectType):
         try:
             project = Project.objects.get(id=id)
             # Verify organization access if context is available
-            if org_slug and project.organization.slug != org_slug:
+            if org_slug and project.organization_id != get_request_organization_id(info.context):
                 return None
             return project
         except Project.DoesNotExist:
             return None
 
     def resolve_project_statistics(self, info, project_id):
-        """Get statistics for a project."""
-        try:
-            project = Project.objects.get(id=project_id)
-            tasks = project.tasks.all()
-            total = tasks.count()
-            completed = tasks.filter(status=TaskStatus.DONE).count()
-            in_progress = tasks.filter(status=TaskStatus.IN_PROGRESS).count()
-            todo = tasks.filter(status=TaskStatus.TODO).count()
-            
-            return ProjectStatisticsType(
-                total_tasks=total,
-                completed_tasks=completed,
-                in_progress_tasks=in_progress,
-                todo_tasks=todo,
-                completion_rate=round((completed / total * 100), 1) if total > 0 else 0
-            )
-        except Project.DoesNotExist:
+        """Get statistics for a project from its stored counters."""
+        project = Project.objects.only(*TASK_COUNTER_FIELDS).filter(id=project_id).first()
+        if project is None:
             return None
+        return ProjectStatisticsType(
+            project_id=project_id, **statistics_from_counts(project.status_counts())
+        )
 
-    def resolve_tasks(self, info, project_id, status=None, search=None):
+    def resolve_projects_statistics(self, info, project_ids):
+        """
+        Get statistics for many projects from their stored counters.
+        Missing projects and projects outside the organization are omitted.
+        """
+        org_slug = getattr(info.context, 'organization_slug', None)
+        project_ids = list(dict.fromkeys(_normalize_uuids(project_ids)))
+        projects = Project.objects.filter(id__in=project_ids).only('id', *TASK_COUNTER_FIELDS)
+        if org_slug:
+            projects = projects.for_organization(organization_id=get_request_organization_id(info.context))
+        stats = {
+            str(project.id): statistics_from_counts(project.status_counts())
+            for project in projects
+        }
+        return [
+            ProjectStatisticsType(project_id=pid, **stats[pid])
+            for pid in project_ids
+            if pid in stats
+        ]
+
+    def resolve_tasks(self, info, project_id, status=None, search=None,
+                      first=None, after=None):
         """
         List tasks for a project with optional filtering.
         """
@@ -115,12 +158,14 @@ class Query(graphene.ObjectType):
         if status:
             queryset = queryset.filter(status=status)
         
+        rank = None
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | Q(description__icontains=search)
-            )
+            queryset = search_tasks(queryset, search)
+            rank = RANK_FIELD
         
-        return queryset
+        connection = paginate(queryset, TaskConnection, first=first, after=after, rank=rank)
+        get_loaders(info.context).enqueue_tasks(edge.node for edge in connection.edges)
+        return connection
 
     def resolve_task(self, info, id):
         """Get task by ID."""
@@ -129,9 +174,26 @@ class Query(graphene.ObjectType):
         except Task.DoesNotExist:
             return None
 
-    def resolve_comments(self, info, task_id):
+    def resolve_comments(self, info, task_id, first=None, after=None):
         """List comments for a task, ordered by created_at descending."""
-        return TaskComment.objects.for_task(task_id).order_by('-created_at')
+        queryset = TaskComment.objects.for_task(task_id)
+        return paginate(queryset, TaskCommentConnection, first=first, after=after)
+
+
+class Subscription(graphene.ObjectType):
+    """
+    Root subscription type. Events are pushed by GraphQLSubscriptionConsumer
+    rather than resolved here; the schema validates what clients select.
+    since takes the cursor of the last event received before a reconnect.
+    """
+    task_updated = graphene.Field(TaskType, project_id=graphene.ID(required=True), since=graphene.String())
+    comment_added = graphene.Field(TaskCommentType, task_id=graphene.ID(required=True), since=graphene.String())
+    organization_activity = graphene.Field(
+        ActivityEventType,
+        organization_slug=graphene.String(required=True),
+        filter=ActivityFilterInput(),
+        since=graphene.String(),
+    )
 
 
-schema = graphene.Schema(query=Query, mutation=Mutation)
+schema = graphene.Schema(query=Query, mutation=Mutation, subscription=Subscription)
@@ -0,0 +1,71 @@
+"""Ranked full-text search for projects and tasks."""
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import connections
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'english'
+
+# These expressions must stay identical to the GIN expression indexes created
+# in migration 0002_search_indexes, otherwise PostgreSQL cannot use them.
+PROJECT_DOCUMENT_SQL = (
+    "setweight(to_tsvector('english'::regconfig, COALESCE(\"core_project\".\"name\", '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, COALESCE(\"core_project\".\"description\", '')), 'B')"
+)
+TASK_DOCUMENT_SQL = (
+    "setweight(to_tsvector('english'::regconfig, COALESCE(\"core_task\".\"title\", '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, COALESCE(\"core_task\".\"description\", '')), 'B')"
+)
+
+RANK_FIELD = 'search_rank'
+
+
+def _prefix_query(term):
+    """Turn free text into a raw tsquery matching every word as a prefix."""
+    words = re.findall(r'\w+', term)
+    if not words:
+        return None
+    return ' & '.join(f'{word}:*' for word in words)
+
+
+def _full_text(queryset, term, document_sql):
+    """Filter with the GIN-indexed document and annotate its rank."""
+    raw_query = _prefix_query(term)
+    if raw_query is None:
+        return queryset.none()
+    query = SearchQuery(raw_query, search_type='raw', config=SEARCH_CONFIG)
+    return (
+        queryset
+        .alias(search_document=RawSQL(document_sql, [], output_field=SearchVectorField()))
+        .filter(search_document=query)
+        .annotate(**{RANK_FIELD: Cast(SearchRank(F('search_document'), query), FloatField())})
+    )
+
+
+def _substring(queryset, term, title_field, body_field):
+    """Portable fallback: icontains match, ranking title hits above body hits."""
+    title_match = Q(**{f'{title_field}__icontains': term})
+    body_match = Q(**{f'{body_field}__icontains': term})
+    return queryset.filter(title_match | body_match).annotate(**{
+        RANK_FIELD: Case(
+            When(title_match, then=Value(1.0)),
+            default=Value(0.5),
+            output_field=FloatField(),
+        )
+    })
+
+
+def search_projects(queryset, term):
+    """Return projects matching term, annotated with search_rank."""
+    if connections[queryset.db].vendor == 'postgresql':
+        return _full_text(queryset, term, PROJECT_DOCUMENT_SQL)
+    return _substring(queryset, term, 'name', 'description')
+
+
+def search_tasks(queryset, term):
+    """Return tasks matching term, annotated with search_rank."""
+    if connections[queryset.db].vendor == 'postgresql':
+        return _full_text(queryset, term, TASK_DOCUMENT_SQL)
+    return _substring(queryset, term, 'title', 'description')
@@ -0,0 +1,322 @@
+"""
+Compiled GraphQL subscriptions for GraphQLSubscriptionConsumer.
+
+A subscribe message is turned into a CompiledSubscription once: the document
+comes from the shared document_cache (parsed and validated on first use),
+the root field and its arguments pick the channel group, and the selection
+set becomes a projection. Events carry every field the server knows about;
+each subscriber receives only the fields it selected, under its aliases.
+organizationActivity subscriptions share one group per organization and
+filter its events by project and task status in the consumer.
+
+Projected payloads are encoded once per event and distinct selection by
+payload_cache and shared by every consumer of the process; a connection
+only splices its subscription id into the frame.
+"""
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLIncludeDirective,
+    GraphQLSkipDirective,
+    InlineFragmentNode,
+    OperationType,
+    get_named_type,
+    get_operation_ast,
+)
+from graphql.execution.values import get_argument_values, get_directive_values
+from .complexity import VALIDATION_RULES, coerce_variables
+from .models import TaskStatus
+from .persisted_queries import load_document
+from .tenancy import resolve_organization_id
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Root subscription field -> (argument naming the group, group name format)
+SUBSCRIPTION_GROUPS = {
+    'taskUpdated': ('project_id', 'project_{}_tasks'),
+    'commentAdded': ('task_id', 'task_{}_comments'),
+}
+
+# Fields broadcast events carry, per GraphQL type. Subscriptions selecting
+# anything else, such as a task's project, are rejected when compiled.
+EVENT_FIELDS = {
+    'TaskType': {'id', 'title', 'description', 'status', 'assigneeEmail', 'dueDate', 'createdAt'},
+    'TaskCommentType': {'id', 'content', 'authorEmail', 'createdAt'},
+    'ActivityEventType': {'kind', 'projectId', 'task', 'comment'},
+}
+
+ORGANIZATION_ACTIVITY_GROUP = 'organization_{}_activity'
+
+
+class SubscriptionError(Exception):
+    """A subscribe message that cannot be served; carries GraphQL errors."""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+@dataclass
+class CompiledSubscription:
+    """The group a subscription listens on and how to shape its events."""
+    group: str
+    field_name: str
+    response_key: str
+    projection: tuple
+    event_filter: Optional[Callable] = None
+    # Cursor of the last event the client received, to resume from
+    since: Optional[str] = None
+    # Equal for subscriptions that shape events the same way
+    projection_key: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.projection_key = repr((self.field_name, self.response_key, self.projection))
+
+    def accepts(self, data):
+        """Return whether an event's data passes this subscription's filter."""
+        return self.event_filter is None or self.event_filter(data)
+
+    def project(self, data):
+        """Return the payload data for an event's {field name: value} data."""
+        return {self.response_key: _project(self.projection, data.get(self.field_name))}
+
+
+@dataclass(frozen=True)
+class ActivityFilter:
+    """organizationActivity filter; None accepts any project or status."""
+    project_ids: Optional[frozenset] = None
+    statuses: Optional[frozenset] = None
+
+    def __call__(self, data):
+        activity = data.get('organizationActivity') or {}
+        if self.project_ids is not None and activity.get('projectId') not in self.project_ids:
+            return False
+        if self.statuses is not None:
+            # Comments are filtered by the status of the task they are on
+            return (activity.get('task') or {}).get('status') in self.statuses
+        return True
+
+
+def _uuid(value):
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        raise SubscriptionError([GraphQLError(f'Invalid id: {value}')])
+
+
+def _organization_activity(args):
+    """Return the group and filter of an organizationActivity subscription."""
+    organization_id = resolve_organization_id(args['organization_slug'])
+    if organization_id is None:
+        raise SubscriptionError([GraphQLError('Organization not found')])
+    options = args.get('filter') or {}
+    project_ids = options.get('project_ids')
+    statuses = options.get('statuses')
+    valid_statuses = {status.value for status in TaskStatus}
+    for status in statuses or ():
+        if status not in valid_statuses:
+            raise SubscriptionError([GraphQLError(
+                f'Invalid status. Must be one of: {", ".join(sorted(valid_statuses))}'
+            )])
+    event_filter = None
+    if project_ids is not None or statuses is not None:
+        event_filter = ActivityFilter(
+            project_ids=None if project_ids is None else frozenset(_uuid(pk) for pk in project_ids),
+            statuses=None if statuses is None else frozenset(statuses),
+        )
+    return ORGANIZATION_ACTIVITY_GROUP.format(organization_id), event_filter
+
+
+def _project(projection, value):
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return [_project(projection, item) for item in value]
+    type_name, fields = projection
+    result = {}
+    for key, (name, child) in fields.items():
+        if name == '__typename':
+            result[key] = type_name
+        elif child is None:
+            result[key] = value.get(name)
+        else:
+            result[key] = _project(child, value.get(name))
+    return result
+
+
+def encode_json(value):
+    """Return value as compact JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def next_frame_prefix(sub_id):
+    """Return the start of a subscription's next frames, up to its payload."""
+    return '{"type":"next","id":%s,"payload":' % encode_json(sub_id)
+
+
+class PayloadCache:
+    """Thread-safe LRU of encoded payloads keyed by (event id, projection key)."""
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def payload(self, compiled, event_id, data, extensions=None):
+        """
+        Return the encoded {"data": ..., "extensions": ...} payload of an
+        event for compiled; extensions must be the same for every subscriber.
+        """
+        if event_id is None:
+            return self._encode(compiled, data, extensions)
+        key = (event_id, compiled.projection_key)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self.hits += 1
+                return payload
+            self.misses += 1
+        payload = self._encode(compiled, data, extensions)
+        with self._lock:
+            self._entries[key] = payload
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return payload
+
+    @staticmethod
+    def _encode(compiled, data, extensions):
+        # Only on a miss: projecting is most of the cost the cache saves
+        result = {'data': compiled.project(data)}
+        if extensions:
+            result['extensions'] = extensions
+        return encode_json(result)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+payload_cache = PayloadCache()
+
+
+class _ProjectionBuilder:
+    def __init__(self, schema, fragments, variables):
+        self.schema = schema
+        self.fragments = fragments
+        self.variables = variables
+        self.nodes = {}
+
+    def included(self, node):
+        skip = get_directive_values(GraphQLSkipDirective, node, self.variables)
+        if skip and skip['if']:
+            return False
+        include = get_directive_values(GraphQLIncludeDirective, node, self.variables)
+        return not (include and not include['if'])
+
+    def applies(self, type_condition, parent_type):
+        if type_condition is None:
+            return True
+        condition = self.schema.get_type(type_condition.name.value)
+        return condition is parent_type or (
+            hasattr(condition, 'fields') and self.schema.is_sub_type(condition, parent_type)
+        )
+
+    def build(self, selection_set, parent_type, fields=None):
+        """Return (type name, {response key: (field name, child projection)})."""
+        fields = {} if fields is None else fields
+        for selection in selection_set.selections:
+            if not self.included(selection):
+                continue
+            if isinstance(selection, FieldNode):
+                self.add_field(selection, parent_type, fields)
+            elif isinstance(selection, InlineFragmentNode):
+                if self.applies(selection.type_condition, parent_type):
+                    self.build(selection.selection_set, parent_type, fields)
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments[selection.name.value]
+                if self.applies(fragment.type_condition, parent_type):
+                    self.build(fragment.selection_set, parent_type, fields)
+        return parent_type.name, fields
+
+    def add_field(self, node, parent_type, fields):
+        name = node.name.value
+        carried = EVENT_FIELDS.get(parent_type.name)
+        if carried is not None and name not in carried and name != '__typename':
+            raise SubscriptionError([GraphQLError(
+                f"Subscription events do not include '{name}' on {parent_type.name}; "
+                'query it separately', node,
+            )])
+        key = node.alias.value if node.alias else name
+        self.nodes[key] = node
+        if node.selection_set is None:
+            fields[key] = (name, None)
+            return
+        child_type = get_named_type(parent_type.fields[name].type)
+        # Repeated keys merge their selections, as execution would
+        existing = fields.get(key)
+        child_fields = existing[1][1] if existing and existing[1] else {}
+        fields[key] = (name, self.build(node.selection_set, child_type, child_fields))
+
+
+def compile_subscription(schema, query, variables=None, operation_name=None, sha=None):
+    """
+    Return the CompiledSubscription for a subscribe payload, or raise
+    SubscriptionError with the GraphQL errors to send back. Resolving an
+    organizationActivity slug may query the database.
+    """
+    entry, errors = load_document(schema, query, sha=sha, validation_rules=VALIDATION_RULES)
+    if errors:
+        raise SubscriptionError(errors)
+    document, _ = entry
+
+    operation = get_operation_ast(document, operation_name)
+    if operation is None or operation.operation != OperationType.SUBSCRIPTION:
+        raise SubscriptionError([GraphQLError('Expected a subscription operation')])
+
+    variables = coerce_variables(schema, operation, variables)
+    root_type = schema.subscription_type
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if getattr(definition, 'type_condition', None) is not None
+    }
+    builder = _ProjectionBuilder(schema, fragments, variables)
+    # Validation allows exactly one root field per subscription
+    _, root_fields = builder.build(operation.selection_set, root_type)
+    if not root_fields:
+        raise SubscriptionError([GraphQLError('The subscription selects no field')])
+    (response_key, (field_name, projection)), = root_fields.items()
+
+    try:
+        args = get_argument_values(root_type.fields[field_name], builder.nodes[response_key], variables)
+    except GraphQLError as e:
+        raise SubscriptionError([e])
+    event_filter = None
+    if field_name == 'organizationActivity':
+        group, event_filter = _organization_activity(args)
+    else:
+        argument, group_format = SUBSCRIPTION_GROUPS[field_name]
+        group = group_format.format(_uuid(args[argument]))
+    return CompiledSubscription(
+        group=group,
+        field_name=field_name,
+        response_key=response_key,
+        projection=projection,
+        event_filter=event_filter,
+        since=args.get('since'),
+    )
@@ -0,0 +1,90 @@
+"""Per-process cache resolving organization slugs to ids."""
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+
+
+class OrganizationCache:
+    """Thread-safe LRU mapping of slug -> organization id with a TTL."""
+
+    def __init__(self, max_size=1024, ttl=60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, slug):
+        """Return the cached id for slug, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry is None:
+                return None
+            organization_id, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[slug]
+                return None
+            self._entries.move_to_end(slug)
+            return organization_id
+
+    def set(self, slug, organization_id):
+        """Cache organization_id for slug, evicting the least recently used."""
+        with self._lock:
+            self._entries[slug] = (organization_id, time.monotonic() + self.ttl)
+            self._entries.move_to_end(slug)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, slug=None, organization_id=None):
+        """Drop the entry for slug and any entry pointing at organization_id."""
+        with self._lock:
+            self._entries.pop(slug, None)
+            if organization_id is not None:
+                for key in [k for k, (v, _) in self._entries.items() if v == organization_id]:
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+organization_cache = OrganizationCache(
+    max_size=getattr(settings, 'ORGANIZATION_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'ORGANIZATION_CACHE_TTL', 60.0),
+)
+
+
+def resolve_organization_id(slug):
+    """Return the id of the organization with slug, or None if none exists."""
+    if not slug:
+        return None
+    organization_id = organization_cache.get(slug)
+    if organization_id is None:
+        from core.models import Organization
+        organization_id = (
+            Organization.objects.filter(slug=slug).values_list('id', flat=True).first()
+        )
+        if organization_id is not None:
+            organization_cache.set(slug, organization_id)
+    return organization_id
+
+
+def get_request_organization_id(request):
+    """Return the organization id for a request's slug, resolving it once."""
+    if request is None:
+        return None
+    if not hasattr(request, 'organization_id'):
+        slug = getattr(request, 'organization_slug', None)
+        request.organization_id = resolve_organization_id(slug)
+    return request.organization_id
+
+
+def organization_saved(sender, instance, **kwargs):
+    """Signal handler replacing cached entries for a saved organization."""
+    organization_cache.invalidate(slug=instance.slug, organization_id=instance.pk)
+    organization_cache.set(instance.slug, instance.pk)
+
+
+def organization_deleted(sender, instance, **kwargs):
+    """Signal handler dropping cached entries for a deleted organization."""
+    organization_cache.invalidate(slug=instance.slug, organization_id=instance.pk)
@@ -0,0 +1,199 @@
+"""
+Streaming export and import of one organization's data.
+
+A dump is a sequence of records, each tagged with its kind, written parents
+first: the organization, then its projects, tasks and comments. Exports read
+with server-side cursors and imports write with batched multi-row inserts, so
+memory stays bounded by the chunk and batch sizes whatever the tenant size.
+"""
+import csv
+import datetime
+import json
+import uuid
+from django.db import connections, router, transaction
+from .models import Organization, Project, Task, TaskComment
+
+FORMATS = ('ndjson', 'csv')
+
+# Exported columns per record kind; the organization is implied for children
+RECORD_FIELDS = {
+    'organization': ['id', 'name', 'slug', 'contact_email', 'created_at'],
+    'project': ['id', 'name', 'description', 'status', 'due_date', 'created_at'],
+    'task': ['id', 'project_id', 'title', 'description', 'status', 'assignee_email', 'due_date', 'created_at'],
+    'comment': ['id', 'task_id', 'content', 'author_email', 'created_at'],
+}
+
+RECORD_MODELS = {
+    'organization': Organization,
+    'project': Project,
+    'task': Task,
+    'comment': TaskComment,
+}
+
+# Every column that appears in any record kind, for the single CSV header
+CSV_COLUMNS = ['kind'] + list(dict.fromkeys(
+    field for fields in RECORD_FIELDS.values() for field in fields
+))
+
+# Fields that are NULL rather than empty when absent
+NULLABLE_FIELDS = {'due_date'}
+
+
+def _encode(value):
+    """Render UUIDs and dates as strings, keeping full datetime precision."""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def iter_records(organization, chunk_size=2000):
+    """
+    Yield (kind, row) for an organization and everything it owns.
+
+    Rows are plain dicts read with iterator(chunk_size), which uses a
+    server-side cursor where the backend supports one. Children filter on
+    their denormalized organization_id, so no query joins the hierarchy.
+    """
+    yield 'organization', {
+        field: getattr(organization, field) for field in RECORD_FIELDS['organization']
+    }
+    for kind in ('project', 'task', 'comment'):
+        rows = (
+            RECORD_MODELS[kind].objects
+            .filter(organization_id=organization.id)
+            .order_by()
+            .values(*RECORD_FIELDS[kind])
+        )
+        for row in rows.iterator(chunk_size=chunk_size):
+            yield kind, row
+
+
+class NDJSONWriter:
+    """Write one JSON object per line, tagged with its kind."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, kind, row):
+        record = {'kind': kind}
+        record.update((field, _encode(value)) for field, value in row.items())
+        self.stream.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+
+class CSVWriter:
+    """Write every record kind into one CSV with a shared header."""
+
+    def __init__(self, stream):
+        self.writer = csv.DictWriter(stream, fieldnames=CSV_COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, kind, row):
+        record = {'kind': kind}
+        record.update((field, _encode(value)) for field, value in row.items())
+        self.writer.writerow(record)
+
+
+WRITERS = {'ndjson': NDJSONWriter, 'csv': CSVWriter}
+
+
+def read_ndjson(stream):
+    """Yield (kind, row) from an NDJSON dump, skipping blank lines."""
+    for line in stream:
+        if line.strip():
+            record = json.loads(line)
+            yield record.pop('kind'), record
+
+
+def read_csv(stream):
+    """Yield (kind, row) from a CSV dump, keeping only the kind's columns."""
+    for record in csv.DictReader(stream):
+        kind = record['kind']
+        row = {}
+        for field in RECORD_FIELDS.get(kind, ()):
+            value = record.get(field, '')
+            row[field] = None if value == '' and field in NULLABLE_FIELDS else value
+        yield kind, row
+
+
+READERS = {'ndjson': read_ndjson, 'csv': read_csv}
+
+
+def insert_records(kind, objs):
+    """
+    Insert model instances of a record kind exactly as given, created_at included.
+
+    bulk_create runs pre_save, so auto_now_add would stamp now() over the
+    dumped timestamps. This is a raw insert, as loaddata does, which stores
+    the values on the instances and skips save() and signals like bulk_create.
+    """
+    model = RECORD_MODELS[kind]
+    queryset = model._base_manager.using(router.db_for_write(model))
+    fields = model._meta.concrete_fields
+    batch_size = max(connections[queryset.db].ops.bulk_batch_size(fields, objs), 1)
+    for start in range(0, len(objs), batch_size):
+        queryset._insert(objs[start:start + batch_size], fields=fields, raw=True)
+    for obj in objs:
+        obj._state.adding = False
+        obj._state.db = queryset.db
+
+
+class TenantImporter:
+    """
+    Load records into the database in batches of batch_size.
+
+    Records must arrive parents first, as written by iter_records. A batch is
+    flushed when it fills or the record kind changes, so at most one batch
+    of model instances is held in memory.
+    """
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.organization_id = None
+        self.counts = dict.fromkeys(RECORD_MODELS, 0)
+        self._kind = None
+        self._batch = []
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def load(self, records):
+        """Import records in one transaction and return the per-kind counts."""
+        with transaction.atomic():
+            for kind, row in records:
+                self.add(kind, row)
+            self.flush()
+            # Inserts skip Task.save, so fill the project counters in one pass
+            if self.organization_id is not None:
+                Project.objects.filter(organization_id=self.organization_id).recompute_task_counts()
+        return self.counts
+
+    def add(self, kind, row):
+        if kind not in RECORD_MODELS:
+            raise ValueError(f'Unknown record kind: {kind!r}')
+        if kind != self._kind or len(self._batch) >= self.batch_size:
+            self.flush()
+            self._kind = kind
+        self._batch.append(self._build(kind, row))
+
+    def flush(self):
+        if not self._batch:
+            return
+        insert_records(self._kind, self._batch)
+        self.counts[self._kind] += len(self._batch)
+        self._batch = []
+
+    def _build(self, kind, row):
+        if kind == 'organization':
+            if self.organization_id is not None:
+                raise ValueError('A dump holds exactly one organization')
+            if Organization.objects.filter(slug=row['slug']).exists():
+                raise ValueError(f"Organization {row['slug']!r} already exists")
+            self.organization_id = row['id']
+            return Organization(**row)
+        if self.organization_id is None:
+            raise ValueError('The organization record must come first')
+        # Inserts skip save(), so set the denormalized organization here
+        return RECORD_MODELS[kind](organization_id=self.organization_id, **row)
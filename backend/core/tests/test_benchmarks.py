@@ -0,0 +1,82 @@
+"""
+Tests for the resolver benchmark suite.
+
+**Feature: project-management-system, Property 23: Size-Independent Query Budgets**
+**Validates: Requirements 13.3**
+
+For each benchmarked GraphQL operation, the number of SQL queries shall stay
+within its budget and shall not grow with the size of the dataset.
+"""
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from core import benchmarks
+from core.benchmarks import Operation, budget_violations, run_benchmarks, run_fanout, run_scale
+
+
+class TestResolverBenchmarks(TestCase):
+    """Runs the benchmark suite on its smaller datasets."""
+
+    def test_operations_stay_within_budget_at_every_scale(self):
+        report = run_benchmarks(['small', 'medium'], repeat=1)
+
+        assert budget_violations(report) == []
+        small, medium = report['scales']
+        assert medium['project_tasks'] > small['project_tasks']
+        for small_op, medium_op in zip(small['operations'], medium['operations']):
+            assert small_op['queries'] == medium_op['queries'], small_op['name']
+        # The report is what gets compared across commits
+        json.dumps(report)
+
+    def test_generated_rows_are_rolled_back(self):
+        from core.models import Organization
+
+        run_scale('small', repeat=1)
+        assert not Organization.objects.filter(slug__startswith='bench-').exists()
+
+    def test_over_budget_operation_is_reported(self):
+        tight = Operation('dashboard_projects', benchmarks.DASHBOARD_PROJECTS, 1,
+                          benchmarks._dashboard_variables)
+        report = {'scales': [run_scale('small', repeat=1, operations=[tight])]}
+
+        [(scale, op)] = budget_violations(report)
+        assert scale == 'small'
+        assert op['queries'] > op['budget']
+
+    def test_command_writes_json_and_fails_over_budget(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.json')
+            call_command('benchmark_resolvers', scales=['small'], repeat=1, output=path, stdout=io.StringIO())
+            with open(path) as f:
+                assert [s['scale'] for s in json.load(f)['scales']] == ['small']
+
+        tight = [Operation('project_detail', benchmarks.PROJECT_DETAIL, 0, benchmarks._project_variables)]
+        with mock.patch.object(benchmarks, 'OPERATIONS', tight):
+            with pytest.raises(CommandError):
+                call_command('benchmark_resolvers', scales=['small'], repeat=1, stdout=io.StringIO())
+
+
+class TestFanoutBenchmark(TestCase):
+    """Runs the subscription fan-out benchmark on a few subscriber counts."""
+
+    def test_report_covers_every_subscriber_count(self):
+        report = run_fanout([1, 50], events=5)
+
+        assert [run['subscribers'] for run in report['runs']] == [1, 50]
+        assert report['encoder'] in ('orjson', 'json')
+        for run in report['runs']:
+            assert run['per_subscriber_us'] >= 0 and run['encode_once_us'] >= 0
+        json.dumps(report)
+
+    def test_command_writes_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'fanout.json')
+            call_command('benchmark_fanout', subscribers=[10], events=2, output=path, stdout=io.StringIO())
+            with open(path) as f:
+                assert [run['subscribers'] for run in json.load(f)['runs']] == [10]
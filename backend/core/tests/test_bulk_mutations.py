@@ -0,0 +1,254 @@
+"""
+Property-based tests for bulk task mutations.
+
+**Feature: project-management-system, Property 20: All-or-Nothing Bulk Task Writes**
+**Validates: Requirements 13.1, 13.3**
+
+For any batch of task inputs, either every item is written in one transaction
+with one subscription event per affected project, or nothing is written and
+each invalid item is reported by its position in the input.
+"""
+import uuid
+from unittest import mock
+import pytest
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from core.models import Organization, Project, Task, TaskComment, TaskStatus
+from core.schema import schema
+
+CREATE_TASKS = """
+mutation ($input: [CreateTaskInput!]!) {
+  createTasks(input: $input) {
+    tasks { id title status }
+    errors { field message }
+  }
+}
+"""
+
+UPDATE_TASKS = """
+mutation ($input: [UpdateTaskItemInput!]!) {
+  updateTasks(input: $input) {
+    tasks { id title status }
+    errors { field message }
+  }
+}
+"""
+
+MOVE_TASKS = """
+mutation ($ids: [ID!]!, $projectId: ID!) {
+  moveTasks(ids: $ids, projectId: $projectId) {
+    tasks { id }
+    errors { field message }
+  }
+}
+"""
+
+statuses = st.sampled_from([s.value for s in TaskStatus])
+
+
+def _org():
+    slug = f"org-{uuid.uuid4().hex[:8]}"
+    return Organization.objects.create(name="Org", slug=slug, contact_email="org@example.com")
+
+
+class TestBulkTaskMutations(TestCase):
+    """Tests for createTasks, updateTasks and moveTasks."""
+
+    def _execute(self, query, **variables):
+        request = RequestFactory().post('/graphql/')
+        with mock.patch('core.mutations.dispatcher') as dispatcher, \
+                self.captureOnCommitCallbacks(execute=True):
+            result = schema.execute(query, variable_values=variables, context_value=request)
+        return result, [call.args for call in dispatcher.publish.call_args_list]
+
+    @staticmethod
+    def _by_type(published, message_type):
+        return [(group, message) for group, message in published if message['type'] == message_type]
+
+    @given(
+        per_project=st.lists(st.lists(statuses, max_size=6), min_size=1, max_size=4),
+    )
+    @settings(max_examples=30, deadline=None)
+    def test_create_tasks_writes_batch_with_one_event_per_project(self, per_project):
+        """
+        **Feature: project-management-system, Property 20: All-or-Nothing Bulk Task Writes**
+        **Validates: Requirements 13.1, 13.3**
+
+        For any valid batch, every task shall be created with its project's
+        organization, using a constant number of queries and one event per
+        project that received tasks.
+        """
+        org = _org()
+        projects = [Project.objects.create(organization=org, name=f"P{i}") for i in range(len(per_project))]
+        items = [
+            {'projectId': str(project.id), 'title': f"T{j}", 'status': status}
+            for project, project_statuses in zip(projects, per_project)
+            for j, status in enumerate(project_statuses)
+        ]
+
+        with CaptureQueriesContext(connection) as ctx:
+            result, published = self._execute(CREATE_TASKS, input=items)
+
+        assert result.errors is None
+        payload = result.data['createTasks']
+        assert payload['errors'] == []
+        assert len(payload['tasks']) == len(items)
+        # Project lookup plus one INSERT, whatever the batch size
+        assert len([q for q in ctx.captured_queries if q['sql'].startswith(('SELECT', 'INSERT'))]) <= 2
+        for project, project_statuses in zip(projects, per_project):
+            tasks = Task.objects.filter(project=project)
+            assert sorted(tasks.values_list('status', flat=True)) == sorted(project_statuses)
+            assert all(task.organization_id == org.id for task in tasks)
+
+        task_events = self._by_type(published, 'tasks_updated')
+        groups = sorted(group for group, message in task_events)
+        expected = sorted(f'project_{p.id}_tasks' for p, s in zip(projects, per_project) if s)
+        assert groups == expected
+        # The organization's dashboards get every task in one message
+        activity_events = self._by_type(published, 'organization_activity')
+        assert [group for group, message in activity_events] == ([f'organization_{org.id}_activity'] if items else [])
+        assert sum(len(message['activities']) for group, message in activity_events) == len(items)
+        assert len(published) == len(task_events) + len(activity_events)
+
+    @given(
+        size=st.integers(min_value=1, max_value=6),
+        bad_index=st.data(),
+    )
+    @settings(max_examples=30, deadline=None)
+    def test_invalid_item_rejects_whole_batch(self, size, bad_index):
+        """
+        **Feature: project-management-system, Property 20: All-or-Nothing Bulk Task Writes**
+        **Validates: Requirements 13.1**
+
+        For any batch with one invalid item, no task shall be written, no
+        event shall be sent, and the error shall name the item's position.
+        """
+        project = Project.objects.create(organization=_org(), name="P")
+        index = bad_index.draw(st.integers(min_value=0, max_value=size - 1))
+        items = [{'projectId': str(project.id), 'title': f"T{i}"} for i in range(size)]
+        items[index]['status'] = 'NOT_A_STATUS'
+
+        result, published = self._execute(CREATE_TASKS, input=items)
+
+        payload = result.data['createTasks']
+        assert payload['tasks'] is None
+        assert [e['field'] for e in payload['errors']] == [f'input.{index}.status']
+        assert Task.objects.filter(project=project).count() == 0
+        assert published == []
+
+    def test_create_tasks_reports_unknown_projects_and_bad_emails(self):
+        """Each bad item shall produce an error; valid items shall not be written."""
+        project = Project.objects.create(organization=_org(), name="P")
+        items = [
+            {'projectId': str(project.id), 'title': "Fine"},
+            {'projectId': str(uuid.uuid4()), 'title': "Lost"},
+            {'projectId': 'not-a-uuid', 'title': "Malformed"},
+            {'projectId': str(project.id), 'title': "Bad", 'assigneeEmail': 'nope'},
+        ]
+
+        result, _ = self._execute(CREATE_TASKS, input=items)
+
+        fields = [e['field'] for e in result.data['createTasks']['errors']]
+        assert fields == ['input.1.project_id', 'input.2.project_id', 'input.3.assignee_email']
+        assert Task.objects.count() == 0
+
+    @given(new_statuses=st.lists(statuses, min_size=1, max_size=8))
+    @settings(max_examples=30, deadline=None)
+    def test_update_tasks_applies_every_item(self, new_statuses):
+        """
+        **Feature: project-management-system, Property 20: All-or-Nothing Bulk Task Writes**
+        **Validates: Requirements 13.1, 13.3**
+
+        For any batch of status changes, every task shall take its new status
+        and each project shall receive one aggregated event.
+        """
+        org = _org()
+        projects = [Project.objects.create(organization=org, name=f"P{i}") for i in range(2)]
+        tasks = [
+            Task.objects.create(project=projects[i % 2], title=f"T{i}")
+            for i in range(len(new_statuses))
+        ]
+        items = [{'id': str(task.id), 'status': status} for task, status in zip(tasks, new_statuses)]
+
+        result, published = self._execute(UPDATE_TASKS, input=items)
+
+        assert result.data['updateTasks']['errors'] == []
+        for task, status in zip(tasks, new_statuses):
+            task.refresh_from_db()
+            assert task.status == status
+        task_events = self._by_type(published, 'tasks_updated')
+        assert len(task_events) == len({task.project_id for task in tasks})
+        assert sum(len(message['tasks']) for group, message in task_events) == len(tasks)
+        [(group, activity)] = self._by_type(published, 'organization_activity')
+        assert [a['task']['status'] for a in activity['activities']] == new_statuses
+
+    def test_update_tasks_rejects_unknown_ids(self):
+        """An unknown id shall reject the batch and leave other tasks untouched."""
+        task = Task.objects.create(project=Project.objects.create(organization=_org(), name="P"), title="T")
+        items = [{'id': str(task.id), 'title': "Renamed"}, {'id': str(uuid.uuid4()), 'title': "Ghost"}]
+
+        result, published = self._execute(UPDATE_TASKS, input=items)
+
+        assert [e['field'] for e in result.data['updateTasks']['errors']] == ['input.1.id']
+        task.refresh_from_db()
+        assert task.title == "T"
+        assert published == []
+
+    @given(num_tasks=st.integers(min_value=1, max_value=5))
+    @settings(max_examples=20, deadline=None)
+    def test_move_tasks_notifies_both_boards(self, num_tasks):
+        """
+        **Feature: project-management-system, Property 20: All-or-Nothing Bulk Task Writes**
+        **Validates: Requirements 6.3, 13.1**
+
+        For any tasks moved to another project of the same organization, the
+        tasks shall change project and both boards shall be notified.
+        """
+        organization = _org()
+        source = Project.objects.create(organization=organization, name="Source")
+        target = Project.objects.create(organization=organization, name="Target")
+        tasks = [Task.objects.create(project=source, title=f"T{i}") for i in range(num_tasks)]
+
+        result, published = self._execute(MOVE_TASKS, ids=[str(t.id) for t in tasks], projectId=str(target.id))
+
+        assert result.data['moveTasks']['errors'] == []
+        assert Task.objects.filter(project=target, organization=organization).count() == num_tasks
+        assert sorted(group for group, message in self._by_type(published, 'tasks_updated')) == sorted(
+            [f'project_{source.id}_tasks', f'project_{target.id}_tasks']
+        )
+        assert [group for group, message in self._by_type(published, 'organization_activity')] == [
+            f'organization_{organization.id}_activity'
+        ]
+
+    def test_move_tasks_rejects_another_organization(self):
+        """Moving a task into another organization's project shall write nothing."""
+        source = Project.objects.create(organization=_org(), name="Source")
+        target = Project.objects.create(organization=_org(), name="Target")
+        own = Task.objects.create(project=target, title="Own")
+        foreign = Task.objects.create(project=source, title="Foreign")
+        TaskComment.objects.create(task=foreign, content="C", author_email="a@example.com")
+
+        result, published = self._execute(
+            MOVE_TASKS, ids=[str(own.id), str(foreign.id)], projectId=str(target.id)
+        )
+
+        assert result.data['moveTasks']['tasks'] is None
+        assert [e['field'] for e in result.data['moveTasks']['errors']] == ['ids.1']
+        foreign.refresh_from_db()
+        assert (foreign.project_id, foreign.organization_id) == (source.id, source.organization_id)
+        assert TaskComment.objects.for_organization(organization_id=source.organization_id).count() == 1
+        assert published == []
+
+    def test_batch_size_is_limited(self):
+        """Batches over MAX_BULK_TASKS shall be rejected before any query."""
+        from core.mutations import MAX_BULK_TASKS
+
+        items = [{'projectId': str(uuid.uuid4()), 'title': "T"}] * (MAX_BULK_TASKS + 1)
+        with CaptureQueriesContext(connection) as ctx:
+            result, _ = self._execute(CREATE_TASKS, input=items)
+
+        assert [e['field'] for e in result.data['createTasks']['errors']] == ['input']
+        assert len(ctx.captured_queries) == 0
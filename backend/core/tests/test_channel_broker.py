@@ -0,0 +1,154 @@
+"""
+Tests for cross-process subscription delivery through the local broker.
+
+**Feature: project-management-system, Property 18: Cross-Process Fan-Out**
+**Validates: Requirements 13.1**
+
+For any task update broadcast from one worker process, subscribers held by
+another worker process shall receive it through the shared channel layer.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+import pytest
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from core.broadcast import event_log
+from core.channel_broker import SocketChannelLayer
+from core.consumers import GraphQLSubscriptionConsumer
+
+BROADCAST_SCRIPT = """
+import sys, django
+django.setup()
+from core.models import Task, TaskStatus
+from core.broadcast import dispatcher
+from core.mutations import broadcast_task_update
+task = Task(title=sys.argv[2], status=TaskStatus.IN_PROGRESS)
+broadcast_task_update(sys.argv[1], task)
+assert dispatcher.flush(timeout=10)
+"""
+
+
+class TestSocketChannelLayer(SimpleTestCase):
+    """Deliver broadcasts between processes through run_channel_broker."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmpdir.name, 'channels.sock')
+        self.broker = subprocess.Popen(
+            [sys.executable, 'manage.py', 'run_channel_broker', '--socket', self.socket_path],
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 10
+        while not os.path.exists(self.socket_path):
+            assert time.monotonic() < deadline, 'broker did not start'
+            assert self.broker.poll() is None, 'broker exited'
+            time.sleep(0.05)
+
+    def tearDown(self):
+        self.broker.terminate()
+        self.broker.wait(timeout=10)
+        self.tmpdir.cleanup()
+
+    async def _broadcast_from_other_process(self, project_id, title):
+        """Run broadcast_task_update in a separate worker process."""
+        env = dict(os.environ, CHANNEL_LAYER='socket', CHANNEL_BROKER_SOCKET=self.socket_path)
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, '-c', BROADCAST_SCRIPT, project_id, title,
+            cwd=settings.BASE_DIR, env=env,
+        )
+        assert await process.wait() == 0
+
+    async def test_group_send_reaches_other_process(self):
+        layer = SocketChannelLayer(path=self.socket_path)
+        project_id = str(uuid.uuid4())
+        channel = await layer.new_channel()
+        await layer.group_add(f'project_{project_id}_tasks', channel)
+
+        await self._broadcast_from_other_process(project_id, 'Cross process')
+
+        message = await asyncio.wait_for(layer.receive(channel), timeout=10)
+        assert message['type'] == 'subscription_update'
+        assert message['data']['taskUpdated']['title'] == 'Cross process'
+
+    async def test_send_before_receive_is_buffered(self):
+        layer = SocketChannelLayer(path=self.socket_path)
+        await layer.send('buffered-channel', {'type': 'hello'})
+        message = await asyncio.wait_for(layer.receive('buffered-channel'), timeout=10)
+        assert message == {'type': 'hello'}
+
+    async def test_subscriber_receives_update_from_other_worker(self):
+        layers = {
+            'default': {
+                'BACKEND': 'core.channel_broker.SocketChannelLayer',
+                'CONFIG': {'path': self.socket_path},
+            },
+        }
+        project_id = str(uuid.uuid4())
+        with override_settings(CHANNEL_LAYERS=layers):
+            communicator = WebsocketCommunicator(GraphQLSubscriptionConsumer.as_asgi(), '/graphql/')
+            connected, _ = await communicator.connect()
+            assert connected
+            await communicator.send_json_to({'type': 'connection_init'})
+            assert (await communicator.receive_json_from())['type'] == 'connection_ack'
+            await communicator.send_json_to({
+                'id': '1',
+                'type': 'subscribe',
+                'payload': {
+                    'query': 'subscription ($projectId: ID!) { taskUpdated(projectId: $projectId) { id title } }',
+                    'variables': {'projectId': project_id},
+                },
+            })
+            assert await communicator.receive_nothing(timeout=0.3)
+
+            await self._broadcast_from_other_process(project_id, 'Seen by socket')
+
+            response = await communicator.receive_json_from(timeout=10)
+            assert response['type'] == 'next'
+            assert response['payload']['data']['taskUpdated']['title'] == 'Seen by socket'
+            await communicator.disconnect()
+
+    async def test_resume_across_workers_asks_to_refetch(self):
+        """A cursor is never resumed from one worker's log while others publish to the group."""
+        layers = {
+            'default': {
+                'BACKEND': 'core.channel_broker.SocketChannelLayer',
+                'CONFIG': {'path': self.socket_path},
+            },
+        }
+        project_id = str(uuid.uuid4())
+        group = f'project_{project_id}_tasks'
+        # The last event the client saw came from this worker
+        cursor = event_log.cursor(event_log.append(group, {'type': 'subscription_update'}))
+        # Published by another worker while the client was away
+        await self._broadcast_from_other_process(project_id, 'Missed')
+
+        with override_settings(CHANNEL_LAYERS=layers):
+            communicator = WebsocketCommunicator(GraphQLSubscriptionConsumer.as_asgi(), '/graphql/')
+            await communicator.connect()
+            await communicator.send_json_to({
+                'id': '1',
+                'type': 'subscribe',
+                'payload': {
+                    'query': 'subscription ($p: ID!, $since: String) '
+                             '{ taskUpdated(projectId: $p, since: $since) { title } }',
+                    'variables': {'p': project_id, 'since': cursor},
+                },
+            })
+            refetch = await communicator.receive_json_from(timeout=10)
+            assert refetch['payload']['errors'][0]['extensions']['code'] == 'RESUME_UNAVAILABLE'
+
+            await self._broadcast_from_other_process(project_id, 'Live')
+
+            response = await communicator.receive_json_from(timeout=10)
+            assert response['payload']['data']['taskUpdated']['title'] == 'Live'
+            # The publisher's cursor, not one relabelled with this worker's epoch
+            assert not response['payload']['extensions']['cursor'].startswith(f'{event_log.epoch}:')
+            await communicator.disconnect()
@@ -0,0 +1,125 @@
+"""
+Property-based tests for the GraphQL depth and cost limits.
+
+**Feature: project-management-system, Property 27: Bounded Operation Cost**
+**Validates: Requirements 13.3**
+
+For any operation, the estimated cost shall grow with every list it nests
+and the page sizes it asks for; operations over the budget or the depth
+limit shall be rejected before any resolver runs, and every executed
+operation shall report its cost in the response extensions.
+"""
+import json
+from unittest import mock
+import pytest
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.core.cache import caches
+from django.test import RequestFactory, override_settings
+from graphql import parse
+from core.complexity import DEFAULT_LIST_SIZE, analyze_cost, estimate_cost
+from core.models import Organization, Project
+from core.pagination import MAX_PAGE_SIZE
+from core.schema import schema
+from core.views import PersistedQueryView
+
+TASKS = """
+query ($id: ID!, $first: Int) {
+  tasks(projectId: $id, first: $first) {
+    edges { node { id title comments(first: 2) { id content } } }
+    pageInfo { hasNextPage }
+  }
+}
+"""
+
+
+def _cost(query, **variables):
+    document = parse(query)
+    return estimate_cost(schema.graphql_schema, document, document.definitions[0], variables)
+
+
+def _nested(levels):
+    """Build comments { task { comments { ... } } } nested levels times under one task."""
+    selection = 'id'
+    for _ in range(levels):
+        selection = f'comments {{ task {{ {selection} }} }}'
+    return f'{{ task(id: "00000000-0000-0000-0000-000000000000") {{ {selection} }} }}'
+
+
+class TestQueryCost(TestCase):
+    """Tests for core.complexity and its use in PersistedQueryView."""
+
+    def _post(self, query, **variables):
+        request = RequestFactory().post(
+            '/graphql/', data=json.dumps({'query': query, 'variables': variables}),
+            content_type='application/json',
+        )
+        request.organization_slug = None
+        response = PersistedQueryView.as_view()(request)
+        return response.status_code, json.loads(response.content)
+
+    @given(first=st.integers(min_value=1, max_value=2 * MAX_PAGE_SIZE))
+    @settings(max_examples=50, deadline=None)
+    def test_cost_scales_with_page_size(self, first):
+        """
+        **Feature: project-management-system, Property 27: Bounded Operation Cost**
+        **Validates: Requirements 13.3**
+
+        For any page size, a connection shall be charged per edge for every
+        field below it, with `first` capped at the page size limit.
+        """
+        page = min(first, MAX_PAGE_SIZE)
+        # tasks, edges, pageInfo, hasNextPage; per edge: node, id, title,
+        # comments and two comments of id and content
+        assert _cost(TASKS, id='x', first=first) == 4 + page * (4 + 2 * 2)
+
+    @given(levels=st.integers(min_value=1, max_value=4))
+    @settings(max_examples=20, deadline=None)
+    def test_each_nested_list_multiplies_cost(self, levels):
+        """
+        **Feature: project-management-system, Property 27: Bounded Operation Cost**
+        **Validates: Requirements 13.3**
+
+        For any nesting of lists without `first`, each level shall multiply
+        the cost below it by DEFAULT_LIST_SIZE.
+        """
+        assert _cost(_nested(levels + 1)) > _cost(_nested(levels)) * DEFAULT_LIST_SIZE
+
+    def test_fragments_and_introspection(self):
+        fragment = """
+        query { projects(organizationSlug: "a", first: 10) { edges { node { ...P } } } }
+        fragment P on ProjectType { id name }
+        """
+        inline = 'query { projects(organizationSlug: "a", first: 10) { edges { node { id name } } } }'
+        assert _cost(fragment) == _cost(inline)
+        assert _cost('{ __schema { types { name fields { name } } } }') == 0
+
+    def test_over_budget_is_rejected_before_execution(self):
+        with mock.patch('core.views.execute') as execute:
+            status, body = self._post(_nested(4))
+        execute.assert_not_called()
+        assert status == 400
+        assert body['errors'][0]['extensions']['code'] == 'QUERY_TOO_COMPLEX'
+        assert body['extensions']['cost']['requested'] > body['extensions']['cost']['maximum']
+
+    def test_cost_is_reported_for_executed_operations(self):
+        caches['graphql'].clear()
+        org = Organization.objects.create(name="Org", slug="cost", contact_email="o@example.com")
+        project = Project.objects.create(organization=org, name="P")
+
+        status, body = self._post(TASKS, id=str(project.id), first=20)
+
+        assert status == 200
+        assert body['data']['tasks']['edges'] == []
+        assert body['extensions']['cost']['requested'] == _cost(TASKS, id='x', first=20)
+
+    @override_settings(GRAPHQL_MAX_COST=None)
+    def test_depth_limit(self):
+        status, body = self._post(_nested(5))
+        assert status == 400
+        assert 'exceeds maximum operation depth' in body['errors'][0]['message']
+
+    def test_budget_is_optional(self):
+        document = parse(_nested(4))
+        query_cost = analyze_cost(schema.graphql_schema, document, document.definitions[0])
+        assert not query_cost.exceeded
@@ -0,0 +1,66 @@
+"""
+Property-based tests for the denormalized task and comment organization.
+
+**Feature: project-management-system, Property 15: Denormalized Tenant Consistency**
+**Validates: Requirements 6.3, 6.4**
+
+For any task or comment, its stored organization shall equal the organization
+of its project, including after the task moves to another project, and tenant
+filters shall not join through the project hierarchy.
+"""
+import uuid
+import pytest
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from core.models import Organization, Project, Task, TaskComment
+
+
+def _org():
+    slug = f"org-{uuid.uuid4().hex[:8]}"
+    return Organization.objects.create(name="Org", slug=slug, contact_email="org@example.com")
+
+
+class TestDenormalizedOrganization(TestCase):
+    """Property-based tests for organization denormalization."""
+
+    @given(
+        num_tasks=st.integers(min_value=1, max_value=4),
+        comments_per_task=st.integers(min_value=0, max_value=3),
+    )
+    @settings(max_examples=30, deadline=None)
+    def test_organization_follows_task_moves(self, num_tasks, comments_per_task):
+        """
+        **Feature: project-management-system, Property 15: Denormalized Tenant Consistency**
+        **Validates: Requirements 6.3, 6.4**
+
+        For any tasks with comments, moving them to a project in another
+        organization shall move the tasks and their comments with them.
+        """
+        source, target = _org(), _org()
+        source_project = Project.objects.create(organization=source, name="Source")
+        target_project = Project.objects.create(organization=target, name="Target")
+        for i in range(num_tasks):
+            task = Task.objects.create(project=source_project, title=f"Task {i}")
+            for j in range(comments_per_task):
+                TaskComment.objects.create(task=task, content=f"C{j}", author_email="a@example.com")
+
+        assert Task.objects.for_organization(source.slug).count() == num_tasks
+        assert TaskComment.objects.for_organization(source.slug).count() == num_tasks * comments_per_task
+
+        for task in Task.objects.for_project(source_project.id):
+            task.project_id = target_project.id
+            task.save()
+
+        assert Task.objects.for_organization(source.slug).count() == 0
+        assert TaskComment.objects.for_organization(source.slug).count() == 0
+        assert Task.objects.for_organization(target.slug).count() == num_tasks
+        assert TaskComment.objects.for_organization(target.slug).count() == num_tasks * comments_per_task
+
+    def test_tenant_filters_skip_project_join(self):
+        """Tenant filters on tasks and comments shall not join core_project."""
+        org = _org()
+        task_sql = str(Task.objects.for_organization(org.slug).query)
+        comment_sql = str(TaskComment.objects.for_organization(org.slug).query)
+        assert 'core_project' not in task_sql
+        assert 'core_project' not in comment_sql
+        assert 'core_task"' not in comment_sql.split('FROM', 1)[1]
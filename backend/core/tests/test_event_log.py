@@ -0,0 +1,157 @@
+"""
+Property-based tests for resuming subscriptions from the event log.
+
+**Feature: project-management-system, Property 33: Resumable Subscriptions**
+**Validates: Requirements 13.1**
+
+For any broadcasts to a group, a client resuming from the cursor of the last
+event it received shall get exactly the events it missed, in order and once,
+or be told to refetch when they are no longer retained.
+"""
+import asyncio
+import json
+import uuid
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from core.broadcast import BroadcastDispatcher, event_log
+from core.consumers import GraphQLSubscriptionConsumer
+from core.event_log import EventLog
+
+TASK_UPDATED = 'subscription ($p: ID!, $since: String) { taskUpdated(projectId: $p, since: $since) { id title } }'
+
+
+def _update(group, title):
+    return {
+        'type': 'subscription_update', 'group': group, 'event_id': uuid.uuid4().hex,
+        'data': {'taskUpdated': {'id': title, 'title': title}},
+    }
+
+
+class TestEventLog(TestCase):
+    """Tests for sequence numbering, retention and cursors of EventLog."""
+
+    @given(
+        appends=st.lists(st.sampled_from('abc'), max_size=30),
+        max_events=st.integers(min_value=1, max_value=6),
+        resume_at=st.integers(min_value=0, max_value=30),
+    )
+    @settings(max_examples=100, deadline=None)
+    def test_since_returns_exactly_the_missed_events(self, appends, max_events, resume_at):
+        """
+        **Feature: project-management-system, Property 33: Resumable Subscriptions**
+        **Validates: Requirements 13.1**
+
+        For any appends across groups and any cursor, since returns the
+        group's later events in order, or None if any were pushed out.
+        """
+        log = EventLog(max_events=max_events)
+        history = []
+        for index, group in enumerate(appends):
+            seq = log.append(group, {'n': index})
+            assert not history or seq > history[-1][1]
+            history.append((group, seq, index))
+        resume_at = min(resume_at, len(history))
+
+        for group in 'abc':
+            events = [(seq, {'n': n}) for g, seq, n in history if g == group]
+            missed = [(seq, message) for seq, message in events if seq > resume_at]
+            retained = events[-max_events:]
+            result = log.since(group, log.cursor(resume_at))
+            if len(missed) > len(retained):
+                assert result is None
+            else:
+                assert result == missed
+
+    def test_cursors_from_another_log_or_the_future_cannot_resume(self):
+        log = EventLog()
+        seq = log.append('g', {})
+
+        assert log.since('g', EventLog().cursor(0)) is None
+        assert log.since('g', log.cursor(seq + 1)) is None
+        assert log.since('g', 'garbage') is None
+        assert log.since('g', log.cursor(0)) == [(seq, {})]
+        assert log.metrics()['expired'] == 3
+
+    def test_evicted_groups_cannot_resume(self):
+        log = EventLog(max_groups=1)
+        first = log.append('a', {})
+        log.append('b', {})
+
+        assert log.since('a', log.cursor(first - 1)) is None
+        assert log.since('b', log.cursor(first)) is not None
+
+    def test_dispatcher_numbers_messages_as_it_sends_them(self):
+        log = EventLog()
+        dispatcher = BroadcastDispatcher(coalesce_window=0, event_log=log)
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        group = f'project_{uuid.uuid4().hex}_tasks'
+        async_to_sync(layer.group_add)(group, channel)
+        for i in range(3):
+            dispatcher.enqueue(group, {'type': 'subscription_update', 'n': i})
+        assert dispatcher.flush(timeout=5)
+
+        async def receive(count):
+            return [await asyncio.wait_for(layer.receive(channel), timeout=1) for _ in range(count)]
+        received = async_to_sync(receive)(3)
+
+        assert [m['cursor'] for m in received] == [log.cursor(seq) for seq, _ in log.since(group, log.cursor(0))]
+        assert [m['n'] for m in received] == [0, 1, 2]
+
+
+class TestResumingConsumer(TestCase):
+    """Tests for since: on GraphQLSubscriptionConsumer subscriptions."""
+
+    def _session(self, since, live=lambda seqs: ()):
+        project_id = str(uuid.uuid4())
+        group = f'project_{project_id}_tasks'
+        # Published while the client was away
+        missed = [event_log.append(group, _update(group, title)) for title in ('one', 'two', 'three')]
+        cursor = since(missed)
+
+        async def run():
+            communicator = WebsocketCommunicator(GraphQLSubscriptionConsumer.as_asgi(), '/graphql/')
+            await communicator.connect()
+            await communicator.send_to(text_data=json.dumps({
+                'id': 's', 'type': 'subscribe',
+                'payload': {'query': TASK_UPDATED, 'variables': {'p': project_id, 'since': cursor}},
+            }))
+            received = []
+            while not await communicator.receive_nothing(timeout=0.1):
+                received.append(json.loads(await communicator.receive_from()))
+            layer = get_channel_layer()
+            for live_cursor, title in live(missed):
+                await layer.group_send(group, {**_update(group, title), 'cursor': live_cursor})
+            while not await communicator.receive_nothing(timeout=0.1):
+                received.append(json.loads(await communicator.receive_from()))
+            await communicator.disconnect()
+            return received
+
+        return missed, async_to_sync(run)()
+
+    def test_resume_sends_only_missed_events_once(self):
+        """Events after the cursor are replayed in order; live copies of them are skipped."""
+        newer = event_log.cursor(10 ** 9)
+        # Another worker's log numbers its events independently
+        foreign = 'otherworker:1'
+        missed, received = self._session(
+            since=lambda seqs: event_log.cursor(seqs[0]),
+            # A live duplicate of a replayed event, another worker's event, then a new one
+            live=lambda seqs: [(event_log.cursor(seqs[2]), 'three'), (foreign, 'other'), (newer, 'four')],
+        )
+
+        assert [m['payload']['data']['taskUpdated']['title'] for m in received] == ['two', 'three', 'other', 'four']
+        assert [m['payload']['extensions']['cursor'] for m in received] == [
+            event_log.cursor(missed[1]), event_log.cursor(missed[2]), foreign, newer,
+        ]
+
+    def test_unavailable_cursor_asks_the_client_to_refetch(self):
+        _, received = self._session(since=lambda seqs: EventLog().cursor(seqs[0]))
+
+        [message] = received
+        assert message['type'] == 'next' and message['id'] == 's'
+        assert message['payload']['data'] is None
+        assert message['payload']['errors'][0]['extensions']['code'] == 'RESUME_UNAVAILABLE'
@@ -0,0 +1,143 @@
+"""
+Property-based tests for request-scoped batch loaders.
+
+**Feature: project-management-system, Property 10: Batched Task Counters**
+**Feature: project-management-system, Property 11: Batched Task Comments**
+**Validates: Requirements 13.3**
+
+For any number of projects or tasks listed in one request, nested counters
+and comments shall match the per-row data and be resolved with a constant
+number of queries.
+"""
+import uuid
+import pytest
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from core.loaders import BatchLoader
+from core.models import Organization, Project, Task, TaskComment, ProjectStatus, TaskStatus
+from core.schema import schema
+
+PROJECTS_QUERY = """
+query ($slug: String!) {
+  projects(organizationSlug: $slug) {
+    edges {
+      node {
+        id
+        taskCount
+        completedTasks
+        completionRate
+      }
+    }
+  }
+}
+"""
+
+TASKS_QUERY = """
+query ($projectId: ID!, $first: Int) {
+  tasks(projectId: $projectId) {
+    edges {
+      node {
+        id
+        comments(first: $first) {
+          id
+          createdAt
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class TestBatchedTaskCounters(TestCase):
+    """Property-based tests for DataLoader-backed project counters."""
+
+    def _execute(self, query, **variables):
+        request = RequestFactory().post('/graphql/')
+        return schema.execute(query, variable_values=variables, context_value=request)
+
+    @given(
+        task_statuses=st.lists(
+            st.lists(st.sampled_from([TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.DONE]), max_size=5),
+            min_size=1,
+            max_size=6,
+        ),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_project_counters_match_and_use_constant_queries(self, task_statuses):
+        """
+        **Feature: project-management-system, Property 10: Batched Task Counters**
+        **Validates: Requirements 13.3**
+
+        For any set of projects, counters shall be correct and the list shall
+        resolve in one query regardless of project count.
+        """
+        slug = f"org-{uuid.uuid4().hex[:8]}"
+        org = Organization.objects.create(name="Org", slug=slug, contact_email="org@example.com")
+        expected = {}
+        for i, statuses in enumerate(task_statuses):
+            project = Project.objects.create(organization=org, name=f"Project {i}", status=ProjectStatus.ACTIVE)
+            for j, status in enumerate(statuses):
+                Task.objects.create(project=project, title=f"Task {j}", status=status)
+            done = statuses.count(TaskStatus.DONE)
+            expected[str(project.id)] = (len(statuses), done)
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = self._execute(PROJECTS_QUERY, slug=slug)
+
+        assert result.errors is None
+        assert len(ctx.captured_queries) == 1
+        for item in (edge['node'] for edge in result.data['projects']['edges']):
+            total, done = expected[item['id']]
+            assert item['taskCount'] == total
+            assert item['completedTasks'] == done
+            assert item['completionRate'] == (round(done / total * 100, 1) if total else 0)
+
+
+class TestBatchedTaskComments(TestCase):
+    """Property-based tests for the task comments loader."""
+
+    def _execute(self, query, **variables):
+        request = RequestFactory().post('/graphql/')
+        return schema.execute(query, variable_values=variables, context_value=request)
+
+    @given(
+        comments_per_task=st.lists(st.integers(min_value=0, max_value=5), min_size=1, max_size=6),
+        first=st.one_of(st.none(), st.integers(min_value=1, max_value=4)),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_comments_batched_ordered_and_limited(self, comments_per_task, first):
+        """
+        **Feature: project-management-system, Property 11: Batched Task Comments**
+        **Validates: Requirements 13.3**
+
+        For any tasks and optional first limit, each task shall receive its
+        newest comments in descending created_at order with two queries total.
+        """
+        slug = f"org-{uuid.uuid4().hex[:8]}"
+        org = Organization.objects.create(name="Org", slug=slug, contact_email="org@example.com")
+        project = Project.objects.create(organization=org, name="Project")
+        expected_counts = {}
+        for i, count in enumerate(comments_per_task):
+            task = Task.objects.create(project=project, title=f"Task {i}")
+            for j in range(count):
+                TaskComment.objects.create(task=task, content=f"Comment {j}", author_email="a@example.com")
+            expected_counts[str(task.id)] = count if first is None else min(count, first)
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = self._execute(TASKS_QUERY, projectId=str(project.id), first=first)
+
+        assert result.errors is None
+        assert len(ctx.captured_queries) == 2
+        for item in (edge['node'] for edge in result.data['tasks']['edges']):
+            comments = item['comments']
+            assert len(comments) == expected_counts[item['id']]
+            created = [c['createdAt'] for c in comments]
+            assert created == sorted(created, reverse=True)
+
+    def test_loaders_must_implement_batch_load(self):
+        with pytest.raises(TypeError):
+            BatchLoader()
@@ -0,0 +1,123 @@
+"""
+Property-based tests for the in-process GraphQL metrics.
+
+**Feature: project-management-system, Property 29: Accurate Operation Metrics**
+**Validates: Requirements 13.3**
+
+For any sequence of requests, each operation's histograms shall count every
+request once and add up its SQL statements and response bytes exactly, and
+the rendered buckets shall be cumulative.
+"""
+import json
+import re
+import uuid
+from unittest import mock
+import pytest
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.db import connection
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from core import metrics as metrics_module
+from core.metrics import COUNT_BUCKETS, Histogram, graphql_metrics
+from core.models import Organization, Project
+from core.views import PersistedQueryView
+
+OPERATIONS = {
+    'ListProjects': 'query ListProjects($slug: String!) { projects(organizationSlug: $slug) { edges { node { id name } } } }',
+    'Statistics': 'query Statistics($id: ID!) { projectStatistics(projectId: $id) { totalTasks } }',
+    None: '{ organizations { id } }',
+}
+
+
+# Without the 'graphql' cache alias every request executes and runs its SQL
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    GRAPHQL_FIELD_METRICS_SAMPLE_RATE=0,
+    GRAPHQL_TRACE_SAMPLE_RATE=0,
+)
+class TestMetrics(TestCase):
+    """Tests for core.metrics and the /metrics/ endpoint."""
+
+    def _post(self, query, **headers):
+        request = RequestFactory().post(
+            '/graphql/', data=json.dumps({'query': query, 'variables': self.variables}),
+            content_type='application/json', **headers,
+        )
+        request.organization_slug = self.variables['slug']
+        with CaptureQueriesContext(connection) as ctx:
+            response = PersistedQueryView.as_view()(request)
+        return response, len(ctx.captured_queries)
+
+    def setUp(self):
+        graphql_metrics.clear()
+        org = Organization.objects.create(name="Org", slug=f"metrics-{uuid.uuid4().hex[:8]}", contact_email="o@example.com")
+        project = Project.objects.create(organization=org, name="P")
+        self.variables = {'slug': org.slug, 'id': str(project.id)}
+
+    @given(names=st.lists(st.sampled_from(list(OPERATIONS)), min_size=1, max_size=8))
+    @settings(max_examples=20, deadline=None)
+    def test_operation_histograms_add_up(self, names):
+        """
+        **Feature: project-management-system, Property 29: Accurate Operation Metrics**
+        **Validates: Requirements 13.3**
+
+        For any sequence of operations, counts, SQL statements and response
+        sizes per operation shall equal what the requests produced.
+        """
+        graphql_metrics.clear()
+        expected = {}
+        for name in names:
+            response, queries = self._post(OPERATIONS[name])
+            label = name or 'anonymous'
+            count, sql, size = expected.get(label, (0, 0, 0))
+            expected[label] = (count + 1, sql + queries, size + len(response.content))
+
+        queries = graphql_metrics.operation_queries.snapshot()
+        sizes = graphql_metrics.response_size.snapshot()
+        durations = graphql_metrics.operation_duration.snapshot()
+        for label, (count, sql, size) in expected.items():
+            assert queries[label][1:] == (sql, count)
+            assert sizes[label][1:] == (size, count)
+            assert durations[label][2] == count
+        assert set(queries) == set(expected)
+
+    def test_sampled_requests_record_fields(self):
+        with override_settings(GRAPHQL_FIELD_METRICS_SAMPLE_RATE=1.0):
+            response, queries = self._post(OPERATIONS['Statistics'])
+        body = json.loads(response.content)
+        assert 'trace' not in body['extensions']
+        fields = graphql_metrics.field_queries.snapshot()
+        assert fields['Query.projectStatistics'][1:] == (queries, 1)
+        assert fields['ProjectStatisticsType.totalTasks'][1:] == (0, 1)
+
+    def test_label_values_are_bounded(self):
+        histogram = Histogram('h', 'help', 'operation', COUNT_BUCKETS)
+        with mock.patch.object(metrics_module, 'MAX_LABEL_VALUES', 3):
+            for i in range(10):
+                histogram.observe(f'op{i}', 1)
+        snapshot = histogram.snapshot()
+        assert set(snapshot) == {'op0', 'op1', 'op2', 'other'}
+        assert snapshot['other'][2] == 7
+
+    def test_endpoint_renders_cumulative_buckets(self):
+        self._post(OPERATIONS['ListProjects'])
+        # Through the middleware, as Prometheus scrapes: no tenant header
+        response = Client().get('/metrics/')
+        assert response.status_code == 200
+        text = response.content.decode()
+
+        assert response['Content-Type'].startswith('text/plain')
+        assert '# TYPE graphql_operation_duration_seconds histogram' in text
+        assert '# TYPE graphql_broadcast_queue_depth gauge' in text
+        assert '# TYPE graphql_broadcast_sent_total counter' in text
+        assert '# TYPE graphql_subscription_replay_expired_total counter' in text
+        assert 'graphql_document_cache_hits_total' in text
+        buckets = [
+            int(value) for value in re.findall(
+                r'^graphql_operation_sql_queries_bucket\{operation="ListProjects",le="[^"]+"\} (\d+)$',
+                text, re.M,
+            )
+        ]
+        assert len(buckets) == len(COUNT_BUCKETS) + 1
+        assert buckets == sorted(buckets) and buckets[-1] == 1
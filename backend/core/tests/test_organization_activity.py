@@ -0,0 +1,165 @@
+"""
+Property-based tests for organization-wide activity subscriptions.
+
+**Feature: project-management-system, Property 32: Filtered Organization Activity**
+**Validates: Requirements 13.1**
+
+For any organizationActivity subscription, the connection shall join one
+group per organization, and receive exactly the activities of that
+organization whose project and task status pass its filter.
+"""
+import json
+import uuid
+from unittest import mock
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.test import RequestFactory
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from core.consumers import GraphQLSubscriptionConsumer
+from core.models import Organization, Project, Task, TaskStatus
+from core.schema import schema
+from core.subscriptions import SubscriptionError, compile_subscription
+from core.tenancy import organization_cache
+
+ACTIVITY = """
+subscription ($slug: String!, $filter: ActivityFilterInput) {
+  organizationActivity(organizationSlug: $slug, filter: $filter) {
+    kind projectId task { id status } comment { content }
+  }
+}
+"""
+
+PROJECT_IDS = [str(uuid.uuid4()) for _ in range(4)]
+
+statuses = st.sampled_from([s.value for s in TaskStatus])
+
+
+def _activity(project_id, status, kind='TASK_UPDATED'):
+    return {
+        'kind': kind,
+        'projectId': project_id,
+        'task': {'id': str(uuid.uuid4()), 'title': 'T', 'status': status},
+        'comment': {'id': str(uuid.uuid4()), 'content': 'C'} if kind == 'COMMENT_ADDED' else None,
+    }
+
+
+def _org():
+    slug = f"org-{uuid.uuid4().hex[:8]}"
+    return Organization.objects.create(name="Org", slug=slug, contact_email="org@example.com")
+
+
+class TestOrganizationActivity(TestCase):
+    """Tests for compiling, filtering and broadcasting organizationActivity."""
+
+    @given(
+        activities=st.lists(
+            st.tuples(st.sampled_from(PROJECT_IDS), statuses, st.sampled_from(['TASK_UPDATED', 'COMMENT_ADDED'])),
+            max_size=20,
+        ),
+        project_ids=st.none() | st.lists(st.sampled_from(PROJECT_IDS), unique=True),
+        wanted=st.none() | st.lists(statuses, unique=True),
+    )
+    @settings(max_examples=100, deadline=None)
+    def test_filter_accepts_exactly_matching_activity(self, activities, project_ids, wanted):
+        """
+        **Feature: project-management-system, Property 32: Filtered Organization Activity**
+        **Validates: Requirements 13.1**
+
+        For any activities and filter, a subscription accepts exactly the
+        activities in its projects whose task has one of its statuses.
+        """
+        org = _org()
+        compiled = compile_subscription(schema.graphql_schema, ACTIVITY, {
+            'slug': org.slug, 'filter': {'projectIds': project_ids, 'statuses': wanted},
+        })
+
+        assert compiled.group == f'organization_{org.id}_activity'
+        for project_id, status, kind in activities:
+            data = {'organizationActivity': _activity(project_id, status, kind)}
+            expected = (project_ids is None or project_id in project_ids) and (wanted is None or status in wanted)
+            assert compiled.accepts(data) == expected
+            if expected:
+                projected = compiled.project(data)['organizationActivity']
+                assert set(projected) == {'kind', 'projectId', 'task', 'comment'}
+                assert set(projected['task']) == {'id', 'status'}
+
+    def test_unknown_organization_and_bad_filters_are_rejected(self):
+        org = _org()
+        invalid = [
+            {'slug': 'no-such-org'},
+            {'slug': org.slug, 'filter': {'statuses': ['SOMEDAY']}},
+            {'slug': org.slug, 'filter': {'projectIds': ['not-a-uuid']}},
+        ]
+        for variables in invalid:
+            with self.assertRaises(SubscriptionError):
+                compile_subscription(schema.graphql_schema, ACTIVITY, variables)
+
+    def test_task_and_comment_mutations_publish_to_the_organization(self):
+        """Each task change and comment is published once to the organization's group."""
+        org = _org()
+        project = Project.objects.create(organization=org, name="P")
+        task = Task.objects.create(project=project, title="T")
+        request = RequestFactory().post('/graphql/')
+
+        with mock.patch('core.mutations.dispatcher') as dispatcher, \
+                self.captureOnCommitCallbacks(execute=True):
+            schema.execute(
+                'mutation ($id: ID!) { updateTask(id: $id, input: {status: "DONE"}) { errors { message } } }',
+                variable_values={'id': str(task.id)}, context_value=request,
+            )
+            schema.execute(
+                'mutation ($id: ID!) { createComment(input: {taskId: $id, content: "Hi", '
+                'authorEmail: "a@example.com"}) { errors { message } } }',
+                variable_values={'id': str(task.id)}, context_value=request,
+            )
+
+        activity = [
+            call.args for call in dispatcher.publish.call_args_list
+            if call.args[1]['type'] == 'organization_activity'
+        ]
+        assert [group for group, message in activity] == [f'organization_{org.id}_activity'] * 2
+        [updated], [commented] = (message['activities'] for group, message in activity)
+        assert (updated['kind'], updated['task']['status']) == ('TASK_UPDATED', 'DONE')
+        assert (commented['kind'], commented['comment']['content']) == ('COMMENT_ADDED', 'Hi')
+        assert commented['projectId'] == str(project.id)
+
+    def test_consumer_joins_one_group_and_filters(self):
+        """A dashboard subscription joins one group and gets only its projects' activity."""
+        organization_id = uuid.uuid4()
+        slug = f"org-{uuid.uuid4().hex[:8]}"
+        # Resolve the slug from the cache; the consumer's thread has its own connection
+        organization_cache.set(slug, organization_id)
+        group = f'organization_{organization_id}_activity'
+        watched, other = PROJECT_IDS[:2], PROJECT_IDS[2]
+        activities = [
+            _activity(watched[0], 'TODO'),
+            _activity(other, 'TODO'),
+            _activity(watched[1], 'DONE', kind='COMMENT_ADDED'),
+        ]
+
+        async def run():
+            communicator = WebsocketCommunicator(GraphQLSubscriptionConsumer.as_asgi(), '/graphql/')
+            await communicator.connect()
+            await communicator.send_to(text_data=json.dumps({
+                'id': 'dash', 'type': 'subscribe',
+                'payload': {'query': ACTIVITY, 'variables': {'slug': slug, 'filter': {'projectIds': watched}}},
+            }))
+            await communicator.receive_nothing(timeout=0.2)
+            layer = get_channel_layer()
+            await layer.group_send(group, {
+                'type': 'organization_activity', 'group': group,
+                'event_id': uuid.uuid4().hex, 'activities': activities,
+            })
+            received = []
+            while not await communicator.receive_nothing(timeout=0.1):
+                received.append(json.loads(await communicator.receive_from()))
+            await communicator.disconnect()
+            return received
+
+        received = async_to_sync(run)()
+
+        assert [message['id'] for message in received] == ['dash', 'dash']
+        assert [m['payload']['data']['organizationActivity']['projectId'] for m in received] == watched
+        assert received[1]['payload']['data']['organizationActivity']['comment'] == {'content': 'C'}
@@ -0,0 +1,143 @@
+"""
+Property-based tests for per-connection outbound queues.
+
+**Feature: project-management-system, Property 31: Bounded, Coalesced Outbound Frames**
+**Validates: Requirements 13.1**
+
+For any burst of frames to a connection that is not reading, the connection
+shall hold at most its queue size, send only the latest frame per key, count
+what was coalesced and dropped, and be closed if it stays saturated.
+"""
+import asyncio
+from asgiref.sync import async_to_sync
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from core.metrics import render_metrics
+from core.outbound import OutboundQueue, OutboundStats
+
+
+class _Client:
+    """A connection whose sends block until released."""
+
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+        self.released = asyncio.Event()
+
+    async def send(self, frame):
+        await self.released.wait()
+        self.sent.append(frame)
+
+    async def close(self):
+        self.closed = True
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestOutboundQueue(TestCase):
+    """Tests for coalescing, bounding and saturation of OutboundQueue."""
+
+    @given(
+        updates=st.lists(st.tuples(st.sampled_from('abcdef'), st.integers(0, 100)), max_size=40),
+        max_size=st.integers(min_value=1, max_value=8),
+    )
+    @settings(max_examples=100, deadline=None)
+    def test_pending_frames_are_coalesced_and_bounded(self, updates, max_size):
+        """
+        **Feature: project-management-system, Property 31: Bounded, Coalesced Outbound Frames**
+        **Validates: Requirements 13.1**
+
+        For any burst of keyed frames while the client is blocked, each
+        queued key is sent once with its latest frame, in first-queued order.
+        """
+        async def run():
+            client, stats = _Client(), OutboundStats()
+            queue = OutboundQueue(client.send, client.close, max_size=max_size,
+                                  saturation_timeout=60, stats=stats)
+            queue.start()
+            # The writer takes one frame and blocks on it
+            queue.put('first')
+            await _settle()
+
+            expected = {}
+            for key, version in updates:
+                queued = queue.put(f'{key}{version}', key)
+                if queued:
+                    expected[key] = f'{key}{version}'
+                assert len(queue) <= max_size
+            client.released.set()
+            await _settle()
+            queue.stop()
+            return client.sent, expected, stats.metrics()
+
+        sent, expected, metrics = async_to_sync(run)()
+
+        assert sent == ['first', *expected.values()]
+        assert metrics['enqueued'] == len(updates) + 1
+        assert metrics['sent'] == len(sent)
+        assert metrics['coalesced'] + metrics['dropped'] + metrics['sent'] == metrics['enqueued']
+        assert metrics['queue_depth'] == 0
+
+    def test_saturated_client_is_closed(self):
+        """A client whose queue stays full past the timeout is closed and its frames dropped."""
+        async def run():
+            client, stats = _Client(), OutboundStats()
+            queue = OutboundQueue(client.send, client.close, max_size=2,
+                                  saturation_timeout=0, stats=stats)
+            queue.start()
+            for i in range(4):
+                queue.put(str(i))
+                await _settle()
+            assert not client.closed
+            queue.put('overflow')
+            await _settle()
+            return client, queue, stats.metrics()
+
+        client, queue, metrics = async_to_sync(run)()
+
+        assert client.closed
+        assert queue.closed and len(queue) == 0
+        assert metrics['disconnected'] == 1
+        assert metrics['dropped'] == 2
+        assert metrics['queue_depth'] == 0
+
+    def test_draining_resets_saturation(self):
+        """A client that catches up is not closed for an earlier full queue."""
+        async def run():
+            client, stats = _Client(), OutboundStats()
+            queue = OutboundQueue(client.send, client.close, max_size=2,
+                                  saturation_timeout=0, stats=stats)
+            queue.start()
+            # Full once: the third frame is dropped and saturation starts
+            for i in range(3):
+                queue.put(str(i))
+            client.released.set()
+            await _settle()
+            client.released.clear()
+            queue.put('a')
+            await _settle()
+            # Full again, which would close the client had draining not reset it
+            for frame in ('b', 'c', 'd'):
+                queue.put(frame)
+            await _settle()
+            closed = client.closed
+            client.released.set()
+            await _settle()
+            queue.stop()
+            return client, closed
+
+        client, closed = async_to_sync(run)()
+
+        assert not closed
+        assert client.sent == ['0', '1', 'a', 'b', 'c']
+
+    def test_metrics_endpoint_reports_outbound_queues(self):
+        text = render_metrics()
+
+        assert '# TYPE graphql_subscription_outbound_queue_depth gauge' in text
+        for name in ('coalesced', 'dropped', 'disconnected'):
+            assert f'# TYPE graphql_subscription_outbound_{name}_total counter' in text
+            assert f'graphql_subscription_outbound_{name}_total ' in text
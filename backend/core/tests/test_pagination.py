@@ -0,0 +1,142 @@
+"""
+Property-based tests for keyset pagination.
+
+**Feature: project-management-system, Property 13: Cursor Pagination Completeness**
+**Validates: Requirements 13.4**
+
+For any page size, walking a connection with first/after shall return every
+row exactly once, newest first, and report hasNextPage correctly.
+"""
+import uuid
+import pytest
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.test import RequestFactory
+from core.models import Organization, Project, Task, TaskComment
+from core.schema import schema
+
+PROJECTS_PAGE = """
+query ($slug: String!, $first: Int, $after: String) {
+  projects(organizationSlug: $slug, first: $first, after: $after) {
+    edges { cursor node { id createdAt } }
+    pageInfo { hasNextPage hasPreviousPage endCursor }
+  }
+}
+"""
+
+TASKS_PAGE = """
+query ($projectId: ID!, $first: Int, $after: String) {
+  tasks(projectId: $projectId, first: $first, after: $after) {
+    edges { node { id } }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+COMMENTS_PAGE = """
+query ($taskId: ID!, $first: Int, $after: String) {
+  comments(taskId: $taskId, first: $first, after: $after) {
+    edges { node { id } }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+
+class TestCursorPagination(TestCase):
+    """Property-based tests for Relay-style keyset connections."""
+
+    def _execute(self, query, **variables):
+        request = RequestFactory().post('/graphql/')
+        return schema.execute(query, variable_values=variables, context_value=request)
+
+    def _walk(self, query, field, page_size, **variables):
+        """Follow endCursor until hasNextPage is false; return ids per page."""
+        pages = []
+        after = None
+        while True:
+            result = self._execute(query, first=page_size, after=after, **variables)
+            assert result.errors is None
+            connection = result.data[field]
+            pages.append([edge['node']['id'] for edge in connection['edges']])
+            if not connection['pageInfo']['hasNextPage']:
+                return pages
+            after = connection['pageInfo']['endCursor']
+
+    @given(
+        num_projects=st.integers(min_value=0, max_value=12),
+        page_size=st.integers(min_value=1, max_value=5),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_project_pages_cover_all_rows_once(self, num_projects, page_size):
+        """
+        **Feature: project-management-system, Property 13: Cursor Pagination Completeness**
+        **Validates: Requirements 13.4**
+
+        For any page size, paging through projects shall yield each project
+        exactly once in created_at descending order.
+        """
+        slug = f"org-{uuid.uuid4().hex[:8]}"
+        org = Organization.objects.create(name="Org", slug=slug, contact_email="org@example.com")
+        for i in range(num_projects):
+            Project.objects.create(organization=org, name=f"Project {i}")
+        expected = [
+            str(pk) for pk in
+            Project.objects.for_organization(slug).order_by('-created_at', '-id').values_list('id', flat=True)
+        ]
+
+        pages = self._walk(PROJECTS_PAGE, 'projects', page_size, slug=slug)
+
+        assert [pk for page in pages for pk in page] == expected
+        assert all(len(page) == page_size for page in pages[:-1])
+
+    @given(
+        num_tasks=st.integers(min_value=0, max_value=10),
+        num_comments=st.integers(min_value=0, max_value=10),
+        page_size=st.integers(min_value=1, max_value=4),
+    )
+    @settings(max_examples=30, deadline=None)
+    def test_task_and_comment_pages_cover_all_rows_once(self, num_tasks, num_comments, page_size):
+        """
+        **Feature: project-management-system, Property 13: Cursor Pagination Completeness**
+        **Validates: Requirements 13.4**
+
+        For any page size, paging through tasks and comments shall yield each
+        row exactly once.
+        """
+        org = Organization.objects.create(
+            name="Org", slug=f"org-{uuid.uuid4().hex[:8]}", contact_email="org@example.com"
+        )
+        project = Project.objects.create(organization=org, name="Project")
+        tasks = [Task.objects.create(project=project, title=f"Task {i}") for i in range(num_tasks)]
+        task = Task.objects.create(project=project, title="Commented")
+        comments = [
+            TaskComment.objects.create(task=task, content=f"C{i}", author_email="a@example.com")
+            for i in range(num_comments)
+        ]
+
+        task_pages = self._walk(TASKS_PAGE, 'tasks', page_size, projectId=str(project.id))
+        comment_pages = self._walk(COMMENTS_PAGE, 'comments', page_size, taskId=str(task.id))
+
+        task_ids = [pk for page in task_pages for pk in page]
+        comment_ids = [pk for page in comment_pages for pk in page]
+        assert sorted(task_ids) == sorted(str(t.id) for t in tasks + [task])
+        assert len(task_ids) == len(set(task_ids))
+        assert sorted(comment_ids) == sorted(str(c.id) for c in comments)
+        assert len(comment_ids) == len(set(comment_ids))
+
+    def test_page_size_is_capped_and_cursor_validated(self):
+        """Oversized pages are capped and malformed cursors are rejected."""
+        from core.pagination import MAX_PAGE_SIZE
+
+        org = Organization.objects.create(name="Org", slug="capped", contact_email="org@example.com")
+        Project.objects.create(organization=org, name="Project")
+
+        result = self._execute(PROJECTS_PAGE, slug="capped", first=MAX_PAGE_SIZE * 10)
+        assert result.errors is None
+        assert len(result.data['projects']['edges']) == 1
+        assert result.data['projects']['pageInfo']['hasPreviousPage'] is False
+
+        result = self._execute(PROJECTS_PAGE, slug="capped", after="not-a-cursor")
+        assert result.errors is not None
+        assert 'Invalid cursor' in result.errors[0].message
@@ -0,0 +1,118 @@
+"""
+Tests for automatic persisted queries.
+
+**Feature: project-management-system, Property 24: Persisted Query Equivalence**
+**Validates: Requirements 13.3**
+
+For any query, executing it by hash after registration shall return the same
+result as sending the full text, without parsing or validating it again.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+import pytest
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.core.management import call_command
+from django.test import RequestFactory, override_settings
+from core.models import Organization
+from core.persisted_queries import document_cache, load_allowlist
+from core.views import PersistedQueryView
+
+ORGS_QUERY = 'query Orgs { organizations { slug name } }'
+
+
+def _sha(query):
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+def _extensions(query):
+    return {'persistedQuery': {'version': 1, 'sha256Hash': _sha(query)}}
+
+
+class TestPersistedQueries(TestCase):
+    """Tests for PersistedQueryView and the document cache."""
+
+    def setUp(self):
+        document_cache.clear()
+
+    def _post(self, **body):
+        request = RequestFactory().post('/graphql/', data=json.dumps(body), content_type='application/json')
+        return json.loads(PersistedQueryView.as_view()(request).content)
+
+    @given(names=st.lists(st.text(alphabet='abcdefgh', min_size=1, max_size=8), max_size=4, unique=True))
+    @settings(max_examples=20, deadline=None)
+    def test_hash_only_request_matches_full_query(self, names):
+        """
+        **Feature: project-management-system, Property 24: Persisted Query Equivalence**
+        **Validates: Requirements 13.3**
+
+        For any stored organizations, a hash-only request shall return what
+        the registering full-text request returned, and shall not re-parse.
+        """
+        document_cache.clear()
+        for name in names:
+            Organization.objects.create(name=name, slug=f'apq-{name}', contact_email='a@example.com')
+
+        first = self._post(query=ORGS_QUERY, extensions=_extensions(ORGS_QUERY))
+        with mock.patch('core.persisted_queries.parse') as parse_mock, mock.patch('core.persisted_queries.validate') as validate_mock:
+            second = self._post(extensions=_extensions(ORGS_QUERY))
+
+        assert 'errors' not in first
+        assert second == first
+        parse_mock.assert_not_called()
+        validate_mock.assert_not_called()
+
+    def test_unknown_hash_asks_for_the_query(self):
+        body = self._post(extensions=_extensions(ORGS_QUERY))
+        assert body['errors'][0]['message'] == 'PersistedQueryNotFound'
+        assert body['errors'][0]['extensions']['code'] == 'PERSISTED_QUERY_NOT_FOUND'
+
+    def test_mismatched_hash_is_rejected(self):
+        body = self._post(query=ORGS_QUERY, extensions=_extensions('{ organizations { id } }'))
+        assert body['errors'][0]['extensions']['code'] == 'PERSISTED_QUERY_HASH_MISMATCH'
+
+    def test_plain_queries_are_cached_too(self):
+        self._post(query=ORGS_QUERY)
+        with mock.patch('core.persisted_queries.parse') as parse_mock:
+            body = self._post(query=ORGS_QUERY)
+        assert 'errors' not in body
+        parse_mock.assert_not_called()
+
+    def test_invalid_documents_are_not_cached(self):
+        query = '{ organizations { notAField } }'
+        body = self._post(query=query, extensions=_extensions(query))
+        assert body['errors']
+        assert self._post(extensions=_extensions(query))['errors'][0]['message'] == 'PersistedQueryNotFound'
+
+    def test_allowlist_rejects_unlisted_documents(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'manifest.json')
+            with open(path, 'w') as f:
+                json.dump({'Orgs': ORGS_QUERY}, f)
+            with override_settings(PERSISTED_QUERY_ALLOWLIST=path):
+                # Formatting and Apollo's __typename fields do not matter
+                listed = 'query Orgs {\n  organizations {\n    slug\n    name\n    __typename\n  }\n}'
+                assert 'errors' not in self._post(query=listed, extensions=_extensions(listed))
+
+                other = '{ organizations { id } }'
+                body = self._post(query=other, extensions=_extensions(other))
+                assert body['errors'][0]['extensions']['code'] == 'PERSISTED_QUERY_NOT_ALLOWED'
+        load_allowlist.cache_clear()
+
+    def test_manifest_matches_frontend_documents(self):
+        """The committed manifest shall list every frontend operation, unchanged."""
+        from django.conf import settings as django_settings
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'manifest.json')
+            call_command('build_persisted_queries', output=path, stdout=io.StringIO())
+            with open(path) as f:
+                manifest = json.load(f)
+
+        assert {'GetProjects', 'GetTasks', 'CreateTask', 'UpdateTask'} <= set(manifest)
+        with open(os.path.join(django_settings.BASE_DIR, 'persisted_queries.json')) as f:
+            assert json.load(f) == manifest
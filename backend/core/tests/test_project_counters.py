@@ -0,0 +1,201 @@
+"""
+Property-based tests for the stored per-project task counters.
+
+**Feature: project-management-system, Property 26: Incremental Task Counters**
+**Validates: Requirements 13.3**
+
+For any sequence of task writes, single or bulk, each project's stored
+counters shall equal a live count of its tasks by status, and the repair
+command shall find nothing to fix.
+"""
+import uuid
+from io import StringIO
+from unittest import mock
+import pytest
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.contrib import admin
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory
+from core.managers import TaskTenantQuerySet
+from core.models import TASK_COUNTER_FIELDS, Organization, Project, Task, TaskStatus
+from core.schema import schema
+
+STATUSES = [s.value for s in TaskStatus]
+
+CREATE_TASK = """
+mutation ($projectId: ID!, $status: String) {
+  createTask(input: {projectId: $projectId, title: "T", status: $status}) { errors { message } }
+}
+"""
+
+UPDATE_TASK = """
+mutation ($id: ID!, $status: String!) {
+  updateTask(id: $id, input: {status: $status}) { errors { message } }
+}
+"""
+
+DELETE_TASK = """
+mutation ($id: ID!) { deleteTask(id: $id) { success } }
+"""
+
+CREATE_TASKS = """
+mutation ($input: [CreateTaskInput!]!) { createTasks(input: $input) { errors { message } } }
+"""
+
+UPDATE_TASKS = """
+mutation ($input: [UpdateTaskItemInput!]!) { updateTasks(input: $input) { errors { message } } }
+"""
+
+MOVE_TASKS = """
+mutation ($ids: [ID!]!, $projectId: ID!) { moveTasks(ids: $ids, projectId: $projectId) { errors { message } } }
+"""
+
+operations = st.lists(
+    st.tuples(
+        st.sampled_from(['create', 'update', 'delete', 'create_many', 'update_many', 'move', 'save_move']),
+        st.integers(min_value=0, max_value=20),
+        st.sampled_from(STATUSES),
+    ),
+    max_size=12,
+)
+
+
+def _live_counters(project):
+    counts = Task.objects.filter(project=project).status_counts()
+    return [
+        sum(counts.values()),
+        counts.get(TaskStatus.TODO, 0),
+        counts.get(TaskStatus.IN_PROGRESS, 0),
+        counts.get(TaskStatus.DONE, 0),
+    ]
+
+
+def _stored_counters(project):
+    project.refresh_from_db()
+    return [getattr(project, field) for field in TASK_COUNTER_FIELDS]
+
+
+class TestProjectCounters(TestCase):
+    """Tests for counters kept by Task.save, Task.delete, bulk deletes and the bulk mutations."""
+
+    def _execute(self, query, **variables):
+        request = RequestFactory().post('/graphql/')
+        with mock.patch('core.mutations.dispatcher'):
+            result = schema.execute(query, variable_values=variables, context_value=request)
+        assert result.errors is None
+        return result.data
+
+    @given(ops=operations)
+    @settings(max_examples=40, deadline=None)
+    def test_counters_follow_every_task_write(self, ops):
+        """
+        **Feature: project-management-system, Property 26: Incremental Task Counters**
+        **Validates: Requirements 13.3**
+
+        For any sequence of creates, status changes, moves and deletes, the
+        stored counters shall match the tasks actually in each project.
+        """
+        org = Organization.objects.create(name="Org", slug=f"org-{uuid.uuid4().hex[:8]}", contact_email="o@example.com")
+        projects = [Project.objects.create(organization=org, name=f"P{i}") for i in range(3)]
+
+        for op, pick, status in ops:
+            project = projects[pick % len(projects)]
+            task_ids = [str(pk) for pk in Task.objects.filter(organization=org).order_by('id').values_list('id', flat=True)]
+            task_id = task_ids[pick % len(task_ids)] if task_ids else None
+            if op == 'create':
+                self._execute(CREATE_TASK, projectId=str(project.id), status=status)
+            elif op == 'create_many':
+                self._execute(CREATE_TASKS, input=[
+                    {'projectId': str(p.id), 'title': 'T', 'status': STATUSES[(pick + i) % 3]}
+                    for i, p in enumerate(projects)
+                ])
+            elif task_id is None:
+                continue
+            elif op == 'update':
+                self._execute(UPDATE_TASK, id=task_id, status=status)
+            elif op == 'delete':
+                self._execute(DELETE_TASK, id=task_id)
+            elif op == 'update_many':
+                self._execute(UPDATE_TASKS, input=[{'id': pk, 'status': status} for pk in task_ids[:pick % 4 + 1]])
+            elif op == 'move':
+                self._execute(MOVE_TASKS, ids=task_ids[:pick % 4 + 1], projectId=str(project.id))
+            elif op == 'save_move':
+                task = Task.objects.get(id=task_id)
+                task.project = project
+                task.status = status
+                task.save()
+
+        for project in projects:
+            assert _stored_counters(project) == _live_counters(project)
+        assert Project.objects.filter(organization=org).recompute_task_counts() == 0
+
+    def test_project_save_keeps_concurrent_increments(self):
+        """Saving a stale project instance shall not overwrite its counters."""
+        org = Organization.objects.create(name="Org", slug="stale", contact_email="o@example.com")
+        project = Project.objects.create(organization=org, name="P")
+        Task.objects.create(project=project, title="T", status=TaskStatus.DONE)
+
+        project.name = "Renamed"
+        project.save()
+
+        assert _stored_counters(project) == [1, 0, 0, 1]
+
+    def test_repair_command_fixes_drift(self):
+        org = Organization.objects.create(name="Org", slug="drift", contact_email="o@example.com")
+        project = Project.objects.create(organization=org, name="P")
+        Task.objects.create(project=project, title="T", status=TaskStatus.IN_PROGRESS)
+        # bulk_create bypasses the counters, as a raw SQL import would
+        Task.objects.bulk_create([Task(project=project, organization=org, title="Raw", status=TaskStatus.TODO)])
+        Project.objects.filter(pk=project.pk).update(done_tasks=7)
+
+        out = StringIO()
+        call_command('recompute_project_stats', organization=['drift'], stdout=out)
+
+        assert 'repaired 1' in out.getvalue()
+        assert _stored_counters(project) == [2, 1, 1, 0]
+
+    def test_bulk_deletes_decrement_counters(self):
+        """QuerySet.delete and the admin's "delete selected" keep the counters."""
+        org = Organization.objects.create(name="Org", slug=f"org-{uuid.uuid4().hex[:8]}", contact_email="o@example.com")
+        projects = [Project.objects.create(organization=org, name=f"P{i}") for i in range(2)]
+        for project in projects:
+            for status in STATUSES * 2:
+                Task.objects.create(project=project, title="T", status=status)
+
+        Task.objects.filter(project=projects[0], status=TaskStatus.TODO).delete()
+        Task.objects.filter(organization=org, status=TaskStatus.DONE).delete()
+        selected = Task.objects.filter(project=projects[1], status=TaskStatus.TODO).first()
+        admin.site._registry[Task].delete_queryset(
+            RequestFactory().post('/admin/core/task/'), Task.objects.filter(pk=selected.pk),
+        )
+
+        for project in projects:
+            assert _stored_counters(project) == _live_counters(project)
+        assert _stored_counters(projects[0]) == [2, 0, 2, 0]
+        assert _stored_counters(projects[1]) == [3, 1, 2, 0]
+
+    def test_task_writes_lock_the_rows_they_count_from(self):
+        """Updates, moves and deletes read their tasks with select_for_update in their own transaction."""
+        org = Organization.objects.create(name="Org", slug=f"org-{uuid.uuid4().hex[:8]}", contact_email="o@example.com")
+        projects = [Project.objects.create(organization=org, name=f"P{i}") for i in range(2)]
+        task = Task.objects.create(project=projects[0], title="T")
+        outer = len(connection.atomic_blocks)
+        select_for_update = TaskTenantQuerySet.select_for_update
+        depths = []
+
+        def locking(queryset, *args, **kwargs):
+            depths.append(len(connection.atomic_blocks))
+            return select_for_update(queryset, *args, **kwargs)
+
+        with mock.patch.object(TaskTenantQuerySet, 'select_for_update', autospec=True, side_effect=locking):
+            self._execute(UPDATE_TASK, id=str(task.id), status='DONE')
+            self._execute(UPDATE_TASKS, input=[{'id': str(task.id), 'status': 'TODO'}])
+            self._execute(MOVE_TASKS, ids=[str(task.id)], projectId=str(projects[1].id))
+            self._execute(DELETE_TASK, id=str(task.id))
+
+        assert len(depths) == 4
+        assert all(depth > outer for depth in depths)
+        for project in projects:
+            assert _stored_counters(project) == [0, 0, 0, 0]
@@ -0,0 +1,130 @@
+"""
+Property-based tests for project statistics.
+
+**Feature: project-management-system, Property 12: Project Statistics Accuracy**
+**Validates: Requirements 13.3**
+
+For any set of tasks, the statistics engine shall report the same totals,
+per-status counts and completion rate as counting each status separately,
+using a single query per request.
+"""
+import uuid
+import pytest
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from core.models import Organization, Project, Task, TaskStatus
+from core.schema import schema
+
+STATUSES = [TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.DONE]
+
+BULK_QUERY = """
+query ($ids: [ID!]!) {
+  projectsStatistics(projectIds: $ids) {
+    projectId
+    totalTasks
+    completedTasks
+    inProgressTasks
+    todoTasks
+    completionRate
+  }
+}
+"""
+
+
+def _expected(statuses):
+    total = len(statuses)
+    done = statuses.count(TaskStatus.DONE)
+    return {
+        'totalTasks': total,
+        'completedTasks': done,
+        'inProgressTasks': statuses.count(TaskStatus.IN_PROGRESS),
+        'todoTasks': statuses.count(TaskStatus.TODO),
+        'completionRate': round(done / total * 100, 1) if total else 0,
+    }
+
+
+class TestProjectStatistics(TestCase):
+    """Property-based tests for the statistics engine."""
+
+    def _execute(self, query, **variables):
+        request = RequestFactory().post('/graphql/')
+        return schema.execute(query, variable_values=variables, context_value=request)
+
+    def _create_projects(self, task_statuses):
+        org = Organization.objects.create(
+            name="Org", slug=f"org-{uuid.uuid4().hex[:8]}", contact_email="org@example.com"
+        )
+        projects = []
+        for i, statuses in enumerate(task_statuses):
+            project = Project.objects.create(organization=org, name=f"Project {i}")
+            for j, status in enumerate(statuses):
+                Task.objects.create(project=project, title=f"Task {j}", status=status)
+            projects.append(project)
+        return projects
+
+    @given(statuses=st.lists(st.sampled_from(STATUSES), min_size=1, max_size=12))
+    @settings(max_examples=50, deadline=None)
+    def test_single_project_statistics_in_one_query(self, statuses):
+        """
+        **Feature: project-management-system, Property 12: Project Statistics Accuracy**
+        **Validates: Requirements 13.3**
+
+        For any non-empty project, statistics shall be exact and use one query.
+        """
+        project, = self._create_projects([statuses])
+        query = """
+        query ($id: ID!) {
+          projectStatistics(projectId: $id) {
+            totalTasks completedTasks inProgressTasks todoTasks completionRate
+          }
+        }
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            result = self._execute(query, id=str(project.id))
+
+        assert result.errors is None
+        assert len(ctx.captured_queries) == 1
+        assert result.data['projectStatistics'] == _expected(statuses)
+
+    @given(
+        task_statuses=st.lists(
+            st.lists(st.sampled_from(STATUSES), min_size=1, max_size=6), min_size=1, max_size=6
+        ),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_bulk_statistics_in_one_query(self, task_statuses):
+        """
+        **Feature: project-management-system, Property 12: Project Statistics Accuracy**
+        **Validates: Requirements 13.3**
+
+        For any set of non-empty projects, bulk statistics shall be exact,
+        follow the requested order and use one query.
+        """
+        projects = self._create_projects(task_statuses)
+        ids = [str(p.id) for p in projects]
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = self._execute(BULK_QUERY, ids=ids)
+
+        assert result.errors is None
+        assert len(ctx.captured_queries) == 1
+        items = result.data['projectsStatistics']
+        assert [item.pop('projectId') for item in items] == ids
+        assert items == [_expected(statuses) for statuses in task_statuses]
+
+    def test_empty_and_missing_projects(self):
+        """Empty projects report zeros; missing projects are omitted or null."""
+        empty, = self._create_projects([[]])
+        missing = str(uuid.uuid4())
+
+        result = self._execute(BULK_QUERY, ids=[str(empty.id), missing])
+        assert result.errors is None
+        assert result.data['projectsStatistics'] == [dict(projectId=str(empty.id), **_expected([]))]
+
+        result = self._execute(
+            'query ($id: ID!) { projectStatistics(projectId: $id) { totalTasks } }', id=missing
+        )
+        assert result.data['projectStatistics'] is None
@@ -0,0 +1,68 @@
+"""
+Tests that the resolver query shapes are served by composite indexes.
+
+**Feature: project-management-system, Property 17: Index-Served Resolver Queries**
+**Validates: Requirements 13.3, 13.4**
+
+For each list resolver's filter and keyset ordering, the query planner shall
+pick the matching composite index and shall not need a separate sort step.
+"""
+import pytest
+from django.db import connection
+from django.test import TestCase
+from core.models import Organization, Project, Task, TaskComment, ProjectStatus, TaskStatus
+
+
+class TestCompositeIndexUsage(TestCase):
+    """EXPLAIN-based checks of index usage for resolver queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name="Org", slug="idx-org", contact_email="o@example.com")
+        cls.project = Project.objects.create(organization=cls.org, name="Project")
+        cls.task = Task.objects.create(project=cls.project, title="Task")
+        TaskComment.objects.create(task=cls.task, content="C", author_email="a@example.com")
+
+    def assert_uses_index(self, queryset, index_name):
+        """Assert the planner uses index_name for both filtering and ordering."""
+        page = queryset.order_by('-created_at', '-id')[:51]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = page.explain()
+            assert index_name in plan, plan
+            assert 'Sort' not in plan, plan
+        else:
+            plan = page.explain()
+            assert f'USING INDEX {index_name}' in plan, plan
+            assert 'TEMP B-TREE' not in plan, plan
+
+    def test_projects_by_organization(self):
+        self.assert_uses_index(
+            Project.objects.for_organization(self.org.slug),
+            'project_org_created_idx',
+        )
+
+    def test_projects_by_organization_and_status(self):
+        self.assert_uses_index(
+            Project.objects.for_organization(self.org.slug).filter(status=ProjectStatus.ACTIVE),
+            'project_org_status_crtd_idx',
+        )
+
+    def test_tasks_by_project(self):
+        self.assert_uses_index(
+            Task.objects.for_project(self.project.id),
+            'task_project_created_idx',
+        )
+
+    def test_tasks_by_project_and_status(self):
+        self.assert_uses_index(
+            Task.objects.for_project(self.project.id).filter(status=TaskStatus.TODO),
+            'task_proj_status_created_idx',
+        )
+
+    def test_comments_by_task(self):
+        self.assert_uses_index(
+            TaskComment.objects.for_task(self.task.id),
+            'comment_task_created_idx',
+        )
@@ -0,0 +1,236 @@
+"""
+Property-based tests for the per-tenant GraphQL response cache.
+
+**Feature: project-management-system, Property 25: Fresh Cached Responses**
+**Validates: Requirements 6.2, 13.3**
+
+For any interleaving of mutations and reads, a query served through the
+response cache shall return exactly what executing it afresh returns, and a
+repeated read with no intervening mutation shall not touch the database.
+"""
+import json
+import os
+import tempfile
+import uuid
+from unittest import mock
+import pytest
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.core.cache import caches
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from graphql import execute
+from core.models import Organization, Project, Task
+from core.response_cache import project_tag, response_cache
+from core.schema import schema
+from core.views import PersistedQueryView
+
+DASHBOARD = """
+query ($slug: String!) {
+  projects(organizationSlug: $slug) {
+    edges { node { id name status taskCount completedTasks } }
+  }
+}
+"""
+
+STATISTICS = """
+query ($id: ID!) {
+  projectStatistics(projectId: $id) { totalTasks completedTasks todoTasks }
+}
+"""
+
+MANY_STATISTICS = """
+query ($ids: [ID!]!) { projectsStatistics(projectIds: $ids) { projectId totalTasks } }
+"""
+
+TASKS = """
+query ($id: ID!) {
+  tasks(projectId: $id) { edges { node { id title status comments { content } } } }
+}
+"""
+
+CREATE_TASK = """
+mutation ($projectId: ID!, $title: String!) {
+  createTask(input: {projectId: $projectId, title: $title}) { task { id } errors { message } }
+}
+"""
+
+UPDATE_TASK = """
+mutation ($id: ID!, $status: String!) {
+  updateTask(id: $id, input: {status: $status}) { task { id } errors { message } }
+}
+"""
+
+CREATE_PROJECT = """
+mutation ($slug: String!, $name: String!) {
+  createProject(input: {organizationSlug: $slug, name: $name}) { project { id } errors { message } }
+}
+"""
+
+DELETE_PROJECT = """
+mutation ($id: ID!) { deleteProject(id: $id) { success } }
+"""
+
+CREATE_COMMENT = """
+mutation ($taskId: ID!, $content: String!) {
+  createComment(input: {taskId: $taskId, content: $content, authorEmail: "a@example.com"}) { errors { message } }
+}
+"""
+
+actions = st.lists(
+    st.tuples(
+        st.sampled_from(['create_task', 'update_task', 'create_project', 'delete_project', 'comment']),
+        st.integers(min_value=0, max_value=10),
+        st.sampled_from(['TODO', 'IN_PROGRESS', 'DONE']),
+    ),
+    max_size=8,
+)
+
+
+class TestResponseCache(TestCase):
+    """Tests for cached query execution in PersistedQueryView."""
+
+    def _post(self, query, organization_slug, **variables):
+        request = RequestFactory().post(
+            '/graphql/', data=json.dumps({'query': query, 'variables': variables}),
+            content_type='application/json',
+        )
+        request.organization_slug = organization_slug
+        with self.captureOnCommitCallbacks(execute=True):
+            response = PersistedQueryView.as_view()(request)
+        return json.loads(response.content)
+
+    def _fresh(self, query, organization_slug, **variables):
+        request = RequestFactory().post('/graphql/')
+        request.organization_slug = organization_slug
+        return schema.execute(query, variable_values=variables, context_value=request).data
+
+    def _reads(self, org, project_ids):
+        reads = [(DASHBOARD, {'slug': org.slug})]
+        for project_id in project_ids:
+            reads.append((STATISTICS, {'id': project_id}))
+            reads.append((TASKS, {'id': project_id}))
+        return reads
+
+    @given(actions=actions)
+    @settings(max_examples=30, deadline=None)
+    def test_cached_reads_match_fresh_execution(self, actions):
+        """
+        **Feature: project-management-system, Property 25: Fresh Cached Responses**
+        **Validates: Requirements 6.2, 13.3**
+
+        For any sequence of mutations, every read through the cache shall
+        equal a fresh execution of the same query.
+        """
+        caches['graphql'].clear()
+        org = Organization.objects.create(name="Org", slug=f"rc-{uuid.uuid4().hex[:8]}", contact_email="o@example.com")
+        project_ids = [str(Project.objects.create(organization=org, name=f"P{i}").id) for i in range(2)]
+        # Deleted projects stay in the read set, so stale entries would show
+        read_ids = list(project_ids)
+
+        for action, pick, status in actions:
+            for query, variables in self._reads(org, read_ids):
+                self._post(query, org.slug, **variables)
+
+            task_ids = [str(pk) for pk in Task.objects.filter(organization=org).values_list('id', flat=True)]
+            if action == 'create_task' and project_ids:
+                self._post(CREATE_TASK, org.slug, projectId=project_ids[pick % len(project_ids)], title=f"T{pick}")
+            elif action == 'update_task' and task_ids:
+                self._post(UPDATE_TASK, org.slug, id=task_ids[pick % len(task_ids)], status=status)
+            elif action == 'create_project':
+                body = self._post(CREATE_PROJECT, org.slug, slug=org.slug, name=f"New {pick}")
+                project_ids.append(body['data']['createProject']['project']['id'])
+                read_ids.append(project_ids[-1])
+            elif action == 'delete_project' and project_ids:
+                self._post(DELETE_PROJECT, org.slug, id=project_ids.pop(pick % len(project_ids)))
+            elif action == 'comment' and task_ids:
+                self._post(CREATE_COMMENT, org.slug, taskId=task_ids[pick % len(task_ids)], content=f"C{pick}")
+
+            for query, variables in self._reads(org, read_ids):
+                assert self._post(query, org.slug, **variables)['data'] == self._fresh(query, org.slug, **variables)
+
+    def test_repeated_read_skips_the_database(self):
+        caches['graphql'].clear()
+        org = Organization.objects.create(name="Org", slug="rc-hit", contact_email="o@example.com")
+        Project.objects.create(organization=org, name="P")
+
+        first = self._post(DASHBOARD, org.slug, slug=org.slug)
+        with CaptureQueriesContext(connection) as ctx:
+            second = self._post(DASHBOARD, org.slug, slug=org.slug)
+
+        assert second == first
+        assert len(ctx.captured_queries) == 0
+
+    def test_misses_run_without_resolver_middleware(self):
+        """Tags come from root arguments and loaded rows, not from wrapping resolvers."""
+        caches['graphql'].clear()
+        org = Organization.objects.create(name="Org", slug="rc-plain", contact_email="o@example.com")
+        project = Project.objects.create(organization=org, name="P")
+
+        with mock.patch('core.views.execute', wraps=execute) as run:
+            self._post(DASHBOARD, org.slug, slug=org.slug)
+        assert not run.call_args.kwargs['middleware']
+
+        # No argument names the project, only its loaded row; a new task must still expire the entry
+        self._post(CREATE_TASK, org.slug, projectId=str(project.id), title="T")
+        body = self._post(DASHBOARD, org.slug, slug=org.slug)
+        assert body['data']['projects']['edges'][0]['node']['taskCount'] == 1
+
+    def test_results_are_not_stored_across_an_invalidation(self):
+        """A mutation committing while a query runs keeps that query's result out of the cache."""
+        caches['graphql'].clear()
+        org = Organization.objects.create(name="Org", slug="rc-race", contact_email="o@example.com")
+        project = Project.objects.create(organization=org, name="P")
+        execute_document = PersistedQueryView.execute_document
+
+        def commit_during_read(view, *args, **kwargs):
+            result = execute_document(view, *args, **kwargs)
+            # A task write commits after the query read the counters, before its result is stored
+            Task.objects.create(project=project, title="T")
+            response_cache.invalidate([project_tag(project.id)])
+            return result
+
+        with mock.patch.object(PersistedQueryView, 'execute_document', autospec=True,
+                               side_effect=commit_during_read):
+            stale = self._post(STATISTICS, org.slug, id=str(project.id))
+        fresh = self._post(STATISTICS, org.slug, id=str(project.id))
+
+        assert stale['data']['projectStatistics']['totalTasks'] == 0
+        assert fresh['data']['projectStatistics']['totalTasks'] == 1
+
+    def test_entries_are_per_tenant(self):
+        """The same document and variables shall not share entries across tenants."""
+        caches['graphql'].clear()
+        org = Organization.objects.create(name="Org", slug="rc-tenant", contact_email="o@example.com")
+        other = Organization.objects.create(name="Other", slug="rc-other", contact_email="o@example.com")
+        project = Project.objects.create(organization=org, name="P")
+
+        mine = self._post(MANY_STATISTICS, org.slug, ids=[str(project.id)])
+        theirs = self._post(MANY_STATISTICS, other.slug, ids=[str(project.id)])
+
+        assert len(mine['data']['projectsStatistics']) == 1
+        assert theirs['data']['projectsStatistics'] == []
+
+    def test_file_backend(self):
+        """The file backend shall serve and invalidate entries like locmem."""
+        with tempfile.TemporaryDirectory() as directory:
+            file_cache = {
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'graphql': {
+                    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                    'LOCATION': directory,
+                    'OPTIONS': {'MAX_ENTRIES': 50},
+                },
+            }
+            with override_settings(CACHES=file_cache):
+                org = Organization.objects.create(name="Org", slug="rc-file", contact_email="o@example.com")
+                project = Project.objects.create(organization=org, name="P")
+
+                before = self._post(STATISTICS, org.slug, id=str(project.id))
+                assert os.listdir(directory)
+                self._post(CREATE_TASK, org.slug, projectId=str(project.id), title="T")
+                after = self._post(STATISTICS, org.slug, id=str(project.id))
+
+        assert before['data']['projectStatistics']['totalTasks'] == 0
+        assert after['data']['projectStatistics']['totalTasks'] == 1
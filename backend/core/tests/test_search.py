@@ -0,0 +1,104 @@
+"""
+Property-based tests for ranked project and task search.
+
+**Feature: project-management-system, Property 14: Ranked Search Correctness**
+**Validates: Requirements 13.2**
+
+For any search text, every returned project or task shall contain the text,
+no match shall be excluded across pages, and name/title matches shall rank
+above description-only matches.
+"""
+import uuid
+import pytest
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.test import RequestFactory
+from core.models import Organization, Project, Task
+from core.schema import schema
+from core.search import _prefix_query
+
+SEARCH_PROJECTS = """
+query ($slug: String!, $search: String, $first: Int, $after: String) {
+  projects(organizationSlug: $slug, search: $search, first: $first, after: $after) {
+    edges { node { id name description } }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+SEARCH_TASKS = """
+query ($projectId: ID!, $search: String) {
+  tasks(projectId: $projectId, search: $search) {
+    edges { node { id title description } }
+  }
+}
+"""
+
+
+class TestRankedSearch(TestCase):
+    """Property-based tests for the search subsystem (SQLite fallback path)."""
+
+    def _execute(self, query, **variables):
+        request = RequestFactory().post('/graphql/')
+        return schema.execute(query, variable_values=variables, context_value=request)
+
+    @given(
+        search_term=st.text(min_size=3, max_size=10, alphabet=st.characters(whitelist_categories=('Ll',))),
+        num_title=st.integers(min_value=0, max_value=4),
+        num_body=st.integers(min_value=0, max_value=4),
+        page_size=st.integers(min_value=1, max_value=3),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_project_search_is_complete_and_ranked(self, search_term, num_title, num_body, page_size):
+        """
+        **Feature: project-management-system, Property 14: Ranked Search Correctness**
+        **Validates: Requirements 13.2**
+
+        For any search text, paging through results shall return every match
+        once, with name matches before description-only matches.
+        """
+        slug = f"org-{uuid.uuid4().hex[:8]}"
+        org = Organization.objects.create(name="Org", slug=slug, contact_email="org@example.com")
+        title_ids, body_ids = set(), set()
+        for i in range(num_title):
+            project = Project.objects.create(organization=org, name=f"P{i} {search_term}")
+            title_ids.add(str(project.id))
+        for i in range(num_body):
+            project = Project.objects.create(
+                organization=org, name=f"Q{i}", description=f"about {search_term}"
+            )
+            body_ids.add(str(project.id))
+        Project.objects.create(organization=org, name="0000", description="1111")
+
+        found, after = [], None
+        while True:
+            result = self._execute(SEARCH_PROJECTS, slug=slug, search=search_term, first=page_size, after=after)
+            assert result.errors is None
+            connection = result.data['projects']
+            found.extend(edge['node']['id'] for edge in connection['edges'])
+            if not connection['pageInfo']['hasNextPage']:
+                break
+            after = connection['pageInfo']['endCursor']
+
+        assert len(found) == len(set(found))
+        assert set(found[:len(title_ids)]) == title_ids
+        assert set(found[len(title_ids):]) == body_ids
+
+    def test_task_search_filters_by_title_and_description(self):
+        """Task search shall match title or description within the project."""
+        org = Organization.objects.create(name="Org", slug="search-tasks", contact_email="org@example.com")
+        project = Project.objects.create(organization=org, name="Project")
+        by_title = Task.objects.create(project=project, title="Deploy release")
+        by_body = Task.objects.create(project=project, title="Other", description="release notes")
+        Task.objects.create(project=project, title="Unrelated")
+
+        result = self._execute(SEARCH_TASKS, projectId=str(project.id), search="release")
+        assert result.errors is None
+        ids = [edge['node']['id'] for edge in result.data['tasks']['edges']]
+        assert ids == [str(by_title.id), str(by_body.id)]
+
+    def test_prefix_query_sanitizes_input(self):
+        """Free text shall become a safe prefix tsquery."""
+        assert _prefix_query("design rev") == "design:* & rev:*"
+        assert _prefix_query("a&b | !c") == "a:* & b:* & c:*"
+        assert _prefix_query("!!!") is None
@@ -0,0 +1,239 @@
+"""
+Property-based tests for compiled subscriptions.
+
+**Feature: project-management-system, Property 30: Validated, Projected Subscriptions**
+**Validates: Requirements 13.1**
+
+For any subscription document, the server shall parse and validate it once
+through the shared document cache, reject invalid subscriptions with GraphQL
+errors, and send each subscriber only the fields it selected, under its aliases.
+"""
+import json
+import uuid
+from unittest import mock
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.utils import timezone
+from core.consumers import GraphQLSubscriptionConsumer
+from core.models import Task, TaskComment
+from core.mutations import _comment_activity, _comment_data, _task_data
+from core.persisted_queries import document_cache
+from core.schema import schema
+from core.subscriptions import (
+    EVENT_FIELDS, CompiledSubscription, SubscriptionError, compile_subscription, encode_json,
+    next_frame_prefix, payload_cache,
+)
+
+TASK_FIELDS = ['id', 'title', 'description', 'status', 'assigneeEmail', 'dueDate', 'createdAt']
+
+TASK = {
+    'id': str(uuid.uuid4()),
+    'projectId': str(uuid.uuid4()),
+    'title': 'Write docs',
+    'description': 'All of them',
+    'status': 'TODO',
+    'assigneeEmail': 'dev@example.com',
+    'dueDate': None,
+    'createdAt': '2024-01-01T00:00:00+00:00',
+}
+
+
+def _compile(query, **variables):
+    return compile_subscription(schema.graphql_schema, query, variables)
+
+
+class TestCompiledSubscriptions(TestCase):
+    """Tests for validation, caching and projection of subscription documents."""
+
+    def setUp(self):
+        document_cache.clear()
+
+    @given(
+        fields=st.lists(st.sampled_from(TASK_FIELDS), min_size=1, max_size=len(TASK_FIELDS), unique=True),
+        alias=st.sampled_from([None, 'task', 'update']),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_events_are_projected_to_the_selection(self, fields, alias):
+        """
+        **Feature: project-management-system, Property 30: Validated, Projected Subscriptions**
+        **Validates: Requirements 13.1**
+
+        For any selection of task fields, a projected event has exactly
+        those fields, under the root field's alias.
+        """
+        root = f'{alias}: taskUpdated' if alias else 'taskUpdated'
+        query = f'subscription($p: ID!) {{ {root}(projectId: $p) {{ {" ".join(fields)} }} }}'
+        project_id = str(uuid.uuid4())
+        compiled = _compile(query, p=project_id)
+
+        assert compiled.group == f'project_{project_id}_tasks'
+        assert compiled.project({'taskUpdated': TASK}) == {
+            alias or 'taskUpdated': {field: TASK[field] for field in fields}
+        }
+
+    def test_fragments_aliases_typename_and_directives(self):
+        """Fragments are merged, aliases renamed and skipped fields left out."""
+        compiled = _compile('''
+            subscription($p: ID!, $withStatus: Boolean!) {
+                taskUpdated(projectId: $p) {
+                    __typename
+                    name: title
+                    ...TaskBits
+                    ... on TaskType { assigneeEmail @include(if: false) }
+                    status @include(if: $withStatus)
+                }
+            }
+            fragment TaskBits on TaskType { id dueDate @skip(if: true) }
+        ''', p=str(uuid.uuid4()), withStatus=False)
+
+        assert compiled.project({'taskUpdated': TASK}) == {'taskUpdated': {
+            '__typename': 'TaskType', 'name': TASK['title'], 'id': TASK['id'],
+        }}
+
+    def test_fields_events_do_not_carry_are_rejected(self):
+        """Selecting a field the broadcast payload lacks fails instead of arriving as null."""
+        uncarried = [
+            ('subscription($id: ID!) { taskUpdated(projectId: $id) { id project { name } } }', 'project'),
+            ('subscription($id: ID!) { taskUpdated(projectId: $id) { ... on TaskType { comments { id } } } }',
+             'comments'),
+            ('subscription($id: ID!) { commentAdded(taskId: $id) { content task { title } } }', 'task'),
+            ('subscription($id: String!) { organizationActivity(organizationSlug: $id) '
+             '{ task { project { id } } } }', 'project'),
+        ]
+        for query, field_name in uncarried:
+            with self.assertRaises(SubscriptionError) as raised:
+                _compile(query, id=str(uuid.uuid4()))
+            [error] = raised.exception.errors
+            assert f"'{field_name}'" in error.message
+
+    def test_event_fields_match_the_broadcast_payloads(self):
+        project_id, task_id = uuid.uuid4(), uuid.uuid4()
+        task = Task(id=task_id, project_id=project_id, title='T')
+        comment = TaskComment(task_id=task_id, content='C', created_at=timezone.now())
+
+        assert set(_task_data(task)) - {'projectId'} == EVENT_FIELDS['TaskType']
+        assert set(_comment_data(comment)) == EVENT_FIELDS['TaskCommentType']
+        assert set(_comment_activity(task, comment)) == EVENT_FIELDS['ActivityEventType']
+
+    def test_identical_documents_are_parsed_once(self):
+        """Subscribing twice with one document reuses the cached validation."""
+        query = 'subscription($t: ID!) { commentAdded(taskId: $t) { id content } }'
+        _compile(query, t=str(uuid.uuid4()))
+        _compile(query, t=str(uuid.uuid4()))
+
+        assert document_cache.misses == 1
+        assert document_cache.hits == 1
+
+    @given(
+        sub_id=st.text(max_size=20),
+        title=st.text(max_size=50),
+        alias=st.sampled_from([None, 'task']),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_spliced_frames_match_encoding_the_envelope(self, sub_id, title, alias):
+        """
+        **Feature: project-management-system, Property 30: Validated, Projected Subscriptions**
+        **Validates: Requirements 13.1**
+
+        For any subscription id and event, the frame built from the shared
+        payload decodes to the same message as encoding it whole.
+        """
+        root = f'{alias}: taskUpdated' if alias else 'taskUpdated'
+        compiled = _compile(f'subscription($p: ID!) {{ {root}(projectId: $p) {{ id title }} }}', p=str(uuid.uuid4()))
+        data = {'taskUpdated': {**TASK, 'title': title}}
+
+        frame = next_frame_prefix(sub_id) + payload_cache.payload(compiled, uuid.uuid4().hex, data) + '}'
+
+        assert json.loads(frame) == {'type': 'next', 'id': sub_id, 'payload': {'data': compiled.project(data)}}
+        assert json.loads(encode_json(data)) == data
+
+    def test_payloads_are_encoded_once_per_event_and_selection(self):
+        """Subscriptions with the same selection share one encoded payload per event."""
+        payload_cache.clear()
+        query = 'subscription($p: ID!) { taskUpdated(projectId: $p) { id %s } }'
+        same = [_compile(query % '', p=str(uuid.uuid4())) for _ in range(3)]
+        other = _compile(query % 'title', p=str(uuid.uuid4()))
+        data = {'taskUpdated': TASK}
+
+        project = CompiledSubscription.project
+        with mock.patch.object(CompiledSubscription, 'project', autospec=True, side_effect=project) as projected:
+            for event_id in ('e1', 'e2'):
+                payloads = {payload_cache.payload(compiled, event_id, data) for compiled in same}
+                assert len(payloads) == 1
+                payload_cache.payload(other, event_id, data)
+
+        assert payload_cache.misses == 4
+        assert payload_cache.hits == 4
+        # Hits skip projecting the event as well as encoding it
+        assert projected.call_count == 4
+
+    def test_invalid_subscriptions_are_rejected(self):
+        """Unknown fields, missing arguments, bad ids and queries raise SubscriptionError."""
+        invalid = [
+            ('subscription { taskUpdated(projectId: "x") { nope } }', {}),
+            ('subscription($p: ID!) { taskUpdated(projectId: $p) { id } }', {}),
+            ('subscription($p: ID!) { taskUpdated(projectId: $p) { id } }', {'p': 'not-a-uuid'}),
+            ('query { __typename }', {}),
+            ('subscription {', {}),
+        ]
+        for query, variables in invalid:
+            with self.assertRaises(SubscriptionError) as raised:
+                _compile(query, **variables)
+            assert raised.exception.errors
+
+
+class TestSubscriptionConsumer(TestCase):
+    """Tests for what GraphQLSubscriptionConsumer sends to a connection."""
+
+    def _session(self, messages, events):
+        """Send messages, then group events; return everything the client received."""
+        async def run():
+            communicator = WebsocketCommunicator(GraphQLSubscriptionConsumer.as_asgi(), '/graphql/')
+            await communicator.connect()
+            for message in messages:
+                await communicator.send_to(text_data=json.dumps(message))
+            # Let the consumer handle the subscribes before publishing
+            received = []
+            while not await communicator.receive_nothing(timeout=0.1):
+                received.append(json.loads(await communicator.receive_from()))
+            layer = get_channel_layer()
+            for group, event in events:
+                await layer.group_send(group, event)
+            while not await communicator.receive_nothing(timeout=0.1):
+                received.append(json.loads(await communicator.receive_from()))
+            await communicator.disconnect()
+            return received
+        return async_to_sync(run)()
+
+    def test_subscribers_receive_only_their_selection(self):
+        """Two subscriptions on one group each receive their own projection and id."""
+        project_id = str(uuid.uuid4())
+        group = f'project_{project_id}_tasks'
+        query = 'subscription($p: ID!) { taskUpdated(projectId: $p) { %s } }'
+        received = self._session(
+            [
+                {'id': 'a', 'type': 'subscribe', 'payload': {'query': query % 'id', 'variables': {'p': project_id}}},
+                {'id': 'b', 'type': 'subscribe', 'payload': {'query': query % 't: title status', 'variables': {'p': project_id}}},
+            ],
+            [(group, {'type': 'subscription_update', 'group': group, 'data': {'taskUpdated': TASK}})],
+        )
+
+        assert sorted(received, key=lambda message: message['id']) == [
+            {'type': 'next', 'id': 'a', 'payload': {'data': {'taskUpdated': {'id': TASK['id']}}}},
+            {'type': 'next', 'id': 'b', 'payload': {'data': {'taskUpdated': {'t': TASK['title'], 'status': 'TODO'}}}},
+        ]
+
+    def test_invalid_subscription_gets_an_error(self):
+        """A subscribe message that fails validation is answered with an error message."""
+        received = self._session(
+            [{'id': 'x', 'type': 'subscribe', 'payload': {'query': 'subscription { taskUpdated { id } }'}}],
+            [],
+        )
+
+        assert len(received) == 1
+        assert received[0]['type'] == 'error'
+        assert received[0]['id'] == 'x'
+        assert received[0]['payload'][0]['message']
@@ -0,0 +1,89 @@
+"""
+Property-based tests for organization slug resolution.
+
+**Feature: project-management-system, Property 16: Tenant Resolution Consistency**
+**Validates: Requirements 6.1, 6.2**
+
+For any sequence of organization renames and deletions, resolving a slug
+shall return the id of the organization currently holding it, and tenant
+filters shall use the organization id column without joining.
+"""
+import uuid
+import pytest
+from unittest import mock
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from core.middleware import OrganizationMiddleware
+from core.models import Organization, Project, Task, TaskComment
+from core.tenancy import OrganizationCache, organization_cache, resolve_organization_id
+
+
+class TestOrganizationCache(TestCase):
+    """Tests for the LRU/TTL cache and its invalidation."""
+
+    @given(
+        keys=st.lists(st.integers(min_value=0, max_value=20), min_size=1, max_size=50),
+        max_size=st.integers(min_value=1, max_value=5),
+    )
+    @settings(max_examples=100, deadline=None)
+    def test_lru_never_exceeds_size_and_keeps_recent(self, keys, max_size):
+        """
+        **Feature: project-management-system, Property 16: Tenant Resolution Consistency**
+        **Validates: Requirements 6.1, 6.2**
+
+        For any access sequence, the cache shall hold at most max_size entries
+        and always keep the most recently set key.
+        """
+        cache = OrganizationCache(max_size=max_size, ttl=60)
+        for key in keys:
+            cache.set(str(key), key)
+            assert len(cache._entries) <= max_size
+            assert cache.get(str(key)) == key
+
+    def test_entries_expire_after_ttl(self):
+        cache = OrganizationCache(max_size=10, ttl=5)
+        with mock.patch('core.tenancy.time.monotonic', return_value=100.0):
+            cache.set('acme', 1)
+        with mock.patch('core.tenancy.time.monotonic', return_value=104.0):
+            assert cache.get('acme') == 1
+        with mock.patch('core.tenancy.time.monotonic', return_value=106.0):
+            assert cache.get('acme') is None
+
+    def test_rename_and_delete_invalidate(self):
+        org = Organization.objects.create(name="Org", slug="before", contact_email="o@example.com")
+        assert resolve_organization_id("before") == org.id
+
+        org.slug = "after"
+        org.save()
+        assert resolve_organization_id("before") is None
+        assert resolve_organization_id("after") == org.id
+
+        org.delete()
+        assert resolve_organization_id("after") is None
+
+    def test_cached_slug_resolves_without_queries(self):
+        org = Organization.objects.create(name="Org", slug="cached", contact_email="o@example.com")
+        organization_cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            assert resolve_organization_id("cached") == org.id
+            assert resolve_organization_id("cached") == org.id
+        assert len(ctx.captured_queries) == 1
+
+    def test_middleware_sets_organization_id(self):
+        org = Organization.objects.create(name="Org", slug="mw", contact_email="o@example.com")
+        request = RequestFactory().get('/graphql/', HTTP_X_ORGANIZATION_SLUG='mw')
+        OrganizationMiddleware(lambda r: None)(request)
+        assert request.organization_id == org.id
+
+    def test_tenant_filters_use_foreign_key_column(self):
+        org = Organization.objects.create(name="Org", slug="fk", contact_email="o@example.com")
+        for queryset in (
+            Project.objects.for_organization("fk"),
+            Task.objects.for_organization(organization_id=org.id),
+            TaskComment.objects.for_organization("fk"),
+        ):
+            assert 'core_organization' not in str(queryset.query)
+        assert not Project.objects.for_organization(f"missing-{uuid.uuid4().hex}").exists()
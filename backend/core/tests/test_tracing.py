@@ -0,0 +1,90 @@
+"""
+Property-based tests for opt-in resolver tracing.
+
+**Feature: project-management-system, Property 28: Opt-in Resolver Traces**
+**Validates: Requirements 13.3**
+
+For any query, an untraced request shall run no instrumentation, and a
+traced request shall report one record per resolved field whose SQL counts
+add up to every statement the request ran.
+"""
+import json
+from unittest import mock
+import pytest
+from hypothesis import given, strategies as st, settings
+from hypothesis.extra.django import TestCase
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from core.models import Organization, Project, Task
+from core.tracing import TracingMiddleware
+from core.views import PersistedQueryView
+
+QUERY = """
+query ($slug: String!, $id: ID!) {
+  projects(organizationSlug: $slug) { edges { node { id name taskCount } } }
+  tasks(projectId: $id) { edges { node { id title comments { id } } } }
+}
+"""
+
+
+@override_settings(GRAPHQL_TRACE_ALLOW_HEADER=True, GRAPHQL_TRACE_SAMPLE_RATE=0, GRAPHQL_FIELD_METRICS_SAMPLE_RATE=0)
+class TestTracing(TestCase):
+    """Tests for core.tracing in PersistedQueryView."""
+
+    def _post(self, variables, **headers):
+        request = RequestFactory().post(
+            '/graphql/', data=json.dumps({'query': QUERY, 'variables': variables}),
+            content_type='application/json', **headers,
+        )
+        request.organization_slug = variables['slug']
+        with CaptureQueriesContext(connection) as ctx:
+            response = PersistedQueryView.as_view()(request)
+        return json.loads(response.content), len(ctx.captured_queries)
+
+    def _data(self, projects, tasks):
+        org = Organization.objects.create(name="Org", slug=f"trace-{projects}-{tasks}", contact_email="o@example.com")
+        project_list = [Project.objects.create(organization=org, name=f"P{i}") for i in range(projects)]
+        for i in range(tasks):
+            Task.objects.create(project=project_list[0], title=f"T{i}")
+        return {'slug': org.slug, 'id': str(project_list[0].id)}
+
+    @given(projects=st.integers(min_value=1, max_value=4), tasks=st.integers(min_value=0, max_value=4))
+    @settings(max_examples=20, deadline=None)
+    def test_trace_accounts_for_every_field_and_statement(self, projects, tasks):
+        """
+        **Feature: project-management-system, Property 28: Opt-in Resolver Traces**
+        **Validates: Requirements 13.3**
+
+        For any data, a traced request shall record every resolved field and
+        charge each SQL statement to exactly one of them.
+        """
+        variables = self._data(projects, tasks)
+        body, queries = self._post(variables, HTTP_X_GRAPHQL_TRACE='1')
+
+        trace = body['extensions']['trace']
+        resolvers = trace['resolvers']
+        assert trace['sqlQueries'] == queries
+        assert sum(r['sqlQueries'] for r in resolvers) == queries
+        # projects, edges, and per project: node, id, name, taskCount
+        assert sum(r['path'][0] == 'projects' for r in resolvers) == 2 + 4 * projects
+        # tasks, edges, and per task: node, id, title, comments
+        assert sum(r['path'][0] == 'tasks' for r in resolvers) == 2 + 4 * tasks
+        assert {'parentType': 'Query', 'fieldName': 'tasks'}.items() <= next(
+            r for r in resolvers if r['path'] == ['tasks']
+        ).items()
+
+    def test_untraced_requests_install_no_middleware(self):
+        variables = self._data(1, 1)
+        with mock.patch.object(TracingMiddleware, 'resolve') as resolve:
+            body, _ = self._post(variables)
+            with override_settings(GRAPHQL_TRACE_ALLOW_HEADER=False):
+                body_disallowed, _ = self._post(variables, HTTP_X_GRAPHQL_TRACE='1')
+        resolve.assert_not_called()
+        assert 'trace' not in body['extensions']
+        assert 'trace' not in body_disallowed['extensions']
+
+    @override_settings(GRAPHQL_TRACE_SAMPLE_RATE=1.0)
+    def test_sampled_requests_are_traced(self):
+        body, _ = self._post(self._data(1, 0))
+        assert body['extensions']['trace']['resolvers']
@@ -0,0 +1,97 @@
+"""
+Opt-in per-request tracing of GraphQL resolvers.
+
+Nothing is installed on the resolver path unless a request asks for a trace
+with the X-GraphQL-Trace header (when GRAPHQL_TRACE_ALLOW_HEADER is on) or is
+picked by GRAPHQL_TRACE_SAMPLE_RATE. A traced request records, per resolved
+field, its timing and the SQL statements it ran, and returns them under
+extensions.trace. Requests picked by GRAPHQL_FIELD_METRICS_SAMPLE_RATE are
+traced the same way for core.metrics but do not return the trace.
+"""
+import random
+import time
+from django.conf import settings
+
+TRACE_HEADER = 'HTTP_X_GRAPHQL_TRACE'
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+class Trace:
+    """Resolver timings and SQL counts collected for one request."""
+
+    def __init__(self, report=True):
+        self.report = report
+        self.started = time.perf_counter()
+        self.resolvers = []
+        self.sql_queries = 0
+        self._current = None
+
+    def count_query(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook charging a statement to the running resolver."""
+        record = self._current
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_queries += 1
+            if record is not None:
+                record['sqlQueries'] += 1
+                record['dbMs'] += _ms(time.perf_counter() - started)
+
+    def as_extension(self):
+        return {
+            'durationMs': _ms(time.perf_counter() - self.started),
+            'sqlQueries': self.sql_queries,
+            'resolvers': self.resolvers,
+        }
+
+
+class TracingMiddleware:
+    """
+    Graphene middleware timing each resolver into a Trace. Execution is
+    synchronous, so a resolver's SQL is everything run while it is called;
+    its children are resolved after it returns and are charged separately.
+    """
+
+    def __init__(self, trace):
+        self.trace = trace
+
+    def resolve(self, next, root, info, **args):
+        record = {
+            'path': info.path.as_list(),
+            'parentType': info.parent_type.name,
+            'fieldName': info.field_name,
+            'returnType': str(info.return_type),
+            'startOffsetMs': _ms(time.perf_counter() - self.trace.started),
+            'durationMs': 0,
+            'dbMs': 0,
+            'sqlQueries': 0,
+        }
+        outer, self.trace._current = self.trace._current, record
+        started = time.perf_counter()
+        try:
+            return next(root, info, **args)
+        finally:
+            record['durationMs'] = _ms(time.perf_counter() - started)
+            self.trace._current = outer
+            self.trace.resolvers.append(record)
+
+
+def _sampled(setting):
+    rate = getattr(settings, setting, 0)
+    return bool(rate) and random.random() < rate
+
+
+def start_trace(request):
+    """Return a Trace if this request is traced, else None."""
+    header = request.META.get(TRACE_HEADER, '').lower() in ('1', 'true', 'yes')
+    if header and getattr(settings, 'GRAPHQL_TRACE_ALLOW_HEADER', False):
+        return Trace()
+    if _sampled('GRAPHQL_TRACE_SAMPLE_RATE'):
+        return Trace()
+    if _sampled('GRAPHQL_FIELD_METRICS_SAMPLE_RATE'):
+        return Trace(report=False)
+    return None
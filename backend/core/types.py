@@ -2,6 +2,7 @@
 import graphene
 from graphene_django import DjangoObjectType
 from .models import Organization, Project, Task, TaskComment, TaskStatus
+from .loaders import get_loaders
 
 
 class OrganizationType(DjangoObjectType):
@@ -14,6 +15,7 @@ class OrganizationType(DjangoObjectType):
 
 class ProjectStatisticsType(graphene.ObjectType):
     """GraphQL type for project statistics."""
+    project_id = graphene.ID()
     total_tasks = graphene.Int()
     completed_tasks = graphene.Int()
     in_progress_tasks = graphene.Int()
@@ -32,10 +34,10 @@ class ProjectType(DjangoObjectType):
         fields = ('id', 'name', 'description', 'status', 'due_date', 'created_at', 'organization')
 
     def resolve_task_count(self, info):
-        return self.task_count
+        return self.total_tasks
 
     def resolve_completed_tasks(self, info):
-        return self.completed_tasks
+        return self.done_tasks
 
     def resolve_completion_rate(self, info):
         return self.completion_rate
@@ -51,14 +53,49 @@ class TaskCommentType(DjangoObjectType):
 
 class TaskType(DjangoObjectType):
     """GraphQL type for Task model."""
-    comments = graphene.List(TaskCommentType)
+    comments = graphene.List(TaskCommentType, first=graphene.Int())
     
     class Meta:
         model = Task
         fields = ('id', 'title', 'description', 'status', 'assignee_email', 'due_date', 'created_at', 'project')
 
-    def resolve_comments(self, info):
-        return self.comments.all()
+    def resolve_comments(self, info, first=None):
+        if first is not None and first <= 0:
+            return []
+        return get_loaders(info.context).task_comments(first).load(self.pk)
+
+
+class ActivityEventType(graphene.ObjectType):
+    """
+    One event of an organization's activity feed: a task created or updated
+    (kind TASK_UPDATED) or a comment added to a task (kind COMMENT_ADDED).
+    """
+    kind = graphene.String()
+    project_id = graphene.ID()
+    task = graphene.Field(TaskType)
+    comment = graphene.Field(TaskCommentType)
+
+
+# Connection types for paginated lists
+class ProjectConnection(graphene.relay.Connection):
+    """Keyset-paginated list of projects."""
+
+    class Meta:
+        node = ProjectType
+
+
+class TaskConnection(graphene.relay.Connection):
+    """Keyset-paginated list of tasks."""
+
+    class Meta:
+        node = TaskType
+
+
+class TaskCommentConnection(graphene.relay.Connection):
+    """Keyset-paginated list of comments."""
+
+    class Meta:
+        node = TaskCommentType
 
 
 # Input types for mutations
@@ -105,6 +142,16 @@ class UpdateTaskInput(graphene.InputObjectType):
     due_date = graphene.DateTime()
 
 
+class UpdateTaskItemInput(graphene.InputObjectType):
+    """Input type for one task in a bulk update."""
+    id = graphene.ID(required=True)
+    title = graphene.String()
+    description = graphene.String()
+    status = graphene.String()
+    assignee_email = graphene.String()
+    due_date = graphene.DateTime()
+
+
 class CreateCommentInput(graphene.InputObjectType):
     """Input type for creating a comment."""
     task_id = graphene.ID(required=True)
@@ -112,6 +159,12 @@ class CreateCommentInput(graphene.InputObjectType):
     author_email = graphene.String(required=True)
 
 
+class ActivityFilterInput(graphene.InputObjectType):
+    """Which organization activity a subscription receives; unset means all."""
+    project_ids = graphene.List(graphene.NonNull(graphene.ID))
+    statuses = graphene.List(graphene.NonNull(graphene.String))
+
+
 # Error type for mutations
 class ErrorType(graphene.ObjectType):
     """Error type for mutation responses."""
@@ -0,0 +1,192 @@
+"""GraphQL HTTP view with persisted, pre-validated documents and cached results."""
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import HttpResponseBadRequest, HttpResponseNotAllowed
+from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.settings import graphene_settings
+from graphene_django.views import GraphQLView, HttpError
+from graphql import ExecutionResult, OperationType, execute, get_operation_ast
+from .complexity import VALIDATION_RULES, analyze_cost, cost_exceeded_error
+from .metrics import OperationTimer, graphql_metrics
+from .persisted_queries import load_document, persisted_query_hash
+from .response_cache import collect_row_tags, response_cache, root_tags
+from .tenancy import get_request_organization_id
+from .tracing import TracingMiddleware, start_trace
+
+
+class PersistedQueryView(GraphQLView):
+    """
+    GraphQLView that looks documents up by SHA-256 before parsing.
+
+    Documents are parsed and validated once per process and then served
+    from document_cache, whether the client sent a persisted query hash or
+    the full text. Operations deeper than GRAPHQL_MAX_DEPTH fail validation,
+    and operations whose estimated cost is over GRAPHQL_MAX_COST are rejected
+    before execution; the cost is reported in the response extensions. Query
+    results are served from response_cache when it is enabled, except for
+    requests that core.tracing picks for a resolver trace. Every request is
+    recorded in core.metrics. Execution is otherwise the same as GraphQLView.
+    """
+
+    validation_rules = VALIDATION_RULES
+
+    def get_document(self, request, data, query):
+        """
+        Return ((document, canonical hash), None) for a request, or
+        (None, ExecutionResult) on error.
+        """
+        entry, errors = load_document(
+            self.schema.graphql_schema,
+            query,
+            sha=persisted_query_hash(request, data),
+            validation_rules=self.validation_rules,
+            max_errors=graphene_settings.MAX_VALIDATION_ERRORS,
+        )
+        if errors:
+            return None, ExecutionResult(data=None, errors=errors)
+        return entry, None
+
+    def execute_graphql_request(
+        self, request, data, query, variables, operation_name, show_graphiql=False
+    ):
+        if not query and not persisted_query_hash(request, data):
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseBadRequest('Must provide query string.'))
+
+        entry, error_result = self.get_document(request, data, query)
+        if error_result is not None:
+            return error_result
+        document, canonical = entry
+
+        operation_ast = get_operation_ast(document, operation_name)
+        if operation_ast is not None and operation_ast.name is not None:
+            request.graphql_operation_name = operation_ast.name.value
+        if (
+            request.method.lower() == 'get'
+            and operation_ast is not None
+            and operation_ast.operation != OperationType.QUERY
+        ):
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseNotAllowed(
+                ['POST'],
+                f'Can only perform a {operation_ast.operation.value} operation from a POST request.',
+            ))
+
+        if operation_ast is not None:
+            query_cost = analyze_cost(
+                self.schema.graphql_schema, document, operation_ast, variables,
+                max_cost=getattr(settings, 'GRAPHQL_MAX_COST', None),
+            )
+            request.graphql_extensions = {'cost': query_cost.as_extension()}
+            if query_cost.exceeded:
+                return ExecutionResult(errors=[cost_exceeded_error(query_cost)])
+
+        trace = start_trace(request)
+        if (
+            response_cache.enabled
+            and operation_ast is not None
+            and operation_ast.operation == OperationType.QUERY
+            # A returned trace shows the resolvers' real work, so skip the cache
+            and (trace is None or not trace.report)
+        ):
+            return self.execute_cached(
+                request, document, canonical, operation_ast, variables, operation_name, trace
+            )
+        return self.execute_document(request, document, operation_ast, variables, operation_name, trace=trace)
+
+    def get_response(self, request, data, show_graphiql=False):
+        """Run the request, recording its operation metrics."""
+        request.graphql_operation_name = None
+        timer = OperationTimer()
+        with connection.execute_wrapper(timer):
+            result, status_code = super().get_response(request, data, show_graphiql)
+        if result is not None:
+            graphql_metrics.observe_operation(request.graphql_operation_name, timer, len(result))
+        return result, status_code
+
+    def json_encode(self, request, d, pretty=False):
+        extensions = getattr(request, 'graphql_extensions', None)
+        if extensions:
+            d = {**d, 'extensions': extensions}
+        return super().json_encode(request, d, pretty)
+
+    def execute_cached(self, request, document, canonical, operation_ast, variables, operation_name,
+                       trace=None):
+        """
+        Serve a query from response_cache, executing and storing it on a miss,
+        tagged with the rows its root arguments name and the rows it loaded.
+        """
+        key = response_cache.make_key(
+            get_request_organization_id(request), canonical, operation_name, variables
+        )
+        data = response_cache.get(key)
+        if data is not None:
+            return ExecutionResult(data=data)
+
+        generation = response_cache.generation()
+        with collect_row_tags() as tags:
+            result = self.execute_document(
+                request, document, operation_ast, variables, operation_name, trace=trace
+            )
+        if not result.errors:
+            tags |= root_tags(self.schema.graphql_schema, document, operation_ast, variables)
+            response_cache.set(key, result.data, tags, generation)
+        return result
+
+    def execute_document(self, request, document, operation_ast, variables, operation_name,
+                         trace=None):
+        """
+        Execute document; when traced, with TracingMiddleware and every SQL
+        statement charged to its resolver.
+        """
+        if trace is None:
+            return self._execute_document(
+                request, document, operation_ast, variables, operation_name
+            )
+        with connection.execute_wrapper(trace.count_query):
+            result = self._execute_document(
+                request, document, operation_ast, variables, operation_name,
+                [TracingMiddleware(trace)],
+            )
+        graphql_metrics.observe_trace(trace)
+        if trace.report:
+            request.graphql_extensions = {
+                **getattr(request, 'graphql_extensions', {}), 'trace': trace.as_extension(),
+            }
+        return result
+
+    def _execute_document(self, request, document, operation_ast, variables, operation_name,
+                          extra_middleware=()):
+        try:
+            middleware = self.get_middleware(request)
+            if extra_middleware:
+                middleware = [*(middleware or ()), *extra_middleware]
+            execute_options = {
+                'root_value': self.get_root_value(request),
+                'context_value': self.get_context(request),
+                'variable_values': variables,
+                'operation_name': operation_name,
+                'middleware': middleware,
+            }
+            if self.execution_context_class:
+                execute_options['execution_context_class'] = self.execution_context_class
+
+            if (
+                operation_ast is not None
+                and operation_ast.operation == OperationType.MUTATION
+                and (
+                    graphene_settings.ATOMIC_MUTATIONS is True
+                    or connection.settings_dict.get('ATOMIC_MUTATIONS', False) is True
+                )
+            ):
+                with transaction.atomic():
+                    result = execute(self.schema.graphql_schema, document, **execute_options)
+                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                        transaction.set_rollback(True)
+                return result
+
+            return execute(self.schema.graphql_schema, document, **execute_options)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
@@ -4,6 +4,7 @@ import { getMainDefinition } from '@apollo/client/utilities'
 import { createClient } from 'graphql-ws'
 import { onError } from '@apollo/client/link/error'
 import { setContext } from '@apollo/client/link/context'
+import { createPersistedQueryLink } from '@apollo/client/link/persisted-queries'
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
 const WS_URL = import.meta.env.VITE_WS_URL || 'ws://localhost:8000'
@@ -13,6 +14,16 @@ const httpLink = createHttpLink({
   uri: `${API_URL}/graphql/`,
 })
 
+// Send a SHA-256 hash instead of the full query once the server knows it
+const sha256 = async (query: string) => {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(query))
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, '0'))
+    .join('')
+}
+
+const persistedQueryLink = createPersistedQueryLink({ sha256 })
+
 // WebSocket link for subscriptions
 const wsLink = new GraphQLWsLink(
   createClient({
@@ -53,7 +64,7 @@ const splitLink = split(
     return definition.kind === 'OperationDefinition' && definition.operation === 'subscription'
   },
   wsLink,
-  authLink.concat(httpLink)
+  authLink.concat(persistedQueryLink).concat(httpLink)
 )
 
 export const apolloClient = new ApolloClient({
@@ -12,16 +12,36 @@ export const GET_ORGANIZATIONS = gql`
 `
 
 export const GET_PROJECTS = gql`
-  query GetProjects($organizationSlug: String!, $status: String, $search: String) {
-    projects(organizationSlug: $organizationSlug, status: $status, search: $search) {
-      id
-      name
-      description
-      status
-      dueDate
-      createdAt
-      taskCount
-      completedTasks
+  query GetProjects(
+    $organizationSlug: String!
+    $status: String
+    $search: String
+    $first: Int = 100
+    $after: String
+  ) {
+    projects(
+      organizationSlug: $organizationSlug
+      status: $status
+      search: $search
+      first: $first
+      after: $after
+    ) {
+      edges {
+        node {
+          id
+          name
+          description
+          status
+          dueDate
+          createdAt
+          taskCount
+          completedTasks
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
     }
   }
 `
@@ -42,15 +62,29 @@ export const GET_PROJECT = gql`
 `
 
 export const GET_TASKS = gql`
-  query GetTasks($projectId: ID!, $status: String, $search: String) {
-    tasks(projectId: $projectId, status: $status, search: $search) {
-      id
-      title
-      description
-      status
-      assigneeEmail
-      dueDate
-      createdAt
+  query GetTasks(
+    $projectId: ID!
+    $status: String
+    $search: String
+    $first: Int = 500
+    $after: String
+  ) {
+    tasks(projectId: $projectId, status: $status, search: $search, first: $first, after: $after) {
+      edges {
+        node {
+          id
+          title
+          description
+          status
+          assigneeEmail
+          dueDate
+          createdAt
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
     }
   }
 `
@@ -76,12 +110,20 @@ export const GET_TASK = gql`
 `
 
 export const GET_COMMENTS = gql`
-  query GetComments($taskId: ID!) {
-    comments(taskId: $taskId) {
-      id
-      content
-      authorEmail
-      createdAt
+  query GetComments($taskId: ID!, $first: Int = 100, $after: String) {
+    comments(taskId: $taskId, first: $first, after: $after) {
+      edges {
+        node {
+          id
+          content
+          authorEmail
+          createdAt
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
     }
   }
 `
@@ -23,3 +23,25 @@ export const COMMENT_ADDED = gql`
     }
   }
 `
+
+export const ORGANIZATION_ACTIVITY = gql`
+  subscription OnOrganizationActivity($organizationSlug: String!, $filter: ActivityFilterInput) {
+    organizationActivity(organizationSlug: $organizationSlug, filter: $filter) {
+      kind
+      projectId
+      task {
+        id
+        title
+        status
+        assigneeEmail
+        dueDate
+      }
+      comment {
+        id
+        content
+        authorEmail
+        createdAt
+      }
+    }
+  }
+`
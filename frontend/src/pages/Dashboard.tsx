@@ -4,7 +4,7 @@ import { GET_PROJECTS } from '../graphql/queries'
 import { CREATE_PROJECT } from '../graphql/mutations'
 import { ProjectList, ProjectForm } from '../components/projects'
 import { Button, Modal } from '../components/ui'
-import { Project, CreateProjectInput } from '../types'
+import { Project, CreateProjectInput, Connection } from '../types'
 
 export default function Dashboard() {
   const [isModalOpen, setIsModalOpen] = useState(false)
@@ -63,7 +63,8 @@ export default function Dashboard() {
     })
   }
 
-  const projects: Project[] = data?.projects || []
+  const projects: Project[] =
+    (data?.projects as Connection<Project> | undefined)?.edges.map((edge) => edge.node) || []
 
   return (
     <div>
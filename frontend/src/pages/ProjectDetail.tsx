@@ -6,7 +6,7 @@ import { CREATE_TASK, UPDATE_TASK, CREATE_COMMENT } from '../graphql/mutations'
 import { TaskBoard, TaskForm } from '../components/tasks'
 import { CommentList, CommentForm } from '../components/comments'
 import { Button, Modal, Badge, LoadingSpinner } from '../components/ui'
-import { Task, TaskStatus, CreateTaskInput } from '../types'
+import { Task, TaskStatus, CreateTaskInput, TaskComment, Connection } from '../types'
 
 export default function ProjectDetail() {
   const { projectId } = useParams<{ projectId: string }>()
@@ -96,8 +96,10 @@ export default function ProjectDetail() {
   }
 
   const project = projectData?.project
-  const tasks: Task[] = tasksData?.tasks || []
-  const comments = commentsData?.comments || []
+  const tasks: Task[] =
+    (tasksData?.tasks as Connection<Task> | undefined)?.edges.map((edge) => edge.node) || []
+  const comments: TaskComment[] =
+    (commentsData?.comments as Connection<TaskComment> | undefined)?.edges.map((edge) => edge.node) || []
 
   if (!project) {
     return (
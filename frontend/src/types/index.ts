@@ -90,6 +90,17 @@ export interface ProjectStatistics {
   completionRate: number
 }
 
+// Connection types
+export interface PageInfo {
+  hasNextPage: boolean
+  endCursor?: string
+}
+
+export interface Connection<T> {
+  edges: Array<{ node: T }>
+  pageInfo: PageInfo
+}
+
 // GraphQL payload types
 export interface MutationPayload<T> {
   data?: T